@@ -1,14 +1,24 @@
-from aztec_gddt.params import SINGLE_RUN_PARAMS, INITIAL_STATE, TIMESTEPS, SAMPLES
-from aztec_gddt.structure import AZTEC_MODEL_BLOCKS
 import logging
 
 DEFAULT_LOGGER = 'aztec-design-digital-twin'
 
-default_run_args = (INITIAL_STATE,
-                    {k: [v] for k, v in SINGLE_RUN_PARAMS.items()},
-                    AZTEC_MODEL_BLOCKS,
-                    TIMESTEPS,
-                    SAMPLES)
+# NOTE: importing the package is kept cheap, as every worker process pays
+# for it. The model and its params are only imported when used, and
+# logging is only configured by the CLI (see `setup_logging`).
+logging.getLogger(DEFAULT_LOGGER).addHandler(logging.NullHandler())
+
+
+def __getattr__(name: str):
+    if name == "default_run_args":
+        from aztec_gddt.params import SINGLE_RUN_PARAMS, INITIAL_STATE, TIMESTEPS, SAMPLES
+        from aztec_gddt.structure import AZTEC_MODEL_BLOCKS
+
+        return (INITIAL_STATE,
+                {k: [v] for k, v in SINGLE_RUN_PARAMS.items()},
+                AZTEC_MODEL_BLOCKS,
+                TIMESTEPS,
+                SAMPLES)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 
@@ -37,6 +47,3 @@ def setup_logging(
     # Add the handlers to the logger
     logger.addHandler(file_handler)
     logger.addHandler(console_handler)
-
-
-setup_logging()
@@ -4,10 +4,11 @@ import click
 import logging
 from pathlib import Path
 from multiprocessing import cpu_count
-from aztec_gddt import DEFAULT_LOGGER
-from aztec_gddt.psuu import tensor_transform as tt
-import boto3 # type: ignore
+from aztec_gddt import DEFAULT_LOGGER, setup_logging
+from aztec_gddt.psuu.sweep import SWEEP_DESIGNS, DEFAULT_SWEEP_DESIGN
+from aztec_gddt.psuu.artifacts import open_store
 import os
+from typing import Optional
 
 logger = logging.getLogger(DEFAULT_LOGGER)
 log_levels = {
@@ -25,6 +26,30 @@ log_levels = {
 @click.option('-s',
               '--sweep_samples',
               default=-1)
+@click.option('--sweep_design',
+              type=click.Choice(list(SWEEP_DESIGNS)),
+              default=DEFAULT_SWEEP_DESIGN,
+              help="Design for drawing the sweep samples.")
+@click.option('--adaptive',
+              default=False,
+              is_flag=True,
+              help="Refine the sweep around where the goal scores change.")
+@click.option('--budget_measurements',
+              type=int,
+              default=None,
+              help="Adaptive sweep budget in State Measurements.")
+@click.option('--budget_seconds',
+              type=float,
+              default=None,
+              help="Adaptive sweep budget in seconds.")
+@click.option('--mc_rtol',
+              type=float,
+              default=None,
+              help="Add MC runs until the KPI confidence intervals are within this relative tolerance.")
+@click.option('--max_mc_runs',
+              type=int,
+              default=None,
+              help="Cap on the MC runs per sweep when using --mc_rtol.")
 @click.option('-r',
               '--mc_runs',
               default=5)
@@ -42,6 +67,29 @@ log_levels = {
 @click.option('--no_parallelize',
               default=False,
               is_flag=True)
+@click.option('--engine',
+              type=click.Choice(['native', 'batched', 'cadCAD']),
+              default='cadCAD',
+              help="Simulation engine. `native` is required by --stream_kpis.")
+@click.option('--stream_kpis',
+              default=False,
+              is_flag=True,
+              help="Accumulate the KPIs while simulating instead of writing the Timestep Tensors.")
+@click.option('--seed',
+              type=int,
+              default=None,
+              help="Seed for sampling the censorship series and the sweep.")
+@click.option('--resume',
+              type=click.Path(exists=True, file_okay=False),
+              default=None,
+              help="Output folder of an interrupted run, whose remaining chunks are run.")
+@click.option('--artifact_store',
+              default=None,
+              help="URL (s3://bucket/prefix, memory:// or a folder) where the outputs are published. Defaults to the project bucket with -c.")
+@click.option('--aux_data_store',
+              default=None,
+              help="URL where the auxiliary data (eg. the builder/validator data) is read from. "
+                   "Defaults to data/auxiliary, eg. s3://aztec-gddt/aux-data for the project bucket.")
 @click.option(
     "-l",
     "--log-level",
@@ -53,17 +101,25 @@ log_levels = {
 def main(process: bool,
          n_jobs: int,
          sweep_samples: int,
+         sweep_design: str,
+         adaptive: bool,
+         budget_measurements: Optional[int],
+         budget_seconds: Optional[float],
+         mc_rtol: Optional[float],
+         max_mc_runs: Optional[int],
          mc_runs: int,
          timesteps: int,
          log_level: str,
          upload_to_cloud: bool,
-         no_parallelize: bool) -> None:
+         no_parallelize: bool,
+         engine: str,
+         stream_kpis: bool,
+         seed: Optional[int],
+         resume: Optional[str],
+         artifact_store: Optional[str],
+         aux_data_store: Optional[str]) -> None:
     
-    CLOUD_BUCKET_NAME = 'aztec-gddt'
-
-    if upload_to_cloud:
-        session = boto3.Session()
-        s3 = session.client("s3")
+    setup_logging()
 
     logger.setLevel(log_levels[log_level])
 
@@ -74,18 +130,33 @@ def main(process: bool,
 
     timestep_tensor_prefix = f"timestep_tensor"
     output_path: Path = Path(folder_path) / folder
+    if resume is not None:
+        output_path = Path(resume)
+        folder = output_path.name
     output_path.mkdir(parents=True, exist_ok=True)
 
     psuu_exploratory_run(N_jobs=n_jobs,
                          N_timesteps=timesteps,
                          N_sweep_samples=sweep_samples,
+                         sweep_design=sweep_design,
+                         adaptive=adaptive,
+                         budget_measurements=budget_measurements,
+                         budget_seconds=budget_seconds,
+                         mc_rtol=mc_rtol,
+                         max_mc_runs=max_mc_runs,
                          N_samples=mc_runs,
                          parallelize_jobs=~no_parallelize,
                          supress_cadCAD_print=True,
                          output_path=str(output_path),
                          timestep_tensor_prefix=timestep_tensor_prefix,
                          base_folder=folder,
-                         cloud_stream=upload_to_cloud)
+                         cloud_stream=upload_to_cloud,
+                         engine=engine,
+                         stream_kpis=stream_kpis,
+                         seed=seed,
+                         resume=resume is not None,
+                         artifact_store=open_store(artifact_store) if artifact_store else None,
+                         aux_data_store=open_store(aux_data_store) if aux_data_store else None)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,132 @@
+from dataclasses import dataclass
+from hashlib import sha256
+from io import BytesIO
+from typing import Optional
+import json
+import logging
+import numpy as np
+import pandas as pd
+
+from aztec_gddt import DEFAULT_LOGGER
+from aztec_gddt.types import CensorshipSeries, L1Blocks
+from aztec_gddt.psuu.artifacts import ArtifactStore, LocalStore, DEFAULT_BUCKET
+
+logger = logging.getLogger(DEFAULT_LOGGER)
+
+CENSORSHIP_DATA_KEY = "eth_builder_validator_data_cleaned.parquet.gz"
+CENSORSHIP_DATA_FOLDER = "data/auxiliary"
+CENSORSHIP_DATA_S3_PREFIX = "aux-data"
+# Copy of the data on the project bucket, eg. for `--aux_data_store`
+CENSORSHIP_DATA_S3_URL = f"s3://{DEFAULT_BUCKET}/{CENSORSHIP_DATA_S3_PREFIX}"
+CENSORSHIP_CACHE_FOLDER = "data/cache/censorship"
+
+# XXX: only take into consideration points after DENCUN
+DENCUN_BLOCK_NUMBER = 19426589
+
+
+@dataclass
+class CensorshipMask:
+    """
+    Whether each L1 block on the builder/validator data was censored by
+    a given role, with the blocks sorted by number.
+    """
+    block_numbers: np.ndarray
+    censored: np.ndarray
+
+    def series_from_block(self, start_block: int, num_timesteps: int) -> CensorshipSeries:
+        """
+        Series of the blocks on `[start_block, start_block + num_timesteps)`,
+        with the first of them at `time_l1 = 0`.
+        Same as `params.build_censor_series_from_role` with `start_time_is_block_no`.
+        """
+        lo, hi = np.searchsorted(self.block_numbers, [start_block, start_block + num_timesteps])
+        return CensorshipSeries.from_values(self.censored[lo:hi], offset=0)
+
+    def series_from_position(self, start_time: L1Blocks, num_timesteps: int) -> CensorshipSeries:
+        """
+        Series of the `num_timesteps` blocks from the `start_time`-th one,
+        with the first of them at `time_l1 = start_time`.
+        """
+        values = self.censored[start_time:start_time + num_timesteps]
+        return CensorshipSeries.from_values(values, offset=start_time)
+
+
+def validate_censorship_data(data: pd.DataFrame) -> None:
+    """
+    Checks that the data has no unexpected issues.
+    """
+    assert data.isna().sum().sum() == 0, "The data should have no missing values."
+
+    num_repeats = data.duplicated().sum()
+    assert num_repeats == 0, f"There are {num_repeats} duplicated values."
+
+    assert (
+        data["block_number"].duplicated().sum() == 0
+    ), "There are unexpected duplicate block number entries in the data."
+
+    num_slots = data["slot"].nunique()
+    num_blocks = data["block_number"].nunique()
+    assert (
+        len(data) == num_slots
+    ), "Number of slots should be the same as number of entries in data."
+    assert (
+        num_slots == num_blocks
+    ), f"There are {num_slots} slots, but {num_blocks} blocks."
+
+
+def compute_censorship_mask(data: pd.DataFrame,
+                            role: str,
+                            censor_list: list[str]) -> CensorshipMask:
+    sorted_data = data.sort_values(by="block_number")
+    return CensorshipMask(
+        block_numbers=sorted_data["block_number"].to_numpy(dtype=np.int64),
+        censored=sorted_data[role].isin(censor_list).to_numpy(dtype=bool))
+
+
+def default_censorship_source() -> ArtifactStore:
+    """
+    The local copy of the builder/validator data. Reading it from S3 is
+    opt-in, with `artifacts.open_store(CENSORSHIP_DATA_S3_URL)`.
+    """
+    return LocalStore(CENSORSHIP_DATA_FOLDER)
+
+
+def load_censorship_mask(role: str,
+                         censor_list: list[str],
+                         source: Optional[ArtifactStore] = None,
+                         key: str = CENSORSHIP_DATA_KEY,
+                         min_block_number: int = DENCUN_BLOCK_NUMBER,
+                         cache: Optional[ArtifactStore] = None) -> CensorshipMask:
+    """
+    Censorship mask of `role` over the blocks after `min_block_number`.
+
+    The data is read as `key` from the `source` store (see
+    `default_censorship_source`). The mask is cached on the `cache` store
+    (a local folder by default), keyed by the role, the censor list, the
+    min block and the fingerprint of the data, so that it is only computed
+    once.
+    """
+    if source is None:
+        source = default_censorship_source()
+    if cache is None:
+        cache = LocalStore(CENSORSHIP_CACHE_FOLDER)
+    if not source.exists(key):
+        raise FileNotFoundError(f"There is no {key} on the censorship data source. Copy it on "
+                                f"{CENSORSHIP_DATA_FOLDER}, or read it from {CENSORSHIP_DATA_S3_URL}")
+    cache_key = sha256(json.dumps([role, sorted(censor_list), min_block_number,
+                                   source.fingerprint(key)]).encode()).hexdigest()[:16]
+    cache_key = f"{role}-{cache_key}.npz"
+
+    if cache.exists(cache_key):
+        with np.load(BytesIO(cache.get_bytes(cache_key))) as arrays:
+            return CensorshipMask(arrays["block_numbers"], arrays["censored"])
+
+    logger.info(f"Computing the {role} censorship mask from {key}")
+    data = source.read_parquet(key).query(f"block_number > {min_block_number}")
+    validate_censorship_data(data)
+    mask = compute_censorship_mask(data, role, censor_list)
+
+    buffer = BytesIO()
+    np.savez(buffer, block_numbers=mask.block_numbers, censored=mask.censored)
+    cache.put_bytes(cache_key, buffer.getvalue())
+    return mask
@@ -1,7 +1,6 @@
-from random import choice
 from typing import Dict
 
-from aztec_gddt.helper import bernoulli_trial 
+from aztec_gddt.helper import bernoulli_trial, random_stream
 
 ################################
 ## Begin general  things      ##
@@ -28,7 +27,7 @@ def decide_commit_bond_reveal_random(vars_dict: Dict) -> bool:
     Make a probabilistic decision based on model parameters. 
     """
     probability = vars_dict["probability"]
-    decision = bernoulli_trial(probability=probability)
+    decision = bernoulli_trial(probability=probability, stream=random_stream(vars_dict))
     return decision
 
 
@@ -47,7 +46,7 @@ def decide_proving_marketplace_use_random(vars_dict: Dict) -> bool:
     Decide whether to use the proving marketplace, based on system parameters. 
     """
     probability = vars_dict["probability"]
-    decision = bernoulli_trial(probability = probability)
+    decision = bernoulli_trial(probability = probability, stream = random_stream(vars_dict))
     return decision
 
 def decide_prover_random(params: dict,
@@ -59,7 +58,7 @@ def decide_prover_random(params: dict,
                                for (a_id, a) 
                                in agents.items() 
                                if a.is_prover and a.balance >= bond_amount]
-    prover = choice(potential_provers)
+    prover = random_stream(params).choice(potential_provers)
     return prover 
  
 ################################
@@ -2,33 +2,39 @@ from pandas import DataFrame
 from typing import Dict, List
 from pathlib import Path
 
-from cadCAD.tools.preparation import sweep_cartesian_product  # type: ignore
 from aztec_gddt.params import INITIAL_STATE
 from aztec_gddt.psuu.tensor_transform import timestep_tensor_to_trajectory_tensor
+from aztec_gddt.psuu.tensor_io import (write_timestep_tensor, write_trajectory_tensor,
+                                       commit_trajectory_tensor, trajectory_tensor_parts,
+                                       TRAJECTORY_TENSOR_FOLDER)
+from aztec_gddt.psuu.kpis import (KPIAccumulator, accumulated_kpis_to_trajectory_tensor,
+                                  governance_surface_params)
+from aztec_gddt.psuu.sweep import SweepSpace, DEFAULT_SWEEP_DESIGN
+from aztec_gddt.psuu.adaptive import adaptive_sweep
+from aztec_gddt.psuu.sequential import sequential_monte_carlo
+from aztec_gddt.psuu.scheduler import schedule_chunks
+from aztec_gddt.psuu.broadcast import Broadcast, resolve_params
+from aztec_gddt.psuu.manifest import RunManifest
+from aztec_gddt.psuu.artifacts import ArtifactStore, S3Store, DEFAULT_BUCKET
+from aztec_gddt.censorship import load_censorship_mask
 from aztec_gddt.params import (
     SINGLE_RUN_PARAMS,
     TIMESTEPS,
     BASE_AGENTS_DICT,
-    zero_timeseries,
 )
 from aztec_gddt.params import *
 from aztec_gddt.structure import AZTEC_MODEL_BLOCKS
 from aztec_gddt.types import AztecModelParams, AztecModelState, Agent
 from uuid import uuid4
-from scipy.stats import norm  # type: ignore
 from aztec_gddt.utils import sim_run
 from typing import Optional
-from random import sample
 from datetime import datetime, timedelta
 from tqdm.auto import tqdm  # type: ignore
-from joblib import Parallel, delayed  # type: ignore
 import logging
 from aztec_gddt import DEFAULT_LOGGER
-import boto3  # type: ignore
 import os
-from glob import glob
 
-CLOUD_BUCKET_NAME = "aztec-gddt"
+CLOUD_BUCKET_NAME = DEFAULT_BUCKET
 
 logger = logging.getLogger(DEFAULT_LOGGER)
 
@@ -120,15 +126,81 @@ def psuu_exploratory_run(
     N_sequencer=10,
     N_prover=10,
     base_folder="",
-    cloud_stream=True,
+    cloud_stream=False,
+    engine="cadCAD",
+    stream_kpis=False,
+    sweep_design=DEFAULT_SWEEP_DESIGN,
+    adaptive=False,
+    adaptive_batch_size=250,
+    budget_measurements=None,
+    budget_seconds=None,
+    mc_rtol=None,
+    mc_atol=1e-3,
+    max_mc_runs=None,
+    seed=None,
+    resume=False,
+    artifact_store: Optional[ArtifactStore] = None,
+    aux_data_store: Optional[ArtifactStore] = None,
 ) -> Optional[DataFrame]:
     """Function which runs the cadCAD simulations
 
+    Args:
+        engine (str): Either "cadCAD" (the default, as on the CLI),
+            "native" for the lockstep engine on `aztec_gddt.utils.engine`,
+            or "batched" for advancing all the Monte Carlo runs of a subset
+            together as arrays.
+        stream_kpis (bool): If True, the trajectory KPIs are accumulated
+            while simulating (see `aztec_gddt.psuu.kpis.KPIAccumulator`)
+            and no Timestep Tensor is written. Requires the "native" engine.
+        sweep_design (str): How the `N_sweep_samples` combinations are
+            drawn when sampling the sweep. One of `psuu.sweep.SWEEP_DESIGNS`.
+        adaptive (bool): If True, an initial batch of `N_sweep_samples`
+            combinations is followed by batches of `adaptive_batch_size`
+            concentrated where the goal scores change or are noisy
+            (see `aztec_gddt.psuu.adaptive`), until the sweep or either
+            budget (State Measurements or seconds) is exhausted.
+        mc_rtol (float): If given, `N_samples` is the minimum number of
+            Monte Carlo runs, and more runs are added to each combination
+            until the confidence intervals of its KPIs are narrower than
+            `max(mc_atol, mc_rtol * |mean|)`, up to `max_mc_runs`
+            (`4 * N_samples` by default). See `aztec_gddt.psuu.sequential`.
+        seed (int): Seed for sampling the censorship series and the sweep.
+            A fresh one is drawn by default.
+        resume (bool): If True, resumes the run recorded on the manifest of
+            `output_path` (see `aztec_gddt.psuu.manifest`), with its seed.
+            Chunks whose outputs are valid are skipped. Only supported when
+            the sweep is run in chunks (`N_jobs > 1`, not adaptive and
+            without `mc_rtol`).
+        cloud_stream (bool): If True, the outputs are published on the
+            `CLOUD_BUCKET_NAME` bucket, unless an `artifact_store` is given.
+            Off by default, so that S3 is opt-in.
+        artifact_store (ArtifactStore): Where the outputs are published,
+            under `base_folder`. Nothing is published by default.
+            See `aztec_gddt.psuu.artifacts`.
+        aux_data_store (ArtifactStore): Where the builder/validator data is
+            read from. Defaults to the local copy, see
+            `aztec_gddt.censorship.default_censorship_source`.
+
     Returns:
         DataFrame: A dataframe of simulation data
     """
     invoke_time = datetime.now()
     logger.info(f"PSuU Exploratory Run invoked at {invoke_time}")
+
+    # Chunked runs write their outputs as they go, and record them on a
+    # manifest so that they can be resumed.
+    chunked = not (adaptive or mc_rtol is not None) and N_jobs > 1
+    manifest: Optional[RunManifest] = None
+    if resume:
+        if not chunked:
+            raise ValueError("Only chunked runs (N_jobs > 1, not adaptive and without mc_rtol) can be resumed")
+        manifest = RunManifest.load(output_path)
+        seed = manifest.config["seed"]
+    elif seed is None:
+        seed = np.random.SeedSequence().entropy
+    rng = np.random.default_rng(seed)
+    # Shuffling of the scheduled chunks, apart from the draws of the sweep
+    schedule_rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
     # Relay Agent
     Sqn3Prv3_agents = []
 
@@ -163,7 +235,10 @@ def psuu_exploratory_run(
         "final_probability",
         "op_cost_sequencer",
         "op_cost_prover",
+        "sweep_index",
     }
+    # The Trajectory Tensors keep the index of every combination on the sweep
+    trajectory_params = governance_surface_params + ["sweep_index"]
 
     for _ in range(N_sequencer):
         a = Agent(
@@ -233,81 +308,33 @@ def psuu_exploratory_run(
         N_SAMPLES_CENSORSHIP_TS - len(CHERRY_PICKED_BLOCK_NUMBERS), 0
     )
 
-    # XXX: only take into consideration points after DENCUN
-
-    DENCUN_BLOCK_NUMBER = 19426589
-
-    local_path = "data/auxiliary/eth_builder_validator_data_cleaned.parquet.gz"
-
-    if os.path.isfile(local_path):
-        print("Reading locally.")
-        censorship_data = pd.read_parquet(local_path).query(
-            f"block_number >{DENCUN_BLOCK_NUMBER}"
-        )
-    else:
-        print("Reading from S3 bucket.")
-        censorship_data = pd.read_parquet(
-            "s3://aztec-gddt/aux-data/eth_builder_validator_data_cleaned.parquet.gz"
-        ).query(f"block_number > {DENCUN_BLOCK_NUMBER}")
-
-    # Check that data has no unexpected issues
-
-    assert (
-        censorship_data.isna().sum().sum() == 0
-    ), "The data should have no missing values."
-
-    num_repeats = censorship_data.duplicated().sum()
-    assert num_repeats == 0, f"There are {num_repeats} duplicated values."
-
-    assert (
-        censorship_data["block_number"].duplicated().sum() == 0
-    ), "There are unexpected duplicate block number entries in the data."
-
-    assert (
-        len(censorship_data) == censorship_data["slot"].nunique()
-    ), "Number of slots should be the same as number of entries in data."
-    num_slots = censorship_data["slot"].nunique()
-    num_blocks = censorship_data["block_number"].nunique()
-    assert (
-        num_slots == num_blocks
-    ), f"There are {num_slots} slots, but {num_blocks} blocks."
-
-    # Begin logic for processing data into time series for sweep
-
-    # XXX: check to see if data has missing or duplicated values
-
-    assert (
-        censorship_data.duplicated().sum() == 0
-    ), "Data contains duplicates. It should not."
-    assert (
-        censorship_data.isna().sum().sum() == 0
-    ), "Data has missing values. It should not. "
+    # NOTE: only blocks after DENCUN are taken into consideration. The
+    # mask is cached on disk, see `aztec_gddt.censorship`.
+    censorship_mask = load_censorship_mask("builder", CENSORING_BUILDERS, aux_data_store)
 
     # Begin logic for sampling time series
     SAFETY_MARGIN = 7
     SAMPLED_BLOCK_NUMBERS = (
-        censorship_data.block_number.iloc[: -(N_timesteps * SAFETY_MARGIN)]
-        .sample(N_RANDOM_SAMPLES_CENSORSHIP_TS)
-        .astype(int)
+        rng.choice(
+            censorship_mask.block_numbers[: -(N_timesteps * SAFETY_MARGIN)],
+            N_RANDOM_SAMPLES_CENSORSHIP_TS,
+            replace=False,
+        )
         .tolist()
     )
 
     ALL_BLOCK_NUMBERS = CHERRY_PICKED_BLOCK_NUMBERS + SAMPLED_BLOCK_NUMBERS
 
-    CENSORSHIP_SERIES_LIST = []
-    for block_no in ALL_BLOCK_NUMBERS:
-        ts = build_censor_series_from_role(
-            data=censorship_data,
-            censor_list=CENSORING_BUILDERS,
-            start_time=block_no,
-            num_timesteps=N_timesteps * SAFETY_MARGIN,
-            role="builder",
-            start_time_is_block_no=True,
-        )
-        CENSORSHIP_SERIES_LIST.append(ts)
+    CENSORSHIP_SERIES_LIST = [
+        censorship_mask.series_from_block(block_no, N_timesteps * SAFETY_MARGIN)
+        for block_no in ALL_BLOCK_NUMBERS
+    ]
+
+    zero_timeseries = gas_scenario_time_series(
+        "zero", "l1", max(N_timesteps * L1_BUFFER, GAS_TIME_SERIES_SIZE))
 
     # HACK: if min duration is `inf`, it will be dynamically set to the max duration
-    # after doing the `sweep_cartesian_product`
+    # when decoding the sweep (see `aztec_gddt.psuu.sweep.resolve_inf_durations`)
     sweep_params_upd: dict[str, list] = dict(
         # Phase Durations
         phase_duration_proposal_min_blocks=[0, 3],
@@ -327,82 +354,145 @@ def psuu_exploratory_run(
         gas_fee_blob_time_series=[zero_timeseries],
         censorship_series_builder=CENSORSHIP_SERIES_LIST,
         censorship_series_validator=[ALWAYS_FALSE_SERIES],
+        # The PSuU KPIs do not use the transactions of settled processes
+        fp_transaction_retention=["Evict Settled"],
     )
 
     sweep_params = {**sweep_params, **sweep_params_upd}  # type: ignore
 
-    sweep_combinations: int = 1
-    for v in sweep_params.values():
-        sweep_combinations *= len(v)
-
-    n_sweeps = N_sweep_samples if N_sweep_samples > 0 else sweep_combinations
+    # Large inputs (eg. the censorship series) are published once for all
+    # of the workers, and the sweep chunks only carry references to them.
+    broadcast = Broadcast() if parallelize_jobs and N_jobs > 1 else None
+    if broadcast is not None:
+        sweep_params = broadcast.publish_params(sweep_params)
+
+    # Outputs are published from this process (eg. uploaded on background
+    # threads), so that the workers go straight back to simulating.
+    store = artifact_store
+    if store is None and cloud_stream:
+        store = S3Store(CLOUD_BUCKET_NAME)
+
+    sweep_space = SweepSpace(sweep_params)
+    if adaptive:
+        # NOTE: the number of sweeps is only known after running
+        sweep_indices = np.array([], dtype=np.int64)
+        n_sweeps = N_sweep_samples if N_sweep_samples > 0 else adaptive_batch_size
+    else:
+        sweep_indices = sweep_space.sample_indices(N_sweep_samples, rng, design=sweep_design)
+        n_sweeps = len(sweep_indices)
+
+    if chunked:
+        run_config = dict(seed=seed,
+                          sweep_design=sweep_design,
+                          N_sweep_samples=N_sweep_samples,
+                          N_samples=N_samples,
+                          N_timesteps=N_timesteps,
+                          engine=engine,
+                          stream_kpis=stream_kpis,
+                          sweep_size=len(sweep_space))
+        if manifest is None:
+            manifest = RunManifest.create(output_path, run_config, sweep_indices)
+        else:
+            manifest.check_config(run_config)
+            manifest.validate()
+            manifest.remove_orphans()
+            sweep_indices = manifest.sweep_indices
+            n_sweeps = len(sweep_indices)
+        # Positions on `sweep_indices` which are left to run. They are
+        # also the random seeds of the combinations.
+        remaining = manifest.remaining_positions()
+        first_chunk = manifest.next_chunk()
+        logger.info(f"PSuU Exploratory Run manifest: {n_sweeps - len(remaining):,} of {n_sweeps:,} sweeps done")
 
     traj_combinations = n_sweeps * N_samples
 
-    sweep_params_cartesian_product = sweep_cartesian_product(sweep_params)
-
     N_measurements = n_sweeps * N_timesteps * N_samples
     logger.info(
         f"PSuU Exploratory Run Dimensions: {N_jobs=:,}, {N_timesteps=:,}, N_sweeps={n_sweeps:,}, {N_samples=:,}, N_trajectories={traj_combinations:,}, N_measurements={N_measurements:,}"
     )
 
-    sweep_params_cartesian_product = {
-        k: list(v) for k, v in sweep_params_cartesian_product.items()
-    }
-
-    sweep_params_cartesian_product = {
-        k: sample(v, N_sweep_samples) if N_sweep_samples > 0 else v
-        for k, v in sweep_params_cartesian_product.items()
-    }
-
-    def inf_to_max_duration(row: pd.Series, min_col: str, max_col: str) -> float:
-        if row[min_col] == float("inf"):
-            return row[max_col]
-        else:
-            return row[min_col]
-
-    inf_to_max_duration_cols: list[dict[str, str]] = [
-        dict(
-            min_col="phase_duration_proposal_min_blocks",
-            max_col="phase_duration_proposal_max_blocks",
-        ),
-        dict(
-            min_col="phase_duration_reveal_min_blocks",
-            max_col="phase_duration_reveal_max_blocks",
-        ),
-        dict(
-            min_col="phase_duration_commit_bond_min_blocks",
-            max_col="phase_duration_commit_bond_max_blocks",
-        ),
-        dict(
-            min_col="phase_duration_rollup_min_blocks",
-            max_col="phase_duration_rollup_max_blocks",
-        ),
-        dict(
-            min_col="phase_duration_race_min_blocks",
-            max_col="phase_duration_race_max_blocks",
-        ),
-    ]
-
-    param_df = pd.DataFrame(sweep_params_cartesian_product)
-    for kwargs in inf_to_max_duration_cols:
-        param_df.loc[:, kwargs["min_col"]] = param_df.apply(  # type: ignore
-            inf_to_max_duration, axis="columns", **kwargs
-        ).astype(
-            int
-        )  # type: ignore
-
-    sweep_params_cartesian_product = param_df.to_dict(orient="list")
+    observer = KPIAccumulator if stream_kpis else None
+    # The agents of the written Timestep Tensors are delta-encoded
+    # (see `aztec_gddt.psuu.agent_ledger`)
+    agent_deltas = engine == "native" and not stream_kpis
 
     sim_start_time = datetime.now()
     logger.info(
         f"PSuU Exploratory Run starting at {sim_start_time}, ({sim_start_time - invoke_time} since invoke)"
     )
-    if N_jobs <= 1:
+    if adaptive or mc_rtol is not None:
+        chunk_size = 25
+
+        def run_kpi_chunk(sweep_params, n_runs: int) -> DataFrame:
+            sim_df = sim_run(
+                initial_state,
+                resolve_params(sweep_params),
+                AZTEC_MODEL_BLOCKS,
+                N_timesteps,
+                n_runs,
+                exec_mode="single",
+                assign_params=assign_params,
+                supress_cadCAD_print=supress_cadCAD_print,
+                engine=engine,
+                observer=observer,
+            )
+            if stream_kpis:
+                return accumulated_kpis_to_trajectory_tensor(sim_df, trajectory_params).reset_index()
+            else:
+                return timestep_tensor_to_trajectory_tensor(sim_df, trajectory_params).reset_index()
+
+        def evaluate_runs(indices: np.ndarray, seeds: np.ndarray, n_runs: int) -> DataFrame:
+            agg_dfs = []
+            for _, _, agg_df in schedule_chunks(
+                sweep_space,
+                lambda _, chunk: run_kpi_chunk(chunk, n_runs),
+                indices,
+                seeds,
+                n_jobs=N_jobs if parallelize_jobs else 1,
+                max_chunk_size=chunk_size,
+                rng=schedule_rng,
+            ):
+                agg_dfs.append(agg_df)
+            return pd.concat(agg_dfs, ignore_index=True)
+
+        def evaluate_sweeps(indices: np.ndarray, seeds: np.ndarray) -> DataFrame:
+            if mc_rtol is None:
+                return evaluate_runs(indices, seeds, N_samples)
+            return sequential_monte_carlo(
+                evaluate_runs,
+                indices,
+                seeds,
+                min_runs=N_samples,
+                max_runs=max_mc_runs if max_mc_runs is not None else 4 * N_samples,
+                rtol=mc_rtol,
+                atol=mc_atol,
+            )
+
+        if adaptive:
+            agg_df = adaptive_sweep(
+                sweep_space,
+                evaluate_sweeps,
+                initial_samples=n_sweeps,
+                batch_size=adaptive_batch_size,
+                measurements_per_trajectory=N_timesteps + 1,
+                runs_per_sweep=N_samples,
+                max_measurements=budget_measurements,
+                max_seconds=budget_seconds,
+                design=sweep_design,
+                rng=rng,
+            )
+        else:
+            agg_df = evaluate_sweeps(sweep_indices, np.arange(n_sweeps))
+            agg_df["batch"] = 0
+        n_sweeps = agg_df["sweep_index"].nunique()
+        N_measurements = len(agg_df) * N_timesteps
+        for i_batch, batch_df in agg_df.groupby("batch"):
+            write_trajectory_tensor(batch_df, output_path, basename=f"trajectory_tensor-{i_batch}")
+    elif N_jobs <= 1:
         # Load simulation arguments
         sim_args = (
             initial_state,
-            sweep_params_cartesian_product,
+            next(sweep_space.iter_chunks(n_sweeps, sweep_indices)),
             AZTEC_MODEL_BLOCKS,
             N_timesteps,
             N_samples,
@@ -413,27 +503,20 @@ def psuu_exploratory_run(
             exec_mode="single",
             assign_params=assign_params,
             supress_cadCAD_print=supress_cadCAD_print,
+            engine=engine,
+            observer=observer,
         )
     else:
         sweeps_per_process = 25
         processes = N_jobs
 
         chunk_size = sweeps_per_process
-        split_dicts = [
-            {
-                k: v[i : i + chunk_size]
-                for k, v in sweep_params_cartesian_product.items()
-            }
-            for i in range(
-                0, len(list(sweep_params_cartesian_product.values())[0]), chunk_size
-            )
-        ]
 
-        def run_chunk(i_chunk, sweep_params):
+        def run_chunk(i_chunk, sweep_params) -> list[str]:
             logger.debug(f"{i_chunk}, {datetime.now()}")
             sim_args = (
                 initial_state,
-                sweep_params,
+                resolve_params(sweep_params),
                 AZTEC_MODEL_BLOCKS,
                 N_timesteps,
                 N_samples,
@@ -444,65 +527,91 @@ def psuu_exploratory_run(
                 exec_mode="single",
                 assign_params=assign_params,
                 supress_cadCAD_print=supress_cadCAD_print,
-            )
-            output_filename = (
-                Path(output_path) / f"{timestep_tensor_prefix}-{i_chunk}.pkl.zip"
+                engine=engine,
+                observer=observer,
+                agent_deltas=agent_deltas,
             )
             sim_df["simulation"] = i_chunk
             logger.debug(
                 f"n_groups: {sim_df.groupby(['simulation', 'run', 'subset']).ngroups}"
             )
 
-            sim_df.to_pickle(output_filename)
-            agg_df = timestep_tensor_to_trajectory_tensor(sim_df)
-            agg_output_filename = (
-                Path(output_path) / f"trajectory_tensor-{i_chunk}.csv.zip"
-            )
-            agg_df.to_csv(agg_output_filename)
-            if cloud_stream:
-                session = boto3.Session()
-                s3 = session.client("s3")
-                s3.upload_file(
-                    str(agg_output_filename),
-                    CLOUD_BUCKET_NAME,
-                    str(Path(base_folder) / f"trajectory_tensor-{i_chunk}.pkl.zip"),
+            if stream_kpis:
+                output_filenames = []
+                agg_df = accumulated_kpis_to_trajectory_tensor(sim_df, trajectory_params)
+            else:
+                output_filenames = write_timestep_tensor(
+                    sim_df, output_path, basename=f"{timestep_tensor_prefix}-{i_chunk}"
                 )
-                s3.upload_file(
+                agg_df = timestep_tensor_to_trajectory_tensor(sim_df, trajectory_params)
+            agg_output_filename = write_trajectory_tensor(
+                agg_df, output_path, basename=f"trajectory_tensor-{i_chunk}"
+            )
+            # NOTE: the Trajectory Tensor goes last
+            return output_filenames + [agg_output_filename]
+
+        # Chunks whose uploads are pending, as (chunk, indices, local files, uploads)
+        uploading: list = []
+
+        def record_chunk(i_chunk, chunk_indices, output_filenames):
+            if store is None:
+                manifest.record_chunk(i_chunk, chunk_indices, output_filenames)
+                return
+            *timestep_filenames, agg_output_filename = output_filenames
+            futures = [store.put_file(
+                str(Path(base_folder) / Path(agg_output_filename).relative_to(output_path)),
+                agg_output_filename,
+            )]
+            for output_filename in timestep_filenames:
+                futures.append(store.put_file(
+                    str(Path(base_folder) / Path(output_filename).relative_to(output_path)),
                     output_filename,
-                    CLOUD_BUCKET_NAME,
-                    str(
-                        Path(base_folder)
-                        / f"{timestep_tensor_prefix}-{i_chunk}.pkl.zip"
-                    ),
-                )
-                os.remove(str(output_filename))
+                    delete=True,
+                ))
+            uploading.append((i_chunk, chunk_indices, [agg_output_filename], futures))
+
+        def record_uploaded_chunks(wait: bool = False):
+            # Chunks are only done once their outputs are uploaded
+            if wait and store is not None:
+                store.flush()
+            for entry in list(uploading):
+                i_chunk, chunk_indices, local_filenames, futures = entry
+                if all(f.done() for f in futures):
+                    for f in futures:
+                        f.result()
+                    manifest.record_chunk(i_chunk, chunk_indices, local_filenames)
+                    uploading.remove(entry)
 
-        args = enumerate(split_dicts)
         if parallelize_jobs:
-            Parallel(n_jobs=processes)(
-                delayed(run_chunk)(i_chunk, sweep_params)
-                for (i_chunk, sweep_params) in tqdm(
-                    args, desc="Simulation Chunks", total=len(split_dicts)
-                )
-            )
+            # Chunks are sized and ordered by their measured cost, and
+            # dispatched as soon as a worker is idle.
+            with tqdm(desc="Simulation Sweeps", total=len(remaining)) as progress:
+                for i_chunk, chunk_indices, output_filenames in schedule_chunks(
+                    sweep_space,
+                    lambda i, chunk: run_chunk(first_chunk + i, chunk),
+                    sweep_indices[remaining],
+                    remaining,
+                    n_jobs=processes,
+                    max_chunk_size=sweeps_per_process,
+                    rng=schedule_rng,
+                ):
+                    record_chunk(first_chunk + i_chunk, chunk_indices, output_filenames)
+                    record_uploaded_chunks()
+                    progress.update(len(chunk_indices))
+            record_uploaded_chunks(wait=True)
         else:
-            for i_chunk, sweep_params in tqdm(args):
-                sim_args = (
-                    initial_state,
-                    sweep_params,
-                    AZTEC_MODEL_BLOCKS,
-                    N_timesteps,
-                    N_samples,
-                )
-                # Run simulationz
-                sim_df = sim_run(
-                    *sim_args,
-                    exec_mode="single",
-                    assign_params=assign_params,
-                    supress_cadCAD_print=supress_cadCAD_print,
-                )
-                output_filename = output_path + f"-{i_chunk}.pkl.zip"
-                sim_df.to_pickle(output_filename)
+            args = enumerate(sweep_space.iter_chunks(chunk_size, sweep_indices[remaining], remaining),
+                             start=first_chunk)
+            for i_chunk, sweep_params in tqdm(args, total=-(-len(remaining) // chunk_size)):
+                output_filenames = run_chunk(i_chunk, sweep_params)
+                chunk_start = (i_chunk - first_chunk) * chunk_size
+                record_chunk(i_chunk,
+                             sweep_indices[remaining[chunk_start:chunk_start + chunk_size]],
+                             output_filenames)
+                record_uploaded_chunks()
+            record_uploaded_chunks(wait=True)
+    if broadcast is not None:
+        broadcast.close()
     end_start_time = datetime.now()
     duration: float = (end_start_time - sim_start_time).total_seconds()
     logger.info(
@@ -512,23 +621,37 @@ def psuu_exploratory_run(
         f"PSuU Exploratory Run Performance Numbers; Duration (s): {duration:,.2f}, Measurements Per Second: {N_measurements/duration:,.2f} M/s, Measurements per Job * Second: {N_measurements/(duration * N_jobs):,.2f} M/(J*s)"
     )
 
-    if cloud_stream:
-        files = glob(str(Path(output_path) / f"trajectory_tensor-*.csv.zip"))
-        dfs = []
-        for file in files:
-            dfs.append(pd.read_csv(file).reset_index())
-        agg_df = pd.concat(dfs)
-        agg_df.to_csv(str(Path(output_path) / f"trajectory_tensor.csv.zip"))
-        session = boto3.Session()
-        s3 = session.client("s3")
-        logger.info(
-            f"Trajector Tensor saved to {str(Path(base_folder) / f'trajectory_tensor.csv.zip')}"
-        )
-        s3.upload_file(
-            str(Path(output_path) / f"trajectory_tensor.csv.zip"),
-            CLOUD_BUCKET_NAME,
-            str(Path(base_folder) / f"trajectory_tensor.csv.zip"),
-        )
+    # The chunks have written their parts of the Trajectory Tensor, so
+    # that it only has to be indexed (see `tensor_io.read_trajectory_tensor`)
+    committed_filenames = commit_trajectory_tensor(output_path)
+    if committed_filenames:
+        logger.info(f"Trajectory Tensor committed on {Path(output_path) / TRAJECTORY_TENSOR_FOLDER}")
+
+    if store is not None:
+        if committed_filenames:
+            # The parts of the chunks are published as they are done, and
+            # those rewritten by the commit are published again, before the index
+            if not chunked:
+                committed_filenames = ([str(p) for p in trajectory_tensor_parts(output_path)]
+                                       + committed_filenames[-1:])
+            *part_filenames, metadata_filename = committed_filenames
+            for committed_filename in part_filenames:
+                store.put_file(
+                    str(Path(base_folder) / Path(committed_filename).relative_to(output_path)),
+                    committed_filename,
+                )
+            store.flush()
+            store.put_file(
+                str(Path(base_folder) / Path(metadata_filename).relative_to(output_path)),
+                metadata_filename,
+            )
+            logger.info(
+                f"Trajectory Tensor saved to {str(Path(base_folder) / TRAJECTORY_TENSOR_FOLDER)}"
+            )
+        if artifact_store is None:
+            store.close()
+        else:
+            store.flush()
 
     if "sim_df" in locals():
         return sim_df
@@ -6,11 +6,16 @@ from aztec_gddt.types import *
 
 
 def proposals_from_tx(
-    transactions: dict[TxUUID, TransactionL1]
+    transactions: TransactionLedger | dict[TxUUID, TransactionL1],
+    process_uuid: Optional[ProcessUUID] = None,
 ) -> dict[TxUUID, Proposal]:
     """
     Selects all proposals from the transactions state variable.
+    If `process_uuid` is given, only the proposals submitted on that
+    process are selected, using the ledger index.
     """
+    if process_uuid is not None and isinstance(transactions, TransactionLedger):
+        return {p.uuid: p for p in transactions.proposals(process_uuid)}
     return {k: v for k, v in transactions.items() if type(v) == Proposal}
 
 
@@ -53,16 +58,69 @@ def build_censor_series_from_data(
 #######################################
 
 
-def bernoulli_trial(probability: float) -> bool:
+class RandomStream:
+    """
+    Seeded source of random draws for a single trajectory.
+
+    Uniforms are pre-drawn in blocks from a single NumPy generator, and
+    every Bernoulli, uniform and choice draw is served from that buffer.
+    """
+
+    def __init__(self, seed=None, block_size: int = 1024):
+        if not isinstance(seed, np.random.SeedSequence):
+            seed = np.random.SeedSequence(seed)
+        self.seed_sequence = seed
+        self.generator = np.random.default_rng(seed)
+        self.block_size = block_size
+        self._buffer: list[float] = []
+        self._position = 0
+
+    @staticmethod
+    def for_trajectory(seed: Optional[int], run: int) -> "RandomStream":
+        """
+        Independent stream for the `run`-th Monte Carlo run of a `seed`.
+
+        NOTE: the position of the combination on its sweep chunk (`subset`)
+        is not used, so that its trajectories do not depend on the chunking.
+        """
+        return RandomStream(np.random.SeedSequence(seed, spawn_key=(run,)))
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        if self._position == len(self._buffer):
+            self._buffer = self.generator.random(self.block_size).tolist()
+            self._position = 0
+        value = self._buffer[self._position]
+        self._position += 1
+        return low + (high - low) * value
+
+    def uniforms(self, size: int) -> np.ndarray:
+        """
+        Vector of `size` uniforms on [0, 1).
+        """
+        return self.generator.random(size)
+
+    def bernoulli(self, probability: float) -> bool:
+        return self.uniform() <= probability
+
+    def choice(self, options: Sequence):
+        return options[int(self.uniform() * len(options))]
+
+
+def random_stream(params: AztecModelParams) -> RandomStream:
+    """
+    The stream of the trajectory, which every engine adds to its params
+    (see `utils.engine.iterate_trajectory` and `utils.sim_run.TrajectoryParams`).
+    """
+    return params["random_stream"]  # type: ignore
+
+
+def bernoulli_trial(probability: float, stream: RandomStream) -> bool:
     if probability > 1 or probability < 0:
         raise ValueError(
             f"Probability must be be between 0 and 1, was given {probability}."
         )
 
-    # TODO: refactor so that the seed is properly tracked
-    rng = np.random.default_rng()
-    rand_num = rng.uniform(low=0, high=1)
-    hit = rand_num <= probability
+    hit = stream.bernoulli(probability)
 
     return hit
 
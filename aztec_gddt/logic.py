@@ -38,6 +38,7 @@ from .logic_functions.phases import (
     s_total_rewards_sequencers,
     s_total_rewards_relays,
     s_agents_rewards,
+    s_transactions_retention,
     s_token_supply,
     s_agent_restake,
     s_finalized_blocks_count_lambda_function,
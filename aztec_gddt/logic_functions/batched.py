@@ -0,0 +1,503 @@
+"""
+Batched counterpart of the `AZTEC_MODEL_BLOCKS` logic.
+
+All the Monte Carlo runs of a subset are advanced together: every scalar
+state variable is held as a NumPy array with one entry per run, the agents
+as (runs, agents) matrices, and the phase machine on `phases.py` is applied
+through masks over the runs that are on each phase.
+
+Only what determines the scalar state is tracked. In particular, no L1
+transaction objects are created: the ongoing process keeps the indexes of
+its proposers, leading sequencer and prover instead.
+"""
+import numpy as np
+
+from aztec_gddt.helper import RandomStream, trial_probability, total_phase_duration
+from aztec_gddt.types import *
+from dataclasses import dataclass  # NOTE: the stdlib one, as fields are arrays
+from .functional_parameterizations import determine_profitability
+
+# Phase code of the runs without an ongoing process.
+NO_PROCESS = 0
+
+# State variables that are held as one value per run.
+BATCHED_STATE_VARIABLES = [
+    "time_l1",
+    "delta_l1_blocks",
+    "delta_blocks",
+    "advance_l1_blocks",
+    "slashes_to_provers",
+    "slashes_to_sequencers",
+    "total_rewards_provers",
+    "total_rewards_relays",
+    "total_rewards_sequencers",
+    "gas_fee_l1",
+    "gas_fee_blob",
+    "finalized_blocks_count",
+    "cumm_block_rewards",
+    "cumm_fee_cashback",
+    "cumm_burn",
+    "is_censored",
+]
+
+
+@dataclass
+class BatchContext:
+    """
+    Per-subset constants of a batched run.
+    """
+
+    n_runs: int
+    agent_uuids: list
+    is_sequencer: np.ndarray
+    is_prover: np.ndarray
+    is_relay: np.ndarray
+    burnt: int
+    l1_builder: int
+    censored_builder: np.ndarray
+    censored_validator: np.ndarray
+    gas_fee_l1_time_series: np.ndarray
+    gas_fee_blob_time_series: np.ndarray
+    stream: RandomStream
+
+
+def censorship_array(series: Mapping[L1Blocks, bool]) -> np.ndarray:
+    """
+    Dense version of a `{time_l1: is_censored}` series. Missing times are
+    censored, as on `check_for_censorship`.
+    """
+    if isinstance(series, CensorshipSeries):
+        return series.to_array()
+    size = max(series.keys(), default=-1) + 1
+    array = np.ones(size, dtype=bool)
+    for time_l1, is_censored in series.items():
+        array[time_l1] = is_censored
+    return array
+
+
+def lookup_censorship(array: np.ndarray, time_l1: np.ndarray) -> np.ndarray:
+    in_range = time_l1 < len(array)
+    return np.where(in_range, array[np.minimum(time_l1, len(array) - 1)], True)
+
+
+def build_context(
+    params: AztecModelParams,
+    initial_state: AztecModelState,
+    n_runs: int,
+    stream: RandomStream,
+) -> BatchContext:
+    agents: list[Agent] = list(initial_state["agents"].values())
+    agent_uuids = [a.uuid for a in agents]
+    return BatchContext(
+        n_runs=n_runs,
+        agent_uuids=agent_uuids,
+        is_sequencer=np.array([a.is_sequencer for a in agents], dtype=bool),
+        is_prover=np.array([a.is_prover for a in agents], dtype=bool),
+        is_relay=np.array([a.is_relay for a in agents], dtype=bool),
+        burnt=agent_uuids.index("burnt"),
+        l1_builder=agent_uuids.index("l1-builder"),
+        censored_builder=censorship_array(params["censorship_series_builder"]),
+        censored_validator=censorship_array(params["censorship_series_validator"]),
+        gas_fee_l1_time_series=np.asarray(params["gas_fee_l1_time_series"]),
+        gas_fee_blob_time_series=np.asarray(params["gas_fee_blob_time_series"]),
+        stream=stream,
+    )
+
+
+def initial_batched_state(initial_state: AztecModelState, ctx: BatchContext) -> dict:
+    """
+    Broadcasts a single initial state over all the runs of a batch.
+    """
+    if initial_state["current_process"] is not None:
+        raise ValueError(
+            "The batched engine only supports initial states without an ongoing process"
+        )
+
+    N = ctx.n_runs
+    A = len(ctx.agent_uuids)
+    agents = initial_state["agents"].values()
+
+    state = {
+        key: np.full(N, initial_state.get(key, 0)) for key in BATCHED_STATE_VARIABLES
+    }
+    state["agents_balance"] = np.tile(
+        np.array([a.balance for a in agents], dtype=float), (N, 1)
+    )
+    state["agents_staked_amount"] = np.tile(
+        np.array([a.staked_amount for a in agents], dtype=float), (N, 1)
+    )
+
+    # Ongoing process of each run
+    state["process_id"] = np.full(N, -1)
+    state["process_phase"] = np.full(N, NO_PROCESS)
+    state["process_current_phase_init_time"] = np.zeros(N, dtype=int)
+    state["process_duration_in_current_phase"] = np.zeros(N, dtype=int)
+    state["process_entered_race_mode"] = np.zeros(N, dtype=bool)
+    state["process_leading_sequencer"] = np.full(N, -1)
+    state["process_prover"] = np.full(N, -1)
+    state["process_proposers"] = np.zeros((N, A), dtype=bool)
+    state["process_best_score"] = np.full(N, -np.inf)
+    return state
+
+
+def estimate(estimator, state: dict, n_runs: int) -> np.ndarray:
+    """
+    Evaluates a gas / tx estimator over the batched state. Estimators must
+    either return a scalar or one value per run.
+    """
+    return np.broadcast_to(np.asarray(estimator(state)), (n_runs,))
+
+
+def l1_fee(estimator, state: dict, n_runs: int) -> np.ndarray:
+    """
+    Fee of a L1 transaction for each run, as a float so that the
+    profitability logic can accumulate on it.
+    """
+    return (estimate(estimator, state, n_runs) * state["gas_fee_l1"]).astype(float)
+
+
+def is_censored(ctx: BatchContext, time_l1: np.ndarray) -> np.ndarray:
+    return lookup_censorship(ctx.censored_builder, time_l1) | lookup_censorship(
+        ctx.censored_validator, time_l1
+    )
+
+
+def choose_agent(ctx: BatchContext, candidates: np.ndarray) -> np.ndarray:
+    """
+    Uniformly picks one of the candidate agents of each run, or -1 for the
+    runs without candidates.
+    """
+    n_candidates = candidates.sum(axis=1)
+    k = np.floor(ctx.stream.uniforms(ctx.n_runs) * n_candidates)
+    chosen = np.argmax(np.cumsum(candidates, axis=1) > k[:, None], axis=1)
+    return np.where(n_candidates > 0, chosen, -1)
+
+
+def b_time_tracking(params: AztecModelParams, ctx: BatchContext, state: dict):
+    """
+    Batched `Time Tracking` block.
+    """
+    delta = params["timestep_in_blocks"]
+    state["time_l1"] = state["time_l1"] + delta
+    state["delta_blocks"] = np.full(ctx.n_runs, delta)
+    has_process = state["process_phase"] != NO_PROCESS
+    state["process_duration_in_current_phase"] = np.where(
+        has_process,
+        state["process_duration_in_current_phase"] + delta,
+        state["process_duration_in_current_phase"],
+    )
+
+
+def b_gas_fees(params: AztecModelParams, ctx: BatchContext, state: dict):
+    """
+    Batched `Exogenous Processes` block.
+    """
+    w = params["past_gas_weight_fraction"]
+    for key, time_series in (
+        ("gas_fee_l1", ctx.gas_fee_l1_time_series),
+        ("gas_fee_blob", ctx.gas_fee_blob_time_series),
+    ):
+        assert (
+            state["time_l1"] < len(time_series)
+        ).all(), "The time_l1 of {} is out of bounds for the time series of {}".format(
+            state["time_l1"].max(), key
+        )
+        value = w * state[key] + (1 - w) * time_series[state["time_l1"]]
+        state[key] = np.round(value).astype(int)
+
+
+def b_agent_actions(params: AztecModelParams, ctx: BatchContext, state: dict):
+    """
+    Batched `Agent Actions` block: new proposals and sequencer re-staking.
+    """
+    N = ctx.n_runs
+    A = len(ctx.agent_uuids)
+    staked = state["agents_staked_amount"]
+    balance = state["agents_balance"]
+
+    # New proposals
+    pending = state["process_phase"] == SelectionPhase.pending_proposals
+    potential_proposers = (
+        pending[:, None]
+        & ~state["process_proposers"]
+        & ctx.is_sequencer[None, :]
+        & (staked >= params["minimum_stake"])
+    )
+    probability = trial_probability(
+        params["phase_duration_proposal_max_blocks"], params["final_probability"]
+    )
+    decides = ctx.stream.uniforms((N, A)) <= probability
+    scores = ctx.stream.uniforms((N, A))
+    block_is_uncensored = ~is_censored(ctx, state["time_l1"])
+    proposes = potential_proposers & decides & block_is_uncensored[:, None]
+
+    state["process_proposers"] = state["process_proposers"] | proposes
+    scores = np.where(proposes, scores, -np.inf)
+    best_proposer = scores.argmax(axis=1)
+    best_score = scores.max(axis=1)
+    improves = best_score > state["process_best_score"]
+    state["process_best_score"] = np.where(
+        improves, best_score, state["process_best_score"]
+    )
+    state["process_leading_sequencer"] = np.where(
+        improves, best_proposer, state["process_leading_sequencer"]
+    )
+
+    # Re-staking
+    # Assumption: Sequencers top-up from balance with more ETH than necessary
+    below_stake = ctx.is_sequencer[None, :] & (staked < params["minimum_stake"])
+    amount_to_stake = np.minimum(
+        params["minimum_stake"] - staked + params["top_up_amount"], balance
+    )
+    amount_to_stake = np.where(below_stake, amount_to_stake, 0.0)
+    state["agents_balance"] = balance - amount_to_stake
+    state["agents_staked_amount"] = staked + amount_to_stake
+
+
+def b_evolve_process(params: AztecModelParams, ctx: BatchContext, state: dict):
+    """
+    Batched `Evolve Block Process` block. As every run is on a single phase,
+    the policies on `phases.py` are applied on disjoint masks.
+    """
+    N = ctx.n_runs
+    rows = np.arange(N)
+    phase = state["process_phase"]
+    duration = state["process_duration_in_current_phase"]
+    time_l1 = state["time_l1"]
+    leader = state["process_leading_sequencer"]
+    prover = state["process_prover"]
+    balance = state["agents_balance"]
+
+    new_phase = phase.copy()
+    new_duration = duration.copy()
+    new_init_time = state["process_current_phase_init_time"].copy()
+    new_prover = prover.copy()
+    entered_race_mode = state["process_entered_race_mode"].copy()
+    advance_blocks = np.zeros(N, dtype=int)
+    sequencer_slash = np.zeros(N)
+    prover_slash = np.zeros(N)
+
+    block_is_uncensored = ~is_censored(ctx, time_l1)
+
+    # p_select_proposal
+    on_phase = phase == SelectionPhase.pending_proposals
+    expired = on_phase & (params["phase_duration_proposal_max_blocks"] - duration < 0)
+    selected = expired & (leader >= 0)
+    skipped = expired & ~selected
+    new_phase[selected] = SelectionPhase.pending_commit_bond
+    new_init_time[selected] = time_l1[selected]
+    new_phase[skipped] = SelectionPhase.skipped
+    new_duration[expired] = 0
+
+    # p_commit_bond
+    on_phase = phase == SelectionPhase.pending_commit_bond
+    remaining_time = params["phase_duration_commit_bond_max_blocks"] - duration
+    expired = on_phase & (remaining_time < 0)
+    new_phase[expired] = SelectionPhase.proof_race
+    entered_race_mode[expired] = True
+    new_duration[expired] = 0
+    sequencer_slash[expired] = params["slash_params"].failure_to_commit_bond
+
+    fee = l1_fee(params["gas_estimators"].commitment_bond, state, N)
+    _, _, payoff_reveal = determine_profitability("Commit Bond", params, fee)
+    decides = ctx.stream.uniforms(N) <= trial_probability(
+        params["phase_duration_commit_bond_max_blocks"], params["final_probability"]
+    )
+    commits = (
+        on_phase & ~expired & (payoff_reveal >= 0) & decides & block_is_uncensored
+    )
+
+    bond_amount = params["commit_bond_amount"]
+    proving_market_is_used = (
+        ctx.stream.uniforms(N) <= params["proving_marketplace_usage_probability"]
+    )
+    market_prover = choose_agent(
+        ctx, ctx.is_prover[None, :] & (balance >= bond_amount)
+    )
+    leader_can_prove = balance[rows, np.maximum(leader, 0)] >= bond_amount
+    chosen_prover = np.where(
+        proving_market_is_used & (market_prover >= 0),
+        market_prover,
+        np.where(leader_can_prove, leader, -1),
+    )
+    commits &= chosen_prover >= 0
+    advance_blocks[commits] = remaining_time[commits]
+    new_phase[commits] = SelectionPhase.pending_reveal
+    new_duration[commits] = 0
+    new_prover[commits] = chosen_prover[commits]
+
+    # p_reveal_content
+    on_phase = phase == SelectionPhase.pending_reveal
+    remaining_time = params["phase_duration_reveal_max_blocks"] - duration
+    expired = on_phase & (remaining_time < 0)
+    new_phase[expired] = SelectionPhase.proof_race
+    entered_race_mode[expired] = True
+    new_duration[expired] = 0
+    # NOTE: `p_reveal_content` does not signal its slashing transfer,
+    # so the leading sequencer is not slashed here either.
+
+    fee = l1_fee(params["gas_estimators"].content_reveal, state, N)
+    _, _, payoff_reveal = determine_profitability("Reveal Content", params, fee)
+    decides = ctx.stream.uniforms(N) <= trial_probability(
+        params["phase_duration_reveal_max_blocks"], params["final_probability"]
+    )
+    reveals = (
+        on_phase & ~expired & (payoff_reveal >= 0) & decides & block_is_uncensored
+    )
+    advance_blocks[reveals] = remaining_time[reveals]
+    new_phase[reveals] = SelectionPhase.pending_rollup_proof
+    new_duration[reveals] = 0
+
+    # p_submit_proof
+    on_phase = phase == SelectionPhase.pending_rollup_proof
+    remaining_time = params["phase_duration_rollup_max_blocks"] - duration
+    expired = on_phase & (remaining_time < 0)
+    new_phase[expired] = SelectionPhase.skipped
+    new_duration[expired] = 0
+    prover_slash[expired] = bond_amount
+
+    fee = l1_fee(params["gas_estimators"].content_reveal, state, N)
+    _, _, payoff_reveal = determine_profitability("Submit Proof", params, fee)
+    decides = ctx.stream.uniforms(N) <= trial_probability(
+        params["phase_duration_rollup_max_blocks"], params["final_probability"]
+    )
+    proves = on_phase & ~expired & (payoff_reveal >= 0) & decides & block_is_uncensored
+    advance_blocks[proves] = remaining_time[proves]
+    new_phase[proves] = SelectionPhase.finalized
+    new_duration[proves] = 0
+
+    # p_race_mode
+    # NOTE: Logic of race mode is different.
+    # No check here for L1 censorship.
+    on_phase = phase == SelectionPhase.proof_race
+    expired = on_phase & (params["phase_duration_race_max_blocks"] - duration < 0)
+    new_phase[expired] = SelectionPhase.skipped
+    new_phase[on_phase & ~expired] = SelectionPhase.finalized
+    new_duration[on_phase] = 0
+
+    # p_init_process
+    init = (
+        (phase == NO_PROCESS)
+        | (phase == SelectionPhase.finalized)
+        | (phase == SelectionPhase.skipped)
+    )
+    new_phase[init] = SelectionPhase.pending_proposals
+    new_init_time[init] = time_l1[init]
+    new_duration[init] = 0
+    new_prover[init] = -1
+    entered_race_mode[init] = False
+    state["process_id"] = np.where(init, state["process_id"] + 1, state["process_id"])
+    state["process_leading_sequencer"] = np.where(init, -1, leader)
+    state["process_proposers"] = state["process_proposers"] & ~init[:, None]
+    state["process_best_score"] = np.where(init, -np.inf, state["process_best_score"])
+
+    # s_agent_transfer
+    balance = balance.copy()
+    staked = state["agents_staked_amount"].copy()
+    slashed = sequencer_slash > 0
+    staked[rows[slashed], leader[slashed]] -= sequencer_slash[slashed]
+    balance[rows[slashed], ctx.burnt] += sequencer_slash[slashed]
+    assert (
+        staked[rows[slashed], leader[slashed]] >= 0
+    ).all(), "This transfer results in a negative staked amount"
+    slashed = prover_slash > 0
+    balance[rows[slashed], prover[slashed]] -= prover_slash[slashed]
+    balance[rows[slashed], ctx.burnt] += prover_slash[slashed]
+    assert (
+        balance[rows[slashed], prover[slashed]] >= 0
+    ).all(), "This transfer resulted in a negative balance"
+
+    state["agents_balance"] = balance
+    state["agents_staked_amount"] = staked
+    state["slashes_to_sequencers"] = state["slashes_to_sequencers"] + (
+        sequencer_slash > 0
+    )
+    state["slashes_to_provers"] = state["slashes_to_provers"] + (prover_slash > 0)
+    state["process_phase"] = new_phase
+    state["process_duration_in_current_phase"] = new_duration
+    state["process_current_phase_init_time"] = new_init_time
+    state["process_prover"] = new_prover
+    state["process_entered_race_mode"] = entered_race_mode
+    state["advance_l1_blocks"] = advance_blocks
+    # NOTE: as `meta.s_is_censored`, which stores `check_for_censorship`,
+    # the column is True when the block is *uncensored*.
+    state["is_censored"] = block_is_uncensored
+
+
+def b_payouts(params: AztecModelParams, ctx: BatchContext, state: dict):
+    """
+    Batched `Payouts` block.
+    """
+    finalized = state["process_phase"] == SelectionPhase.finalized
+
+    # Assumption: this assumes that the average L2 block duration
+    # will be the max L2 block duration
+    expected_l2_blocks_per_day = params["l1_blocks_per_day"] / total_phase_duration(
+        params
+    )
+    reward = params["daily_block_reward"] / expected_l2_blocks_per_day
+    block_reward = np.where(finalized, reward, 0.0)
+
+    rewards_relay = block_reward * params["rewards_to_relay"]
+    rewards_prover = block_reward * params["rewards_to_provers"]
+    rewards_sequencer = block_reward - (rewards_relay + rewards_prover)
+
+    state["total_rewards_provers"] = state["total_rewards_provers"] + rewards_prover
+    state["total_rewards_sequencers"] = (
+        state["total_rewards_sequencers"] + rewards_sequencer
+    )
+    state["total_rewards_relays"] = state["total_rewards_relays"] + rewards_relay
+
+    # The rollup proof is submitted by the prover, or by the L1 builder
+    # when on race mode.
+    rows = np.arange(ctx.n_runs)
+    race_mode = state["process_entered_race_mode"]
+    relay = choose_agent(ctx, np.tile(ctx.is_relay, (ctx.n_runs, 1)))
+    sequencer = np.where(race_mode, ctx.l1_builder, state["process_prover"])
+    relay = np.where(race_mode, ctx.l1_builder, relay)
+
+    balance = state["agents_balance"].copy()
+    rows, sequencer, relay = rows[finalized], sequencer[finalized], relay[finalized]
+    balance[rows, sequencer] += rewards_sequencer[finalized]
+    balance[rows, sequencer] += rewards_prover[finalized]
+    balance[rows, relay] += rewards_relay[finalized]
+    state["agents_balance"] = balance
+
+    state["cumm_block_rewards"] = state["cumm_block_rewards"] + block_reward
+
+
+def b_evolve_time_dynamical(params: AztecModelParams, ctx: BatchContext, state: dict):
+    """
+    Batched `Dynamically Evolve Time` block.
+    """
+    delta = state["advance_l1_blocks"]
+    state["time_l1"] = state["time_l1"] + delta
+    state["delta_blocks"] = delta
+    state["process_current_phase_init_time"] = (
+        state["process_current_phase_init_time"] + delta
+    )
+    state["advance_l1_blocks"] = np.zeros(ctx.n_runs, dtype=int)
+
+
+def b_metrics(params: AztecModelParams, ctx: BatchContext, state: dict):
+    """
+    Batched `Metrics` block.
+    """
+    finalized = state["process_phase"] == SelectionPhase.finalized
+    state["finalized_blocks_count"] = state["finalized_blocks_count"] + finalized
+
+
+BATCHED_MODEL_BLOCKS = [
+    b_time_tracking,
+    b_gas_fees,
+    b_agent_actions,
+    b_evolve_process,
+    b_payouts,
+    b_evolve_time_dynamical,
+    b_metrics,
+]
+
+
+def run_batched_timestep(params: AztecModelParams, ctx: BatchContext, state: dict):
+    for block in BATCHED_MODEL_BLOCKS:
+        block(params, ctx, state)
@@ -1,5 +1,11 @@
 from typing import Tuple
-from ..types import AztecModelParams, Tokens
+from ..types import (
+    AztecModelParams,
+    Tokens,
+    Process,
+    SelectionPhase,
+    TransactionLedger,
+)
 from ..helper import rewards_to_sequencer, total_phase_duration
 
 
@@ -130,3 +136,39 @@ def determine_profitability_op_cost(
 
     else:
         assert False, "Not implemented for phase {}".format(phase)
+
+
+def retain_transactions(
+    params: AztecModelParams, transactions: TransactionLedger, process: Process
+) -> TransactionLedger:
+    """Function to apply the transaction retention policy after the payouts
+
+    Args:
+        params (AztecModelParams): The system parameters
+        transactions (TransactionLedger): The current transactions
+        process (Process): The current process
+
+    Returns:
+        TransactionLedger: The transactions to be kept on the state
+    """
+    if params["fp_transaction_retention"] == "Keep All":
+        return transactions
+    elif params["fp_transaction_retention"] == "Evict Settled":
+        return retain_transactions_evict_settled(transactions, process)
+    else:
+        assert (
+            False
+        ), "The param of {} for fp_transaction_retention is not valid".format(
+            params["fp_transaction_retention"]
+        )
+
+
+def retain_transactions_evict_settled(
+    transactions: TransactionLedger, process: Process
+) -> TransactionLedger:
+    if process is None:
+        return transactions
+    elif process.phase in (SelectionPhase.finalized, SelectionPhase.skipped):
+        return transactions.evict(process)
+    else:
+        return transactions
@@ -2,9 +2,7 @@ from aztec_gddt.helper import *
 from aztec_gddt.types import *
 from uuid import uuid4
 from copy import deepcopy, copy
-from random import choice
-from scipy.stats import uniform
-from .functional_parameterizations import determine_profitability
+from .functional_parameterizations import determine_profitability, retain_transactions
 
 
 def s_gas_fee_l1(p: AztecModelParams, _2, _3, s, _5):
@@ -103,7 +101,9 @@ def p_select_proposal(
 
     remaining_time = max_phase_duration - process.duration_in_current_phase
     if remaining_time < 0:
-        raw_proposals: dict[TxUUID, Proposal] = proposals_from_tx(state["transactions"])
+        raw_proposals: dict[TxUUID, Proposal] = proposals_from_tx(
+            state["transactions"], process.uuid
+        )
 
         proposals = {
             k: p
@@ -206,7 +206,8 @@ def p_commit_bond(
                 probability=trial_probability(
                     params["phase_duration_commit_bond_max_blocks"],
                     params["final_probability"],
-                )
+                ),
+                stream=random_stream(params),
             )
 
             block_is_uncensored = check_for_censorship(params, state)
@@ -216,7 +217,8 @@ def p_commit_bond(
                 lead_seq: Agent = state["agents"][process.leading_sequencer]
                 proposal_uuid = process.tx_winning_proposal
                 proving_market_is_used = bernoulli_trial(
-                    params["proving_marketplace_usage_probability"]
+                    params["proving_marketplace_usage_probability"],
+                    stream=random_stream(params),
                 )
 
                 if proving_market_is_used:
@@ -227,7 +229,7 @@ def p_commit_bond(
                     ]
 
                     if len(provers) > 0:
-                        prover: AgentUUID = choice(provers)
+                        prover: AgentUUID = random_stream(params).choice(provers)
                     else:
                         if lead_seq.balance >= bond_amount:
                             prover = updated_process.leading_sequencer
@@ -323,7 +325,8 @@ def p_reveal_content(
                     probability=trial_probability(
                         params["phase_duration_reveal_max_blocks"],
                         params["final_probability"],
-                    )
+                    ),
+                    stream=random_stream(params),
                 )
 
                 block_is_uncensored = check_for_censorship(params, state)
@@ -432,7 +435,8 @@ def p_submit_proof(
                     probability=trial_probability(
                         params["phase_duration_rollup_max_blocks"],
                         params["final_probability"],
-                    )
+                    ),
+                    stream=random_stream(params),
                 )
 
                 block_is_uncensored = check_for_censorship(params, state)
@@ -567,40 +571,43 @@ def s_transactions_new_proposals(
     Logic for submitting new proposals.
     """
 
-    new_transactions = state["transactions"].copy()
+    transactions: TransactionLedger = state["transactions"]
     current_process: Process | None = state["current_process"]
     new_proposals: dict[TxUUID, Proposal] = dict()
 
     if current_process is None:
-        return ("transactions", new_transactions)
+        return ("transactions", transactions)
     if current_process.phase != SelectionPhase.pending_proposals:
-        return ("transactions", new_transactions)
+        return ("transactions", transactions)
 
     current_proposers: set[AgentUUID] = {
         p.who
-        for p in new_transactions.values()
+        for p in transactions.for_process(current_process.uuid)
         if p.when >= current_process.current_phase_init_time
     }
-    potential_proposers: set[AgentUUID] = {
+    # NOTE: a list keeps the draws in agent order, so that they are reproducible.
+    potential_proposers: list[AgentUUID] = [
         u.uuid
         for u in state["agents"].values()
         if u.uuid not in current_proposers
         and u.is_sequencer
         and u.staked_amount >= params["minimum_stake"]
-    }
+    ]
 
     for potential_proposer in potential_proposers:
         if bernoulli_trial(
             trial_probability(
                 params["phase_duration_proposal_max_blocks"],
                 params["final_probability"],
-            )
+            ),
+            stream=random_stream(params),
         ):
 
             tx_uuid = uuid4()
             gas: Gas = params["gas_estimators"].proposal(state)
             fee: Gwei = gas * state["gas_fee_l1"]
-            score = uniform.rvs()  # Assumption: score is always uniform
+            # Assumption: score is always uniform
+            score = random_stream(params).uniform()
             size = params["tx_estimators"].proposal_average_size(state)
             public_share = 0.5  # Assumption: Share of public function calls
 
@@ -620,7 +627,9 @@ def s_transactions_new_proposals(
 
                 new_proposals[tx_uuid] = new_proposal
 
-    new_transactions = {**new_transactions, **new_proposals}
+    new_transactions = transactions.append(
+        current_process.uuid, new_proposals.values()
+    )
     return ("transactions", new_transactions)
 
 
@@ -643,9 +652,12 @@ def s_transactions(
         "new_transactions", list()
     )  # type: ignore
 
-    new_tx_dict: dict[TxUUID, TransactionL1] = {tx.uuid: tx for tx in new_tx_list}
+    # NOTE: the new transactions are always about the process on which
+    # the policies were evaluated.
+    process: Process | None = state["current_process"]
+    process_uuid = process.uuid if process is not None else None
 
-    new_transactions = {**state["transactions"].copy(), **new_tx_dict}
+    new_transactions = state["transactions"].append(process_uuid, new_tx_list)
 
     return ("transactions", new_transactions)
 
@@ -705,6 +717,16 @@ def s_slashes_to_sequencer(
     return ("slashes_to_sequencers", updated_slashes_to_sequencer)
 
 
+def updated_agent(agents: dict[AgentUUID, Agent], uuid: AgentUUID) -> Agent:
+    """
+    Replaces an agent of an (already copied) `agents` dict by a copy, to be
+    updated. Agents are never mutated in place, so that the agents of the
+    previous states (eg. on the rows of the Timestep Tensor) keep their values.
+    """
+    agents[uuid] = copy(agents[uuid])
+    return agents[uuid]
+
+
 def s_agent_transfer(
     params: AztecModelParams,
     _2,
@@ -720,14 +742,14 @@ def s_agent_transfer(
 
     for transfer in transfers:
         if transfer.kind == TransferKind.conventional:
-            updated_agents[transfer.source].balance -= transfer.amount
-            updated_agents[transfer.destination].balance += transfer.amount
+            updated_agent(updated_agents, transfer.source).balance -= transfer.amount
+            updated_agent(updated_agents, transfer.destination).balance += transfer.amount
         elif transfer.kind == TransferKind.slash_sequencer:
-            updated_agents[transfer.source].staked_amount -= transfer.amount
-            updated_agents[transfer.destination].balance += transfer.amount
+            updated_agent(updated_agents, transfer.source).staked_amount -= transfer.amount
+            updated_agent(updated_agents, transfer.destination).balance += transfer.amount
         elif transfer.kind == TransferKind.slash_prover:
-            updated_agents[transfer.source].balance -= transfer.amount
-            updated_agents[transfer.destination].balance += transfer.amount
+            updated_agent(updated_agents, transfer.source).balance -= transfer.amount
+            updated_agent(updated_agents, transfer.destination).balance += transfer.amount
         else:
             raise Exception(f"Transfer logic is undefined for {transfer.kind}")
 
@@ -814,7 +836,7 @@ def s_total_rewards_provers(
         if not p.entered_race_mode:
             prover_uuid = txs[p.tx_commitment_bond].prover_uuid  # type: ignore
             relays = [a_id for (a_id, a) in state["agents"].items() if a.is_relay]
-            relay_uuid: AgentUUID = choice(relays)
+            relay_uuid: AgentUUID = random_stream(params).choice(relays)
         else:
             prover_uuid = sequencer_uuid
             relay_uuid = sequencer_uuid
@@ -848,7 +870,7 @@ def s_total_rewards_sequencers(
         if not p.entered_race_mode:
             prover_uuid = txs[p.tx_commitment_bond].prover_uuid  # type: ignore
             relays = [a_id for (a_id, a) in state["agents"].items() if a.is_relay]
-            relay_uuid: AgentUUID = choice(relays)
+            relay_uuid: AgentUUID = random_stream(params).choice(relays)
         else:
             prover_uuid = sequencer_uuid
             relay_uuid = sequencer_uuid
@@ -884,7 +906,7 @@ def s_total_rewards_relays(
         if not p.entered_race_mode:
             prover_uuid = txs[p.tx_commitment_bond].prover_uuid  # type: ignore
             relays = [a_id for (a_id, a) in state["agents"].items() if a.is_relay]
-            relay_uuid: AgentUUID = choice(relays)
+            relay_uuid: AgentUUID = random_stream(params).choice(relays)
         else:
             prover_uuid = sequencer_uuid
             relay_uuid = sequencer_uuid
@@ -915,20 +937,34 @@ def s_agents_rewards(
         if not p.entered_race_mode:
             prover_uuid = txs[p.tx_commitment_bond].prover_uuid  # type: ignore
             relays = [a_id for (a_id, a) in state["agents"].items() if a.is_relay]
-            relay_uuid: AgentUUID = choice(relays)
+            relay_uuid: AgentUUID = random_stream(params).choice(relays)
         else:
             prover_uuid = sequencer_uuid
             relay_uuid = sequencer_uuid
 
         # Disburse Rewards
-        agents[sequencer_uuid].balance += rewards_sequencer
-        agents[prover_uuid].balance += rewards_prover
-        agents[relay_uuid].balance += rewards_relay
+        updated_agent(agents, sequencer_uuid).balance += rewards_sequencer
+        updated_agent(agents, prover_uuid).balance += rewards_prover
+        updated_agent(agents, relay_uuid).balance += rewards_relay
         return ("agents", agents)
     else:
         return ("agents", state["agents"])
 
 
+def s_transactions_retention(
+    params: AztecModelParams, _2, _3, state: AztecModelState, _5
+):
+    """
+    Logic for dropping the transactions of settled processes, as per the
+    `fp_transaction_retention` parameter. Runs alongside the payouts, which
+    are the last logic reading the transactions of a settled process.
+    """
+    value = retain_transactions(
+        params, state["transactions"], state["current_process"]
+    )
+    return ("transactions", value)
+
+
 def s_token_supply(
     params: AztecModelParams,
     _2,
@@ -959,8 +995,9 @@ def s_agent_restake(
                 params["minimum_stake"] - v.staked_amount + params["top_up_amount"]
             )
             amount_to_stake = min(max_amount_to_stake, v.balance)
-            v.balance -= amount_to_stake
-            v.staked_amount += amount_to_stake
+            agent = updated_agent(new_agents, k)
+            agent.balance -= amount_to_stake
+            agent.staked_amount += amount_to_stake
 
     return ("agents", new_agents)
 
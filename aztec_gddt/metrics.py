@@ -29,10 +29,44 @@ G2 = [("average_duration_finalized_blocks", "below"),
 ## Begin helper functions      ##
 #################################
 
+def agents_balance(df: pd.DataFrame) -> np.ndarray:
+    """
+    Total balance of the agents on every row of a Timestep Tensor with an
+    `agent_deltas` column (see `engine.native_sim_run`), whose trajectories
+    are on contiguous rows, by timestep.
+    """
+    totals = np.empty(len(df))
+    ids = df[['simulation', 'subset', 'run']].to_numpy()
+    current = None
+    balances: dict[str, float] = {}
+    total = np.nan
+    for i, (id_values, deltas) in enumerate(zip(ids, df['agent_deltas'])):
+        trajectory = tuple(id_values)
+        if trajectory != current:
+            current = trajectory
+            balances = {}
+        changed = False
+        for agent, field, value in deltas:
+            if field == 'balance':
+                balances[agent] = value
+                changed = True
+        if changed:
+            # Summed on the agents order, as `kpis._total_balance`
+            total = sum(balances.values())
+        totals[i] = total
+    return totals
+
+
 def process_df(sim_df: pd.DataFrame):
+    if 'agent_deltas' in sim_df.columns:
+        # NOTE: the balances are accumulated from the deltas of every row,
+        # so they are decoded before dropping any of them.
+        sim_df = sim_df.assign(agents_balance=agents_balance(sim_df)).drop(columns=['agent_deltas'])
     new_df = sim_df.copy(deep=True).dropna(axis='index')
-    new_df['process_id'] = new_df['current_process'].apply(lambda x: None if x is None else x.uuid )
-    new_df['process_phase'] = new_df['current_process'].apply(lambda x: None if x is None else x.phase)
+    # NOTE: the batched engine already outputs the process columns
+    if 'current_process' in new_df.columns:
+        new_df['process_id'] = new_df['current_process'].apply(lambda x: None if x is None else x.uuid )
+        new_df['process_phase'] = new_df['current_process'].apply(lambda x: None if x is None else x.phase)
     return new_df
 
 
@@ -196,6 +230,8 @@ def find_stddev_payoffs_to_provers(trajectory: pd.DataFrame) -> float | np.float
     return float('nan')  
 
 def find_delta_total_revenue_agents(trajectory: pd.DataFrame) -> float | np.floating:
+    if 'agents' not in trajectory.columns:
+        return trajectory["agents_balance"].iloc[-1] - trajectory["agents_balance"].iloc[0]
     initial_balance_agents = sum([agent.balance for agent in trajectory["agents"].iloc[0].values()])
     final_balance_agents = sum([agent.balance for agent in trajectory["agents"].iloc[-1].values()])
     delta_balance_agents = final_balance_agents - initial_balance_agents
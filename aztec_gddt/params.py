@@ -1,14 +1,12 @@
 from aztec_gddt.types import *
-from uuid import uuid4
-from scipy.stats import norm  # type: ignore
+from aztec_gddt.helper import value_from_param_timeseries_suf
+from aztec_gddt.scenarios import gas_fee_time_series
+from uuid import UUID
 import numpy as np
 import pandas as pd
 import random
 from typing import List
 
-# Note: For numpy 1.26 and above, random calls go through a generator.
-rng = np.random.default_rng()
-
 L1_BUFFER = 10  # To check timesteps -> L1_timesteps issue
 TIMESTEPS = 1_000  # Used mostly for single runs
 SAMPLES = 1  # Used mostly for single runs
@@ -45,10 +43,12 @@ BASE_AGENTS = [
 
 BASE_AGENTS_DICT = {a.uuid: a for a in BASE_AGENTS}
 
-# Note: Used mostly for single runs
+# Note: Used mostly for single runs. The UUIDs are seeded, so that they
+# are the same on every process.
+_initial_agents_rng = random.Random(0)
 INITIAL_AGENTS: list[Agent] = [
     Agent(
-        uuid=uuid4(),
+        uuid=UUID(int=_initial_agents_rng.getrandbits(128), version=4),
         # balance=max(norm.rvs(50, 20), 1),
         balance=100,
         is_sequencer=True,
@@ -94,7 +94,7 @@ INITIAL_STATE = AztecModelState(
     total_rewards_sequencers=0.0,  # unit: Tokens
     agents=AGENTS_DICT,
     current_process=None,  # Note: Used to start without an ongoing L2 block process
-    transactions=dict(),
+    transactions=TransactionLedger(),
     gas_fee_l1=50,  # unit: Gwei # Assumption
     gas_fee_blob=30,  # unit: Gwei # Assumption: In reality likely much lower, but must be tuned. Goes per MB, not per blob currently
     finalized_blocks_count=0,
@@ -108,145 +108,63 @@ INITIAL_STATE = AztecModelState(
 INITIAL_STATE["token_supply"] = TokenSupply.from_state(INITIAL_STATE)
 
 #############################################################
-## Begin: Steady state gas estimators defined              ##
+## Begin: gas fee scenarios defined                        ##
 #############################################################
 
-MEAN_STEADY_STATE_L1 = 50  # type: Gwei
-DEVIATION_STEADY_STATE_L1 = 5
-MEAN_STEADY_STATE_BLOB = 30  # type: Gwei
-DEVIATION_STEADY_STATE_BLOB = 5
-
-# Note: Rounding is needed to address the fact that Gas is an integer type.
-steady_gas_fee_l1_time_series = np.array(
-    [
-        max(floor(el), 10)
-        for el in rng.standard_normal(TIMESTEPS) * DEVIATION_STEADY_STATE_L1
-        + MEAN_STEADY_STATE_L1  # DEVIATION_STEADY_STATE_L1
-    ]
-)
-steady_gas_fee_blob_time_series = np.array(
-    [
-        max(floor(el), 10)
-        for el in rng.standard_normal(TIMESTEPS) * DEVIATION_STEADY_STATE_BLOB
-        + MEAN_STEADY_STATE_BLOB
-    ]
-)
+# NOTE: The gas fee time series are generated on first use, see
+# `aztec_gddt.scenarios`. The module attributes below are kept for
+# backwards compatibility, and resolved lazily by `__getattr__`.
+GAS_SCENARIO_SEED = 0
+GAS_TIME_SERIES_SIZE = TIMESTEPS * L1_BUFFER
+
+
+def gas_scenario_time_series(kind: str,
+                             fee: str,
+                             length: int = GAS_TIME_SERIES_SIZE,
+                             seed: int = GAS_SCENARIO_SEED) -> np.ndarray:
+    """
+    Gas fee time series of a scenario, with its shocks placed relative to
+    the single run `TIMESTEPS`.
+    """
+    return gas_fee_time_series(kind, fee, length, seed, horizon=TIMESTEPS)
+
+
+_LAZY_GAS_TIME_SERIES = {
+    "steady_gas_fee_l1_time_series": ("steady", "l1"),
+    "steady_gas_fee_blob_time_series": ("steady", "blob"),
+    "single_shock_gas_fee_l1_time_series": ("single_shock", "l1"),
+    "single_shock_gas_fee_blob_time_series": ("single_shock", "blob"),
+    "intermit_shock_gas_fee_l1_time_series": ("intermittent_shock", "l1"),
+    "intermit_shock_gas_fee_blob_time_series": ("intermittent_shock", "blob"),
+    "zero_timeseries": ("zero", "l1"),
+}
+GAS_SCENARIO_KINDS = ["steady", "intermittent_shock", "single_shock"]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_GAS_TIME_SERIES:
+        return gas_scenario_time_series(*_LAZY_GAS_TIME_SERIES[name])
+    if name == "GAS_FEE_L1_TIME_SERIES_LIST":
+        return [gas_scenario_time_series(kind, "l1") for kind in GAS_SCENARIO_KINDS]
+    if name == "GAS_FEE_BLOB_TIME_SERIES_LIST":
+        return [gas_scenario_time_series(kind, "blob") for kind in GAS_SCENARIO_KINDS]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def steady_state_l1_gas_estimate(state: AztecModelState):
-    assert state["time_l1"] < len(
-        steady_gas_fee_l1_time_series
-    ), "The time_l1 of {} is out of bounds for the time series of steady_gas_fee_l1_time_series".format(
-        state["time_l1"]
-    )
-
-    return steady_gas_fee_l1_time_series[state["time_l1"]]
+    return value_from_param_timeseries_suf(
+        {"gas_fee_l1_time_series": gas_scenario_time_series("steady", "l1")},
+        state, "gas_fee_l1_time_series", "gas_fee_l1")
 
 
 def steady_state_blob_gas_estimate(state: AztecModelState):
+    return value_from_param_timeseries_suf(
+        {"gas_fee_blob_time_series": gas_scenario_time_series("steady", "blob")},
+        state, "gas_fee_blob_time_series", "gas_fee_blob")
 
-    assert state["time_l1"] < len(
-        steady_gas_fee_blob_time_series
-    ), "The time_l1 of {} is out of bounds for the time series of steady_gas_fee_blob_time_series".format(
-        state["time_l1"]
-    )
-
-    return steady_gas_fee_blob_time_series[state["time_l1"]]
-
-
-#############################################################
-## End: Steady state gas estimators defined                ##
-#############################################################
 
 #############################################################
-## Begin: single shock gas estimators defined              ##
-#############################################################
-
-
-# NOTE: ideally, this should be mapped either to relative timesteps or L1 time rather than fixed timesteps
-# so that the scenarios are invariant to number
-L1_SHOCK_AMOUNT = 150  # type: Gwei
-BLOB_SHOCK_AMOUNT = 150  # type: Gwei
-initial_time = floor(0.25 * TIMESTEPS)  # Assumption: 25% of timesteps
-final_time = floor(0.25 * TIMESTEPS)  # Assumption: 25% of timesteps
-
-
-zero_timeseries = np.zeros(TIMESTEPS * 10)
-
-single_shock_gas_fee_l1_time_series = np.zeros(TIMESTEPS * 10)
-single_shock_gas_fee_blob_time_series = np.zeros(TIMESTEPS * 10)
-
-single_shock_gas_fee_l1_time_series[0:initial_time] = steady_gas_fee_l1_time_series[
-    0:initial_time
-].copy()
-single_shock_gas_fee_l1_time_series[-final_time:] = steady_gas_fee_l1_time_series[
-    -final_time:
-].copy()
-single_shock_gas_fee_l1_time_series[initial_time : TIMESTEPS - final_time] = (
-    steady_gas_fee_l1_time_series[initial_time : TIMESTEPS - final_time].copy()
-    + L1_SHOCK_AMOUNT
-)
-
-single_shock_gas_fee_blob_time_series[0:initial_time] = steady_gas_fee_blob_time_series[
-    0:initial_time
-].copy()
-single_shock_gas_fee_blob_time_series[-final_time:] = steady_gas_fee_blob_time_series[
-    -final_time:
-].copy()
-single_shock_gas_fee_blob_time_series[initial_time : TIMESTEPS - final_time] = (
-    steady_gas_fee_blob_time_series[initial_time : TIMESTEPS - final_time].copy()
-    + L1_SHOCK_AMOUNT
-)
-
-#############################################################
-## End: single shock gas estimators defined                ##
-#############################################################
-
-#############################################################
-## Begin: intermittent shock gas estimators defined        ##
-#############################################################
-
-L1_INTER_SHOCK_AMPLITUDE = 100  # Amplitude of wave
-L1_INTER_SHOCK_PERIOD = 10  # Period of wave
-num_points = (TIMESTEPS - final_time) - initial_time
-t = np.arange(initial_time, initial_time + num_points)
-
-raw_shock_signal = (
-    L1_INTER_SHOCK_AMPLITUDE * np.sin(2 * np.pi * t / L1_INTER_SHOCK_PERIOD)
-    + L1_INTER_SHOCK_AMPLITUDE
-)
-L1_INTER_SHOCK_SIGNAL = np.array([floor(max(x, 1)) for x in raw_shock_signal])
-
-
-intermit_shock_gas_fee_l1_time_series = np.zeros(TIMESTEPS)
-intermit_shock_gas_fee_blob_time_series = np.zeros(TIMESTEPS)
-
-intermit_shock_gas_fee_l1_time_series[0:initial_time] = steady_gas_fee_l1_time_series[
-    0:initial_time
-].copy()
-intermit_shock_gas_fee_l1_time_series[-final_time:] = steady_gas_fee_l1_time_series[
-    -final_time:
-].copy()
-intermit_shock_gas_fee_l1_time_series[initial_time : TIMESTEPS - final_time] = (
-    steady_gas_fee_l1_time_series[initial_time : TIMESTEPS - final_time].copy()
-    + L1_INTER_SHOCK_SIGNAL
-)
-
-
-GAS_FEE_L1_TIME_SERIES_LIST = [
-    steady_gas_fee_l1_time_series,
-    intermit_shock_gas_fee_l1_time_series,
-    single_shock_gas_fee_l1_time_series,
-]
-GAS_FEE_BLOB_TIME_SERIES_LIST = [
-    steady_gas_fee_blob_time_series,
-    intermit_shock_gas_fee_blob_time_series,
-    single_shock_gas_fee_blob_time_series,
-]
-
-
-#############################################################
-## End: intermittent shock gas estimators defined        ##
+## End: gas fee scenarios defined                          ##
 #############################################################
 
 # HACK: Gas is 1 for all transactions
@@ -273,7 +191,7 @@ DEFAULT_DETERMINISTIC_GAS_ESTIMATOR = L1GasEstimators(
 L1_TIME_SERIES_SIZE = L1_BUFFER * TIMESTEPS
 
 ALWAYS_TRUE_SERIES = {i: True for i in range(0, L1_TIME_SERIES_SIZE)}
-ALWAYS_FALSE_SERIES = {i: False for i in range(0, L1_TIME_SERIES_SIZE)}
+ALWAYS_FALSE_SERIES = CensorshipSeries.from_values(np.zeros(L1_TIME_SERIES_SIZE, dtype=bool))
 
 
 def build_censor_series_from_role(
@@ -283,7 +201,7 @@ def build_censor_series_from_role(
     start_time: int,
     num_timesteps: int = 1000,
     start_time_is_block_no: bool = False,
-) -> dict[L1Blocks, bool]:
+) -> CensorshipSeries:
 
     # XXX: this assumes that the DataFrame has a unique, non-missing measurement
     # for each L1 time.
@@ -297,11 +215,9 @@ def build_censor_series_from_role(
         relevant_df = sorted_data.query(
             f"(block_number >= {start_time}) & (block_number < {start_time + num_timesteps})"
         )
-        censored_list = relevant_df[role].apply(lambda x: x in censor_list).to_list()
+        censored_list = relevant_df[role].isin(censor_list).to_list()
 
-        index_range_to_use: List[int] = [x for x in range(0, 0 + num_timesteps)]
-
-        censored_dict = dict(zip(index_range_to_use, censored_list))
+        return CensorshipSeries.from_values(censored_list, offset=0)
     else:
         index_range_to_use: List[int] = [
             x for x in range(start_time, start_time + num_timesteps)
@@ -309,12 +225,9 @@ def build_censor_series_from_role(
 
         indexed_data: pd.DataFrame = sorted_data.iloc[index_range_to_use]
 
-        censored_list: list[bool] = (
-            indexed_data[role].apply(lambda x: x in censor_list).to_list()
-        )
+        censored_list: list[bool] = indexed_data[role].isin(censor_list).to_list()
 
-        censored_dict = dict(zip(index_range_to_use, censored_list))
-    return censored_dict
+        return CensorshipSeries.from_values(censored_list, offset=start_time)
 
 
 def build_censor_params(
@@ -333,14 +246,14 @@ def build_censor_params(
 
     # XXX: Currently doubling number of timesteps due to weird out-of-range errors on long runs.
 
-    censorship_builder_data: dict[L1Blocks, bool] = build_censor_series_from_role(
+    censorship_builder_data: CensorshipSeries = build_censor_series_from_role(
         data=data,
         censor_list=censoring_builders,
         start_time=start_time,
         num_timesteps=practical_num_timesteps,
         role="builder",
     )
-    censorship_validator_data: dict[L1Blocks, bool] = build_censor_series_from_role(
+    censorship_validator_data: CensorshipSeries = build_censor_series_from_role(
         data=data,
         censor_list=censoring_validators,
         start_time=start_time,
@@ -363,6 +276,9 @@ def build_censor_params(
 
 SINGLE_RUN_PARAMS = AztecModelParams(
     label="default",
+    # NOTE: each (subset, run) trajectory gets its own stream from this seed
+    # when running on the native engine.
+    random_seed=0,
     timestep_in_blocks=1,
     uncle_count=0,
     fee_subsidy_fraction=1.0,  # unused
@@ -404,8 +320,8 @@ SINGLE_RUN_PARAMS = AztecModelParams(
     gas_estimators=DEFAULT_DETERMINISTIC_GAS_ESTIMATOR,
     tx_estimators=DEFAULT_DETERMINISTIC_TX_ESTIMATOR,
     slash_params=SLASH_PARAMS,
-    gas_fee_l1_time_series=GAS_FEE_L1_TIME_SERIES_LIST[-1],
-    gas_fee_blob_time_series=GAS_FEE_BLOB_TIME_SERIES_LIST[-1],
+    gas_fee_l1_time_series=gas_scenario_time_series("single_shock", "l1"),
+    gas_fee_blob_time_series=gas_scenario_time_series("single_shock", "blob"),
     commit_bond_amount=16.0,  # unit: Tokens
     # Assumption: Currently all Sequencers have one op_cost constant to evaluate against
     op_cost_sequencer=0,
@@ -416,5 +332,7 @@ SINGLE_RUN_PARAMS = AztecModelParams(
     safety_factor_rollup_proof=0.0,
     past_gas_weight_fraction=0.9,
     fp_determine_profitability="Op Cost",
+    # Options: "Keep All", "Evict Settled"
+    fp_transaction_retention="Keep All",
     top_up_amount=2,
 )
@@ -6,6 +6,7 @@ import matplotlib.pyplot as plt  # type: ignore
 import seaborn as sns  # type: ignore
 
 import aztec_gddt.metrics as m
+from aztec_gddt.psuu.kpis import KPIs, governance_surface_params, trajectory_id_columns
 
 from sklearn.tree import plot_tree  # type: ignore
 from sklearn.tree import DecisionTreeClassifier  # type: ignore
@@ -15,40 +16,10 @@ from sklearn.ensemble import RandomForestClassifier  # type: ignore
 ## Background information for Aztec ##
 ######################################
 
-governance_surface_params = [
-    'phase_duration_proposal_min_blocks',
-    'phase_duration_proposal_max_blocks',
-    'phase_duration_reveal_min_blocks',
-    'phase_duration_reveal_max_blocks',
-    'phase_duration_commit_bond_min_blocks',
-    'phase_duration_commit_bond_max_blocks',
-    'phase_duration_rollup_min_blocks',
-    'phase_duration_rollup_max_blocks',
-    'phase_duration_race_min_blocks',
-    'phase_duration_race_max_blocks',
-    'daily_block_reward'
-]
-
 phases = ["proposal", "reveal", "commit_bond", "rollup", "race"]
 fixed_info_cols = [f"is_{phase}_fixed" for phase in phases]
 
 
-KPIs = {"proportion_race_mode": m.find_proportion_race_mode,
-        "proportion_slashed_prover": m.find_proportion_slashed_due_to_prover,
-        "proportion_slashed_sequencer": m.find_proportion_slashed_due_to_sequencer,
-        "proportion_skipped": m.find_proportion_skipped,
-        "average_duration_finalized_blocks": m.find_average_duration_finalized_blocks,
-        "stddev_duration_finalized_blocks": m.find_stddev_duration_finalized_blocks,
-        "average_duration_nonfinalized_blocks": m.find_average_duration_nonfinalized_blocks,
-        "stddev_duration_nonfinalized_blocks": m.find_stddev_duration_nonfinalized_blocks,
-        #       "stddev_payoffs_to_sequencers": m.find_stddev_payoffs_to_sequencers,
-        #       "stddev_payoffs_to_provers": m.find_stddev_payoffs_to_provers,
-        "delta_total_revenue_agents": m.find_delta_total_revenue_agents
-        }
-
-
-trajectory_id_columns = ['simulation', 'subset', 'run']
-
 # default_agg_columns = ['simulation', 'subset', 'run'] + governance_surface_params
 
 
@@ -0,0 +1,147 @@
+from time import perf_counter
+from typing import Callable, Optional
+import logging
+import numpy as np
+import pandas as pd
+
+from aztec_gddt import DEFAULT_LOGGER
+from aztec_gddt.metrics import G1, G2, calculate_goal_score
+from aztec_gddt.psuu.sweep import SweepSpace, DEFAULT_SWEEP_DESIGN
+
+logger = logging.getLogger(DEFAULT_LOGGER)
+
+# Evaluates the sweep combinations at the given positions, with the given
+# random seeds. Returns one row per trajectory, with its KPIs and
+# the `sweep_index` of its combination.
+SweepEvaluator = Callable[[np.ndarray, np.ndarray], pd.DataFrame]
+
+
+def goal_scores(kpi_df: pd.DataFrame) -> pd.Series:
+    """
+    Sum of the G1 and G2 goal scores of every trajectory, against the
+    medians of all the given trajectories.
+    """
+    scores = calculate_goal_score(kpi_df, G1, "G1_score")
+    scores = calculate_goal_score(scores, G2, "G2_score")
+    return scores["G1_score"] + scores["G2_score"]
+
+
+def score_sweeps(kpi_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mean and Monte Carlo variance of the goal scores of every sweep
+    combination, indexed by `sweep_index`.
+    """
+    scores = goal_scores(kpi_df).groupby(kpi_df["sweep_index"].to_numpy())
+    return pd.DataFrame({"mean": scores.mean(), "var": scores.var(ddof=0)})
+
+
+def refinement_priority(space: SweepSpace,
+                        candidates: np.ndarray,
+                        sweep_scores: pd.DataFrame,
+                        n_neighbours: int = 4) -> np.ndarray:
+    """
+    Priority of evaluating each of the `candidates`. It is the spread of the
+    mean goal scores of its nearest evaluated combinations, which is high
+    where scores change between neighbouring param values, plus their mean
+    Monte Carlo variance.
+
+    Distances are taken on the value indices of the swept params,
+    normalized by their number of values. The nearest neighbours are
+    queried on a k-d tree, rather than from the dense distances between
+    all the candidates and the evaluated combinations.
+    """
+    # NOTE: imported when used, as `psuu.sweep` does with `scipy.stats`, so
+    # that importing the experiment (eg. on every worker) stays cheap.
+    from scipy.spatial import cKDTree  # type: ignore
+
+    scale = np.maximum(np.array(space.radices) - 1, 1)
+    evaluated = space.digits(sweep_scores.index.to_numpy()) / scale
+    candidate_points = space.digits(candidates) / scale
+
+    k = min(n_neighbours, len(evaluated))
+    _, nearest = cKDTree(evaluated).query(candidate_points, k=k)
+    nearest = np.asarray(nearest).reshape(len(candidates), k)
+    means = sweep_scores["mean"].to_numpy()[nearest]
+    variances = sweep_scores["var"].to_numpy()[nearest]
+    return means.std(axis=1) + variances.mean(axis=1)
+
+
+def adaptive_sweep(space: SweepSpace,
+                   evaluate: SweepEvaluator,
+                   initial_samples: int,
+                   batch_size: int,
+                   measurements_per_trajectory: int,
+                   runs_per_sweep: int,
+                   max_measurements: Optional[int] = None,
+                   max_seconds: Optional[float] = None,
+                   design: str = DEFAULT_SWEEP_DESIGN,
+                   rng: Optional[np.random.Generator] = None,
+                   n_neighbours: int = 4,
+                   pool_factor: int = 20) -> pd.DataFrame:
+    """
+    Runs an initial space-filling batch of sweep combinations, and then
+    batches concentrated where the goal scores (see `metrics.G1` and
+    `metrics.G2`) change between neighbouring combinations or where their
+    Monte Carlo variance is high.
+
+    Stops when the sweep space is exhausted, or before exceeding either
+    budget, in State Measurements or in seconds. Batches are sized by
+    assuming `runs_per_sweep` trajectories per combination, so an evaluator
+    which runs more of them (see `psuu.sequential`) can exceed the budget
+    on its last batch.
+
+    Returns the Trajectory Tensor of all the evaluated trajectories,
+    with their `sweep_index` and `batch`.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    start_time = perf_counter()
+
+    measurements_per_sweep = runs_per_sweep * measurements_per_trajectory
+
+    def affordable(n_sweeps: int) -> int:
+        if max_measurements is not None:
+            remaining = max_measurements - n_trajectories * measurements_per_trajectory
+            n_sweeps = min(n_sweeps, remaining // measurements_per_sweep)
+        if max_seconds is not None and perf_counter() - start_time >= max_seconds:
+            n_sweeps = 0
+        return max(n_sweeps, 0)
+
+    n_evaluated = 0
+    n_trajectories = 0
+    evaluated: set[int] = set()
+    kpi_dfs: list[pd.DataFrame] = []
+
+    n_initial = affordable(initial_samples)
+    if n_initial > 0:
+        indices = space.sample_indices(n_initial, rng, design=design)
+    else:
+        indices = np.array([], dtype=np.int64)
+    i_batch = 0
+    while len(indices) > 0:
+        kpi_df = evaluate(indices, np.arange(n_evaluated, n_evaluated + len(indices)))
+        kpi_df["batch"] = i_batch
+        kpi_dfs.append(kpi_df)
+        evaluated.update(indices.tolist())
+        n_evaluated += len(indices)
+        n_trajectories += len(kpi_df)
+        i_batch += 1
+        logger.info(f"Adaptive sweep batch {i_batch}: {n_evaluated:,} combinations evaluated")
+
+        n_next = min(affordable(batch_size), len(space) - n_evaluated)
+        if n_next <= 0:
+            break
+        sweep_scores = score_sweeps(pd.concat(kpi_dfs))
+        # Pool of unevaluated candidates, drawn without enumerating the space
+        pool = space.sample_indices(pool_factor * n_next + n_evaluated, rng)
+        candidates = np.array([i for i in pool.tolist() if i not in evaluated], dtype=np.int64)
+        if len(candidates) == 0:
+            break
+        priority = refinement_priority(space, candidates, sweep_scores, n_neighbours)
+        # Random tie-breaking
+        order = np.lexsort((rng.random(len(candidates)), -priority))
+        indices = candidates[order[:n_next]]
+
+    if len(kpi_dfs) == 0:
+        return pd.DataFrame(columns=["sweep_index", "batch"])
+    return pd.concat(kpi_dfs, ignore_index=True)
@@ -0,0 +1,93 @@
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+# Fields of `types.Agent` which are kept on the ledger
+AGENT_LEDGER_FIELDS = ('balance', 'staked_amount', 'is_sequencer', 'is_prover', 'is_relay')
+BOOLEAN_AGENT_FIELDS = ('is_sequencer', 'is_prover', 'is_relay')
+
+TRAJECTORY_COLUMNS = ['simulation', 'subset', 'run']
+AGENT_LEDGER_COLUMNS = TRAJECTORY_COLUMNS + ['timestep', 'agent', 'field', 'value']
+
+# (agent, field, value) change of an agent on a timestep
+AgentDelta = Tuple[str, str, float]
+
+
+class AgentDeltaEncoder:
+    """
+    Encodes the agents of the successive states of a trajectory as the
+    fields which changed since the previous state. The first state is
+    encoded whole, as the snapshot.
+
+    The encoder keeps its own copy of the values, and compares them field
+    by field, so that it does not depend on which `Agent` objects are
+    shared between states.
+    """
+
+    def __init__(self):
+        self.values: dict[Tuple[str, str], float] = {}
+
+    def encode(self, agents: dict) -> List[AgentDelta]:
+        deltas = []
+        for uuid, agent in agents.items():
+            agent_id = str(uuid)
+            for field in AGENT_LEDGER_FIELDS:
+                value = float(getattr(agent, field))
+                if self.values.get((agent_id, field)) != value:
+                    self.values[(agent_id, field)] = value
+                    deltas.append((agent_id, field, value))
+        return deltas
+
+
+@dataclass
+class AgentLedger:
+    """
+    Delta-encoded agents of a set of trajectories: a long table with the
+    `(timestep, agent, field, value)` changes of every trajectory, where
+    the rows of timestep 0 are the snapshot of the initial agents.
+
+    Boolean fields are stored as 0/1 values.
+    """
+    deltas: pd.DataFrame
+
+    @classmethod
+    def from_timestep_tensor(cls, df: pd.DataFrame) -> "AgentLedger":
+        """
+        Ledger of a Timestep Tensor with an `agent_deltas` column.
+        """
+        ids = df[TRAJECTORY_COLUMNS + ['timestep']].to_numpy()
+        rows = [(*id_values, *delta)
+                for id_values, deltas in zip(ids, df['agent_deltas'])
+                for delta in deltas]
+        deltas = pd.DataFrame(rows, columns=AGENT_LEDGER_COLUMNS)
+        deltas = deltas.astype({c: 'int64' for c in TRAJECTORY_COLUMNS + ['timestep']})
+        deltas['value'] = deltas['value'].astype(float)
+        for column in ('agent', 'field'):
+            deltas[column] = deltas[column].astype('category')
+        return cls(deltas)
+
+    @property
+    def snapshot(self) -> pd.DataFrame:
+        return self.agents_at(0)
+
+    def agents_at(self, timestep: int, fields: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        The agents of every trajectory at the end of `timestep`, with a row
+        per agent and a column per field.
+        """
+        deltas = self.deltas[self.deltas['timestep'] <= timestep]
+        if fields is not None:
+            deltas = deltas[deltas['field'].isin(fields)]
+        # The deltas are by timestep, so the last one is the latest value
+        values = (deltas
+                  .groupby(TRAJECTORY_COLUMNS + ['agent', 'field'], observed=True, sort=False)['value']
+                  .last()
+                  .unstack('field'))
+        columns = [f for f in AGENT_LEDGER_FIELDS if f in values.columns]
+        values = values[columns]
+        values.columns.name = None
+        for field in BOOLEAN_AGENT_FIELDS:
+            if field in values.columns:
+                values[field] = values[field].astype(bool)
+        return values.sort_index().reset_index()
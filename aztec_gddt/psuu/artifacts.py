@@ -0,0 +1,306 @@
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from hashlib import sha256
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import os
+import shutil
+import tempfile
+import pandas as pd
+
+from aztec_gddt.psuu.upload import UploadQueue, s3_client_factory, multipart_config
+
+DEFAULT_BUCKET = "aztec-gddt"
+
+# Prefix of the content-addressed artifacts (see `ArtifactStore.put_content`)
+CONTENT_PREFIX = "content"
+
+
+def _completed(result: Any = None) -> Future:
+    future: Future = Future()
+    future.set_result(result)
+    return future
+
+
+class ArtifactStore(ABC):
+    """
+    Key-value store of simulation artifacts (Timestep and Trajectory
+    Tensors, auxiliary data, caches), with `/`-separated keys.
+
+    Writes return futures, as they can be asynchronous (see `S3Store`).
+    `flush` waits for all of them.
+    """
+
+    @abstractmethod
+    def put_bytes(self, key: str, data: bytes) -> Future:
+        pass
+
+    def put_file(self, key: str, filename: str, delete: bool = False) -> Future:
+        """
+        Stores a local file as `key`, and removes it once stored if `delete`.
+        """
+        with open(filename, "rb") as fid:
+            future = self.put_bytes(key, fid.read())
+        if delete:
+            future.result()
+            os.remove(filename)
+        return future
+
+    @abstractmethod
+    def get_bytes(self, key: str) -> bytes:
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        pass
+
+    @abstractmethod
+    def list(self, prefix: str = "") -> List[str]:
+        """
+        Sorted keys starting with `prefix`.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    def fingerprint(self, key: str) -> str:
+        """
+        Identifies the content of `key`, so that it can be used on cache keys.
+        """
+        return sha256(self.get_bytes(key)).hexdigest()
+
+    def local_path(self, key: str) -> Optional[str]:
+        """
+        Path of `key` on the local filesystem, if it is stored there.
+        """
+        return None
+
+    def put_content(self, data: bytes, suffix: str = "") -> str:
+        """
+        Stores `data` under a key derived from its hash, and returns the
+        key. Identical artifacts are only stored once.
+        """
+        key = f"{CONTENT_PREFIX}/{sha256(data).hexdigest()}{suffix}"
+        if not self.exists(key):
+            self.put_bytes(key, data)
+        return key
+
+    def read_parquet(self, key: str, **kwargs) -> pd.DataFrame:
+        path = self.local_path(key)
+        return pd.read_parquet(path if path is not None else BytesIO(self.get_bytes(key)), **kwargs)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "ArtifactStore":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+
+class LocalStore(ArtifactStore):
+    """
+    Artifacts as files under the `root` folder. Writes are atomic.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        # Fingerprints, by (key, modification time, size)
+        self._fingerprints: Dict[tuple, str] = {}
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def _replace(self, key: str, write: Callable[[str], None]) -> Future:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        return _completed(key)
+
+    def put_bytes(self, key: str, data: bytes) -> Future:
+        return self._replace(key, lambda tmp_path: Path(tmp_path).write_bytes(data))
+
+    def put_file(self, key: str, filename: str, delete: bool = False) -> Future:
+        if Path(filename).resolve() == self._path(key).resolve():
+            return _completed(key)
+        if delete:
+            return self._replace(key, lambda tmp_path: shutil.move(filename, tmp_path))
+        return self._replace(key, lambda tmp_path: shutil.copyfile(filename, tmp_path))
+
+    def get_bytes(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).is_file()
+
+    def list(self, prefix: str = "") -> List[str]:
+        if not self.root.is_dir():
+            return []
+        keys = (str(p.relative_to(self.root)) for p in self.root.rglob("*") if p.is_file())
+        return sorted(k for k in keys if k.startswith(prefix) and not Path(k).name.startswith("."))
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink()
+
+    def fingerprint(self, key: str) -> str:
+        stat = self._path(key).stat()
+        cache_key = (key, stat.st_mtime_ns, stat.st_size)
+        if cache_key not in self._fingerprints:
+            digest = sha256()
+            with open(self._path(key), "rb") as fid:
+                for block in iter(lambda: fid.read(1 << 20), b""):
+                    digest.update(block)
+            self._fingerprints[cache_key] = digest.hexdigest()
+        return self._fingerprints[cache_key]
+
+    def local_path(self, key: str) -> Optional[str]:
+        return str(self._path(key))
+
+
+class MemoryStore(ArtifactStore):
+    """
+    Artifacts kept on the memory of this process, eg. for tests and for
+    benchmarking the other stores.
+    """
+
+    def __init__(self):
+        self.objects: Dict[str, bytes] = {}
+
+    def put_bytes(self, key: str, data: bytes) -> Future:
+        self.objects[key] = bytes(data)
+        return _completed(key)
+
+    def get_bytes(self, key: str) -> bytes:
+        try:
+            return self.objects[key]
+        except KeyError:
+            raise FileNotFoundError(key)
+
+    def exists(self, key: str) -> bool:
+        return key in self.objects
+
+    def list(self, prefix: str = "") -> List[str]:
+        return sorted(k for k in self.objects if k.startswith(prefix))
+
+    def delete(self, key: str) -> None:
+        del self.objects[key]
+
+
+class S3Store(ArtifactStore):
+    """
+    Artifacts as objects of an S3-compatible bucket, under `prefix`.
+    Files and bytes are uploaded on the background (see `UploadQueue`),
+    and reading a key waits for its pending upload.
+    """
+
+    def __init__(self,
+                 bucket: str = DEFAULT_BUCKET,
+                 prefix: str = "",
+                 client_factory: Callable[[], Any] = s3_client_factory,
+                 transfer_config: Optional[Any] = None,
+                 **upload_kwargs):
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+        self.client = client_factory()
+        if transfer_config is None:
+            transfer_config = multipart_config()
+        self.uploads = UploadQueue(bucket, lambda: self.client, transfer_config, **upload_kwargs)
+        # Uploads which may still be pending, by key
+        self._pending: Dict[str, Future] = {}
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _track(self, key: str, future: Future) -> Future:
+        self._pending = {k: f for k, f in self._pending.items() if not f.done()}
+        self._pending[key] = future
+        return future
+
+    def _wait(self, key: str) -> None:
+        future = self._pending.pop(key, None)
+        if future is not None:
+            future.result()
+
+    def put_bytes(self, key: str, data: bytes) -> Future:
+        return self._track(key, self.uploads.submit_bytes(bytes(data), self._key(key)))
+
+    def put_file(self, key: str, filename: str, delete: bool = False) -> Future:
+        return self._track(key, self.uploads.submit(filename, self._key(key), delete=delete))
+
+    def get_bytes(self, key: str) -> bytes:
+        self._wait(key)
+        return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"].read()
+
+    def _head(self, key: str) -> Optional[dict]:
+        from botocore.exceptions import ClientError  # type: ignore
+
+        try:
+            return self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+
+    def exists(self, key: str) -> bool:
+        self._wait(key)
+        return self._head(key) is not None
+
+    def list(self, prefix: str = "") -> List[str]:
+        self.flush()
+        keys = []
+        kwargs = {"Bucket": self.bucket, "Prefix": self._key(prefix)}
+        while True:
+            response = self.client.list_objects_v2(**kwargs)
+            keys += [obj["Key"] for obj in response.get("Contents", [])]
+            if not response.get("IsTruncated"):
+                break
+            kwargs["ContinuationToken"] = response["NextContinuationToken"]
+        start = len(self.prefix) + 1 if self.prefix else 0
+        return sorted(k[start:] for k in keys)
+
+    def delete(self, key: str) -> None:
+        self._wait(key)
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def fingerprint(self, key: str) -> str:
+        self._wait(key)
+        head = self._head(key)
+        if head is None:
+            raise FileNotFoundError(key)
+        return head["ETag"].strip('"')
+
+    def flush(self) -> None:
+        self._pending = {}
+        self.uploads.join()
+
+    def close(self) -> None:
+        self._pending = {}
+        self.uploads.close()
+
+
+def open_store(url: str) -> ArtifactStore:
+    """
+    Store for a `s3://bucket/prefix`, `memory://` or local folder
+    (optionally as `file://`) URL.
+    """
+    if url.startswith("s3://"):
+        bucket, _, prefix = url[len("s3://"):].partition("/")
+        return S3Store(bucket, prefix)
+    if url.startswith("memory://"):
+        return MemoryStore()
+    if url.startswith("file://"):
+        url = url[len("file://"):]
+    return LocalStore(url)
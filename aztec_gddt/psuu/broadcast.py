@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+import os
+import pickle
+import shutil
+import tempfile
+import numpy as np
+
+# Objects resolved on this process, by key. Published objects are
+# immutable, so that every worker only loads them once.
+_RESOLVED: dict[str, Any] = {}
+
+
+@dataclass(frozen=True)
+class BroadcastRef:
+    """
+    Reference to an object published on a `Broadcast` folder.
+    Cheap to pickle, and resolved on the workers with `resolve`.
+    """
+    path: str
+    kind: str  # One of "array", "dict" or "pickle"
+
+
+def resolve(value: Any) -> Any:
+    """
+    Returns the object behind a `BroadcastRef`, or `value` itself if it is
+    not one. Arrays are memory-mapped read-only, so that their pages are
+    shared by all of the workers.
+    """
+    if not isinstance(value, BroadcastRef):
+        return value
+    if value.path not in _RESOLVED:
+        if value.kind == "array":
+            obj = np.load(value.path, mmap_mode="r")
+        elif value.kind == "dict":
+            with np.load(value.path) as arrays:
+                obj = dict(zip(arrays["keys"].tolist(), arrays["values"].tolist()))
+        else:
+            with open(value.path, "rb") as fid:
+                obj = pickle.load(fid)
+        _RESOLVED[value.path] = obj
+    return _RESOLVED[value.path]
+
+
+def resolve_params(sweep_params: dict[str, list]) -> dict[str, list]:
+    """
+    Resolves every `BroadcastRef` of a `{param: [values]}` sweep chunk.
+    """
+    return {k: [resolve(v) for v in values] for k, values in sweep_params.items()}
+
+
+class Broadcast:
+    """
+    Publishes large immutable sweep inputs (eg. gas time series and
+    censorship series) once, as files on a temporary folder, so that
+    sweep chunks only carry `BroadcastRef`s to them. The folder is on
+    `/dev/shm` when available.
+
+    Objects are deduplicated by identity. The folder is removed by
+    `close`, or on exit when used as a context manager.
+    """
+
+    def __init__(self, folder: Optional[str] = None, min_size: int = 1024):
+        if folder is None:
+            shm = "/dev/shm"
+            folder = tempfile.mkdtemp(prefix="aztec-gddt-",
+                                      dir=shm if os.path.isdir(shm) else None)
+        self.folder = Path(folder)
+        self.min_size = min_size
+        self._refs: dict[int, BroadcastRef] = {}
+        # Keeps the published objects alive, so that their ids are not reused
+        self._published: list[Any] = []
+
+    def __enter__(self) -> "Broadcast":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+    def _is_large(self, value: Any) -> bool:
+        if isinstance(value, np.ndarray):
+            return value.dtype != object and value.size >= self.min_size
+        if isinstance(value, dict):
+            return len(value) >= self.min_size
+        return False
+
+    def publish(self, value: Any) -> BroadcastRef:
+        if id(value) in self._refs:
+            return self._refs[id(value)]
+        path = self.folder / f"{len(self._refs)}"
+        if isinstance(value, np.ndarray) and value.dtype != object:
+            ref = BroadcastRef(str(path.with_suffix(".npy")), "array")
+            np.save(ref.path, value)
+        elif isinstance(value, dict) and all(isinstance(k, int) for k in value):
+            ref = BroadcastRef(str(path.with_suffix(".npz")), "dict")
+            np.savez(ref.path, keys=np.fromiter(value.keys(), dtype=np.int64),
+                     values=np.array(list(value.values())))
+        else:
+            ref = BroadcastRef(str(path.with_suffix(".pkl")), "pickle")
+            with open(ref.path, "wb") as fid:
+                pickle.dump(value, fid)
+        self._refs[id(value)] = ref
+        self._published.append(value)
+        return ref
+
+    def publish_params(self, sweep_params: dict[str, list]) -> dict[str, list]:
+        """
+        Returns `sweep_params` with its large values replaced by references.
+        """
+        return {k: [self.publish(v) if self._is_large(v) else v for v in values]
+                for k, values in sweep_params.items()}
@@ -0,0 +1,267 @@
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+
+from aztec_gddt.types import SelectionPhase
+import aztec_gddt.metrics as m
+
+# NOTE: this module only depends on NumPy and Pandas, so that workers and
+# the CLI can compute KPIs without importing the plotting stack (see
+# `aztec_gddt.plot_tools`).
+
+governance_surface_params = [
+    'phase_duration_proposal_min_blocks',
+    'phase_duration_proposal_max_blocks',
+    'phase_duration_reveal_min_blocks',
+    'phase_duration_reveal_max_blocks',
+    'phase_duration_commit_bond_min_blocks',
+    'phase_duration_commit_bond_max_blocks',
+    'phase_duration_rollup_min_blocks',
+    'phase_duration_rollup_max_blocks',
+    'phase_duration_race_min_blocks',
+    'phase_duration_race_max_blocks',
+    'daily_block_reward'
+]
+
+trajectory_id_columns = ['simulation', 'subset', 'run']
+
+KPIs = {"proportion_race_mode": m.find_proportion_race_mode,
+        "proportion_slashed_prover": m.find_proportion_slashed_due_to_prover,
+        "proportion_slashed_sequencer": m.find_proportion_slashed_due_to_sequencer,
+        "proportion_skipped": m.find_proportion_skipped,
+        "average_duration_finalized_blocks": m.find_average_duration_finalized_blocks,
+        "stddev_duration_finalized_blocks": m.find_stddev_duration_finalized_blocks,
+        "average_duration_nonfinalized_blocks": m.find_average_duration_nonfinalized_blocks,
+        "stddev_duration_nonfinalized_blocks": m.find_stddev_duration_nonfinalized_blocks,
+        #       "stddev_payoffs_to_sequencers": m.find_stddev_payoffs_to_sequencers,
+        #       "stddev_payoffs_to_provers": m.find_stddev_payoffs_to_provers,
+        "delta_total_revenue_agents": m.find_delta_total_revenue_agents
+        }
+
+
+def _grouped_mean_std(values: np.ndarray,
+                      codes: np.ndarray,
+                      n_groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    `np.mean` and `np.std` of the values of each group, or NaN for empty
+    groups. Calling NumPy on each group keeps the results bit-identical
+    to the per-trajectory functions on `metrics.py`.
+    """
+    means = np.full(n_groups, np.nan)
+    stds = np.full(n_groups, np.nan)
+    order = np.argsort(codes, kind='stable')
+    groups, starts = np.unique(codes[order], return_index=True)
+    for group, group_values in zip(groups, np.split(values[order], starts[1:])):
+        means[group] = np.mean(group_values)
+        stds[group] = np.std(group_values)
+    return means, stds
+
+
+def _total_balance(agents) -> float:
+    return sum([agent.balance for agent in agents.values()])
+
+
+def compute_trajectory_kpis(df_to_use: pd.DataFrame,
+                            params_to_use: Optional[List[str]] = None,
+                            agg_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Given a processed Timestep Tensor (see `metrics.process_df`), return the
+    Trajectory Tensor with all the `KPIs`.
+
+    Equivalent to `plot_tools.extract_df(df_to_use, trajectory_kpis=KPIs)`,
+    but the processes of every trajectory are aggregated in a single pass
+    instead of once per KPI and per process.
+    """
+    if params_to_use is None:
+        params_to_use = governance_surface_params
+    if agg_columns is None:
+        agg_columns = trajectory_id_columns
+    cols_to_group = agg_columns + params_to_use
+
+    trajectories = df_to_use.groupby(cols_to_group)
+    trajectory_index = trajectories.size().index
+    n_trajectories = len(trajectory_index)
+    codes = trajectories.ngroup().to_numpy()
+
+    # One row per (trajectory, process), on order of appearance.
+    phase = df_to_use['process_phase']
+    per_row = pd.DataFrame({'trajectory': codes,
+                            'process_id': df_to_use['process_id'].to_numpy(),
+                            'time_l1': df_to_use['time_l1'].to_numpy(),
+                            'is_finalized': (phase == SelectionPhase.finalized.value).to_numpy(),
+                            'is_skipped': (phase == SelectionPhase.skipped.value).to_numpy(),
+                            'is_race': (phase == SelectionPhase.proof_race.value).to_numpy()})
+    per_row = per_row[per_row['process_id'].notna()]
+    per_process = per_row.groupby(['trajectory', 'process_id'], sort=False).agg(
+        first_time=('time_l1', 'first'),
+        last_time=('time_l1', 'last'),
+        is_finalized=('is_finalized', 'any'),
+        is_skipped=('is_skipped', 'any'),
+        is_race=('is_race', 'any'))
+    process_codes = per_process.index.get_level_values('trajectory').to_numpy()
+    time_spent = (per_process['last_time'] - per_process['first_time']).to_numpy()
+
+    n_processes = np.bincount(process_codes, minlength=n_trajectories)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        proportion_race_mode = np.bincount(
+            process_codes, weights=per_process['is_race'].to_numpy(),
+            minlength=n_trajectories) / n_processes
+        proportion_skipped = np.bincount(
+            process_codes, weights=per_process['is_skipped'].to_numpy(),
+            minlength=n_trajectories) / n_processes
+
+    finalized = per_process['is_finalized'].to_numpy()
+    skipped = per_process['is_skipped'].to_numpy()
+    avg_finalized, std_finalized = _grouped_mean_std(
+        time_spent[finalized], process_codes[finalized], n_trajectories)
+    avg_nonfinalized, _ = _grouped_mean_std(
+        time_spent[skipped], process_codes[skipped], n_trajectories)
+
+    slashes = trajectories[['slashes_to_provers', 'slashes_to_sequencers']].max()
+
+    if 'agents' in df_to_use.columns:
+        initial_balance = trajectories['agents'].first().map(_total_balance)
+        final_balance = trajectories['agents'].last().map(_total_balance)
+    else:
+        initial_balance = trajectories['agents_balance'].first()
+        final_balance = trajectories['agents_balance'].last()
+
+    kpi_df = pd.DataFrame(
+        {"proportion_race_mode": proportion_race_mode,
+         "proportion_slashed_prover": slashes['slashes_to_provers'].to_numpy() / n_processes,
+         "proportion_slashed_sequencer": slashes['slashes_to_sequencers'].to_numpy() / n_processes,
+         "proportion_skipped": proportion_skipped,
+         "average_duration_finalized_blocks": avg_finalized,
+         "stddev_duration_finalized_blocks": std_finalized,
+         "average_duration_nonfinalized_blocks": avg_nonfinalized,
+         # NOTE: as `metrics.find_stddev_duration_nonfinalized_blocks`,
+         # this uses the finalized block times.
+         "stddev_duration_nonfinalized_blocks": std_finalized,
+         "delta_total_revenue_agents": (final_balance - initial_balance).to_numpy()},
+        index=trajectory_index)
+    return kpi_df
+
+
+class RunningStats:
+    """
+    Welford's online mean and (population) standard deviation.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    def get_mean(self) -> float:
+        return self.mean if self.count > 0 else np.nan
+
+    def get_std(self) -> float:
+        return np.sqrt(self.m2 / self.count) if self.count > 0 else np.nan
+
+
+class KPIAccumulator:
+    """
+    Accumulates the `tensor_transform.KPIs` of a trajectory from its
+    end-of-timestep states, so that they can be computed while simulating.
+    To be used as a `native_sim_run` observer.
+
+    As on `metrics.process_df`, states without a process are not accounted.
+    Block durations are aggregated with Welford's algorithm, so they may
+    differ from `compute_trajectory_kpis` on the last digits. Agent balances
+    are summed when observed, as `metrics.process_df` does per row, so that
+    `delta_total_revenue_agents` is the same as on the Timestep Tensor.
+    """
+
+    def __init__(self, params: Optional[dict] = None):
+        self.n_processes = 0
+        self.n_race_mode = 0
+        self.n_skipped = 0
+        self.finalized_durations = RunningStats()
+        self.nonfinalized_durations = RunningStats()
+        self.slashes_to_provers = -np.inf
+        self.slashes_to_sequencers = -np.inf
+        self.initial_balance: Optional[float] = None
+        self.final_balance: Optional[float] = None
+
+        # Ongoing process
+        self.process_uuid = None
+        self.first_time = 0
+        self.last_time = 0
+        self.is_finalized = False
+        self.is_skipped = False
+        self.is_race = False
+
+    def _close_process(self) -> None:
+        if self.process_uuid is None:
+            return
+        self.n_processes += 1
+        self.n_race_mode += self.is_race
+        self.n_skipped += self.is_skipped
+        time_spent = self.last_time - self.first_time
+        if self.is_finalized:
+            self.finalized_durations.push(time_spent)
+        if self.is_skipped:
+            self.nonfinalized_durations.push(time_spent)
+
+    def observe(self, state: dict) -> None:
+        process = state["current_process"]
+        if process is None:
+            return
+
+        if process.uuid != self.process_uuid:
+            self._close_process()
+            self.process_uuid = process.uuid
+            self.first_time = state["time_l1"]
+            self.is_finalized = False
+            self.is_skipped = False
+            self.is_race = False
+        self.last_time = state["time_l1"]
+        self.is_finalized |= process.phase == SelectionPhase.finalized
+        self.is_skipped |= process.phase == SelectionPhase.skipped
+        self.is_race |= process.phase == SelectionPhase.proof_race
+
+        self.slashes_to_provers = max(self.slashes_to_provers, state["slashes_to_provers"])
+        self.slashes_to_sequencers = max(self.slashes_to_sequencers, state["slashes_to_sequencers"])
+
+        balance = _total_balance(state["agents"])
+        if self.initial_balance is None:
+            self.initial_balance = balance
+        self.final_balance = balance
+
+    def result(self) -> dict:
+        self._close_process()
+        self.process_uuid = None
+        n = self.n_processes if self.n_processes > 0 else np.nan
+        return {"proportion_race_mode": self.n_race_mode / n,
+                "proportion_slashed_prover": self.slashes_to_provers / n,
+                "proportion_slashed_sequencer": self.slashes_to_sequencers / n,
+                "proportion_skipped": self.n_skipped / n,
+                "average_duration_finalized_blocks": self.finalized_durations.get_mean(),
+                "stddev_duration_finalized_blocks": self.finalized_durations.get_std(),
+                "average_duration_nonfinalized_blocks": self.nonfinalized_durations.get_mean(),
+                # NOTE: as `metrics.find_stddev_duration_nonfinalized_blocks`,
+                # this uses the finalized block times.
+                "stddev_duration_nonfinalized_blocks": self.finalized_durations.get_std(),
+                "delta_total_revenue_agents": (np.nan if self.initial_balance is None
+                                               else self.final_balance - self.initial_balance)}
+
+
+def accumulated_kpis_to_trajectory_tensor(sim_df: pd.DataFrame,
+                                          params_to_use: Optional[List[str]] = None,
+                                          agg_columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Given the output of a run with a `KPIAccumulator` observer, return the
+    Trajectory Tensor on the `compute_trajectory_kpis` layout.
+    """
+    if params_to_use is None:
+        params_to_use = governance_surface_params
+    if agg_columns is None:
+        agg_columns = trajectory_id_columns
+    kpi_columns = list(KPIAccumulator().result())
+    return sim_df.set_index(agg_columns + params_to_use)[kpi_columns].sort_index()
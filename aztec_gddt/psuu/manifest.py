@@ -0,0 +1,165 @@
+from pathlib import Path
+from typing import Any, Iterable, Optional
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq  # type: ignore
+
+from aztec_gddt import DEFAULT_LOGGER
+
+logger = logging.getLogger(DEFAULT_LOGGER)
+
+MANIFEST_FILENAME = "manifest.jsonl"
+
+# Output files of the chunks, relative to the output folder
+CHUNK_OUTPUT_PATTERNS = ("trajectories/*.parquet",
+                         "timesteps/simulation=*/*.parquet",
+                         "agents/simulation=*/*.parquet",
+                         "agent_deltas/simulation=*/*.parquet")
+
+
+def output_is_valid(path: Path) -> bool:
+    """
+    Whether an output file exists and can be read back. Only the Parquet
+    footer and the first CSV row are read.
+    """
+    if not path.is_file():
+        return False
+    try:
+        if path.suffix == ".parquet":
+            pq.read_metadata(path)
+        elif path.name.endswith(".csv.zip"):
+            pd.read_csv(path, nrows=1)
+    except Exception:
+        return False
+    return True
+
+
+class RunManifest:
+    """
+    Record of a PSuU run, kept as JSON Lines on its output folder, so that
+    an interrupted run can be resumed.
+
+    The first line holds the run configuration (including the sweep
+    design and random seed) and the sampled sweep indices. A line is
+    appended, and flushed to disk, every time a chunk is done, with its
+    sweep indices and output files. A line truncated by a crash is
+    dropped when loading.
+    """
+
+    def __init__(self,
+                 output_path: str,
+                 config: dict[str, Any],
+                 sweep_indices: np.ndarray,
+                 chunks: Optional[dict[int, dict]] = None):
+        self.output_path = Path(output_path)
+        self.config = config
+        self.sweep_indices = np.asarray(sweep_indices, dtype=np.int64)
+        self.chunks: dict[int, dict] = chunks if chunks is not None else {}
+
+    @property
+    def path(self) -> Path:
+        return self.output_path / MANIFEST_FILENAME
+
+    def _append(self, record: dict) -> None:
+        with open(self.path, "a") as fid:
+            fid.write(json.dumps(record) + "\n")
+            fid.flush()
+            os.fsync(fid.fileno())
+
+    @classmethod
+    def create(cls,
+               output_path: str,
+               config: dict[str, Any],
+               sweep_indices: np.ndarray) -> "RunManifest":
+        manifest = cls(output_path, config, sweep_indices)
+        manifest.output_path.mkdir(parents=True, exist_ok=True)
+        if manifest.path.exists():
+            raise FileExistsError(f"There is already a run manifest on {output_path}")
+        manifest._append({"kind": "run",
+                          "config": config,
+                          "sweep_indices": manifest.sweep_indices.tolist()})
+        return manifest
+
+    @classmethod
+    def load(cls, output_path: str) -> "RunManifest":
+        path = Path(output_path) / MANIFEST_FILENAME
+        if not path.is_file():
+            raise FileNotFoundError(f"There is no run manifest on {output_path}")
+        records = []
+        valid_size = 0
+        with open(path, "rb") as fid:
+            for line in fid:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Ignoring a truncated line of {path}")
+                    break
+                valid_size += len(line)
+        # So that new records are not appended to the truncated line
+        os.truncate(path, valid_size)
+        header = records[0]
+        chunks = {r["chunk"]: r for r in records[1:] if r["kind"] == "chunk"}
+        return cls(output_path, header["config"], header["sweep_indices"], chunks)
+
+    def check_config(self, config: dict[str, Any]) -> None:
+        """
+        Raises if a resumed run is not configured like the recorded one.
+        """
+        differences = {k: (self.config.get(k), v) for k, v in config.items()
+                       if self.config.get(k) != v}
+        if differences:
+            raise ValueError(f"Cannot resume a run with a different configuration "
+                             f"(recorded, given): {differences}")
+
+    def record_chunk(self,
+                     i_chunk: int,
+                     chunk_indices: np.ndarray,
+                     files: Iterable[str]) -> None:
+        record = {"kind": "chunk",
+                  "chunk": int(i_chunk),
+                  "status": "done",
+                  "indices": np.asarray(chunk_indices).tolist(),
+                  "files": [str(Path(f).resolve().relative_to(self.output_path.resolve()))
+                            for f in files]}
+        self._append(record)
+        self.chunks[record["chunk"]] = record
+
+    def validate(self) -> None:
+        """
+        Forgets the done chunks with missing or unreadable output files,
+        so that they are run again.
+        """
+        for i_chunk, record in list(self.chunks.items()):
+            invalid = [f for f in record["files"]
+                       if not output_is_valid(self.output_path / f)]
+            if invalid:
+                logger.warning(f"Chunk {i_chunk} will be run again, "
+                               f"as some of its outputs are invalid: {invalid}")
+                del self.chunks[i_chunk]
+
+    def remove_orphans(self) -> None:
+        """
+        Removes the chunk output files which are not of a done chunk (eg.
+        of the chunks running when the run was interrupted).
+        """
+        kept = {f for record in self.chunks.values() for f in record["files"]}
+        for pattern in CHUNK_OUTPUT_PATTERNS:
+            for path in self.output_path.glob(pattern):
+                if str(path.relative_to(self.output_path)) not in kept:
+                    path.unlink()
+
+    def remaining_positions(self) -> np.ndarray:
+        """
+        Positions on `sweep_indices` of the combinations to be run.
+        """
+        done = [i for record in self.chunks.values() for i in record["indices"]]
+        return np.flatnonzero(~np.isin(self.sweep_indices, done))
+
+    def next_chunk(self) -> int:
+        """
+        Number for the next chunk, so that output files are not reused.
+        """
+        return max(self.chunks, default=-1) + 1
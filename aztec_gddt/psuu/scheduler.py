@@ -0,0 +1,171 @@
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from hashlib import sha256
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, Tuple
+import multiprocessing
+import os
+import cloudpickle  # type: ignore
+import numpy as np
+
+from aztec_gddt.psuu.sweep import SweepSpace
+
+# Runs a `{param: [values]}` sweep chunk, given its order of dispatch
+ChunkRunner = Callable[[int, dict], Any]
+
+# Chunk runners unpickled on this (worker) process, by digest
+_RUNNERS: dict[bytes, ChunkRunner] = {}
+
+
+class CostModel:
+    """
+    Additive model of the cost (in seconds) of simulating each sweep
+    combination, with an effect per value of every swept param. It is
+    fitted from the measured duration of the chunks, which is split evenly
+    among their combinations.
+    """
+
+    def __init__(self, space: SweepSpace):
+        self.space = space
+        self.sums = [np.zeros(radix) for radix in space.radices]
+        self.counts = [np.zeros(radix) for radix in space.radices]
+        self.total = 0.0
+        self.count = 0
+
+    def update(self, indices: np.ndarray, seconds: float) -> None:
+        per_combination = seconds / len(indices)
+        digits = self.space.digits(indices)
+        for i in range(len(self.space.radices)):
+            np.add.at(self.sums[i], digits[:, i], per_combination)
+            np.add.at(self.counts[i], digits[:, i], 1)
+        self.total += seconds
+        self.count += len(indices)
+
+    def predict(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Expected cost of each combination, or 1 for all of them when
+        nothing was measured yet. Values which were not measured yet are
+        assumed to be as costly as the costliest measured value, so that
+        they are scheduled early.
+        """
+        if self.count == 0:
+            return np.ones(len(indices))
+        mean = self.total / self.count
+        digits = self.space.digits(indices)
+        cost = np.full(len(indices), mean)
+        for i, radix in enumerate(self.space.radices):
+            if radix == 1:
+                continue
+            measured = self.counts[i] > 0
+            effects = np.zeros(radix)
+            effects[measured] = self.sums[i][measured] / self.counts[i][measured] - mean
+            effects[~measured] = effects[measured].max()
+            cost += effects[digits[:, i]]
+        # Costs are positive, even if the additive effects overshoot
+        return np.maximum(cost, 0.1 * mean)
+
+
+def _timed_run(run_chunk: ChunkRunner, i_chunk: int, sweep_params: dict) -> Tuple[Any, float]:
+    start = perf_counter()
+    result = run_chunk(i_chunk, sweep_params)
+    return result, perf_counter() - start
+
+
+def _timed_pickled_run(pickled_runner: bytes, i_chunk: int, pickled_params: bytes) -> Tuple[Any, float]:
+    """
+    `_timed_run` on a worker, with the chunk runner and the sweep params
+    pickled by `cloudpickle`, so that they can hold closures and lambdas
+    (eg. the runners of `experiment` and the estimators of the params).
+    """
+    key = sha256(pickled_runner).digest()
+    if key not in _RUNNERS:
+        _RUNNERS[key] = cloudpickle.loads(pickled_runner)
+    return _timed_run(_RUNNERS[key], i_chunk, cloudpickle.loads(pickled_params))
+
+
+def _pool_context():
+    # Workers are forked from a clean server process, rather than from
+    # this one, which may hold threads (eg. the uploads)
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def schedule_chunks(space: SweepSpace,
+                    run_chunk: ChunkRunner,
+                    indices: np.ndarray,
+                    seeds: Optional[np.ndarray] = None,
+                    n_jobs: int = -1,
+                    max_chunk_size: int = 25,
+                    chunks_per_worker: int = 2,
+                    rng: Optional[np.random.Generator] = None) -> Iterator[Tuple[int, np.ndarray, Any]]:
+    """
+    Runs the sweep combinations at `indices` on a pool of `n_jobs` workers,
+    and yields `(i_chunk, chunk indices, result)` as the chunks complete.
+
+    Chunks are built at dispatch time, with the most expensive remaining
+    combinations first (see `CostModel`), and sized so that their cost is
+    about `1 / (chunks_per_worker * n_workers)` of the remaining cost
+    (guided self-scheduling). Workers pull the next chunk from the queue
+    as soon as they are idle, so that the last chunks are small and no
+    worker is left as a straggler. Each worker has at most one chunk
+    waiting for it.
+
+    With `n_jobs=1`, the chunks are run on the calling process. Otherwise,
+    `run_chunk` is pickled with `cloudpickle` and run on a process pool.
+
+    The shuffling of the first chunks is drawn from `rng` (see
+    `experiment.psuu_exploratory_run`, which derives it from the run seed).
+    It only changes which combinations share a chunk, not their results.
+    """
+    if seeds is None:
+        seeds = np.arange(len(indices))
+    if rng is None:
+        rng = np.random.default_rng()
+    n_workers = (os.cpu_count() or 1) if n_jobs < 0 else n_jobs
+    cost_model = CostModel(space)
+    # Until measurements come in, chunks are drawn in a shuffled order, so
+    # that the first ones cover many param values.
+    remaining = rng.permutation(len(indices))
+    predicted = cost_model.predict(indices)
+
+    def next_chunk() -> np.ndarray:
+        nonlocal remaining
+        order = np.argsort(-predicted[remaining], kind="stable")
+        remaining = remaining[order]
+        costs = predicted[remaining]
+        target = costs.sum() / (chunks_per_worker * n_workers)
+        size = int(np.searchsorted(np.cumsum(costs), target)) + 1
+        size = min(max(size, 1), max_chunk_size)
+        chunk, remaining = remaining[:size], remaining[size:]
+        return chunk
+
+    def chunk_params(chunk: np.ndarray) -> dict:
+        return next(space.iter_chunks(len(chunk), indices[chunk], seeds[chunk]))
+
+    i_chunk = 0
+    if n_workers == 1:
+        while len(remaining) > 0:
+            chunk = next_chunk()
+            result, seconds = _timed_run(run_chunk, i_chunk, chunk_params(chunk))
+            cost_model.update(indices[chunk], seconds)
+            predicted = cost_model.predict(indices)
+            yield i_chunk, indices[chunk], result
+            i_chunk += 1
+        return
+
+    pickled_runner = cloudpickle.dumps(run_chunk)
+    in_flight: dict = {}
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=_pool_context()) as executor:
+        while len(remaining) > 0 or in_flight:
+            while len(remaining) > 0 and len(in_flight) < 2 * n_workers:
+                chunk = next_chunk()
+                future = executor.submit(_timed_pickled_run, pickled_runner, i_chunk,
+                                         cloudpickle.dumps(chunk_params(chunk)))
+                in_flight[future] = (i_chunk, chunk)
+                i_chunk += 1
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                done_chunk, chunk = in_flight.pop(future)
+                result, seconds = future.result()
+                cost_model.update(indices[chunk], seconds)
+                yield done_chunk, indices[chunk], result
+            predicted = cost_model.predict(indices)
@@ -0,0 +1,98 @@
+from typing import Callable, List, Optional
+import numpy as np
+import pandas as pd
+
+from aztec_gddt.psuu.kpis import KPIs
+
+# The seeds of the additional rounds of runs of a combination are offset
+# by multiples of this, so that they do not collide with other combinations.
+SEED_STRIDE = 2 ** 32
+
+# Evaluates `n_runs` Monte Carlo runs of the sweep combinations at the given
+# positions, with the given random seeds. Returns one row per trajectory,
+# with its KPIs, `run` and the `sweep_index` of its combination.
+RunsEvaluator = Callable[[np.ndarray, np.ndarray, int], pd.DataFrame]
+
+
+def kpi_confidence_halfwidths(kpi_df: pd.DataFrame,
+                              kpis: Optional[List[str]] = None,
+                              confidence: float = 0.95) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Student-t confidence interval half-widths of the mean of every KPI,
+    and the means themselves, per `sweep_index`.
+
+    NaN KPIs (eg. durations when no block was finalized) are ignored, and
+    the half-width is `inf` when less than two runs have a value.
+    """
+    from scipy.stats import t  # type: ignore
+
+    if kpis is None:
+        kpis = list(KPIs.keys())
+    grouped = kpi_df.groupby("sweep_index")[kpis]
+    means = grouped.mean()
+    counts = grouped.count()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        halfwidths = (t.ppf((1 + confidence) / 2, counts - 1)
+                      * grouped.std(ddof=1) / np.sqrt(counts))
+    halfwidths = halfwidths.where(counts >= 2, np.inf).where(counts > 0, 0.0)
+    return halfwidths, means
+
+
+def converged_sweeps(kpi_df: pd.DataFrame,
+                     rtol: float,
+                     atol: float,
+                     kpis: Optional[List[str]] = None,
+                     confidence: float = 0.95) -> pd.Series:
+    """
+    Whether the confidence intervals of every KPI of each `sweep_index`
+    are narrower than `max(atol, rtol * |mean|)`.
+    """
+    halfwidths, means = kpi_confidence_halfwidths(kpi_df, kpis, confidence)
+    tolerance = np.maximum(atol, rtol * means.abs().fillna(0.0))
+    return (halfwidths <= tolerance).all(axis=1)
+
+
+def sequential_monte_carlo(evaluate: RunsEvaluator,
+                           indices: np.ndarray,
+                           seeds: np.ndarray,
+                           min_runs: int,
+                           max_runs: int,
+                           batch_runs: Optional[int] = None,
+                           rtol: float = 0.05,
+                           atol: float = 1e-3,
+                           kpis: Optional[List[str]] = None,
+                           confidence: float = 0.95) -> pd.DataFrame:
+    """
+    Runs `min_runs` Monte Carlo runs of every sweep combination, and then
+    rounds of `batch_runs` (`min_runs` by default) more runs of the
+    combinations whose KPIs have not converged (see `converged_sweeps`),
+    up to `max_runs`.
+
+    Returns the Trajectory Tensor with every run, numbered from 1 onwards
+    on each combination.
+    """
+    if batch_runs is None:
+        batch_runs = min_runs
+    seeds = np.asarray(seeds)
+
+    kpi_dfs = [evaluate(indices, seeds, min_runs)]
+    runs_done = min_runs
+    i_round = 1
+    pending = np.ones(len(indices), dtype=bool)
+    while runs_done < max_runs:
+        kpi_df = pd.concat(kpi_dfs, ignore_index=True)
+        converged = converged_sweeps(kpi_df, rtol, atol, kpis, confidence)
+        # NOTE: converged combinations are not run again, so the pending
+        # ones always have `runs_done` runs.
+        pending &= ~converged.reindex(indices, fill_value=False).to_numpy()
+        if not pending.any():
+            break
+
+        n_runs = min(batch_runs, max_runs - runs_done)
+        round_df = evaluate(indices[pending], seeds[pending] + i_round * SEED_STRIDE, n_runs)
+        round_df["run"] += runs_done
+        kpi_dfs.append(round_df)
+        runs_done += n_runs
+        i_round += 1
+
+    return pd.concat(kpi_dfs, ignore_index=True)
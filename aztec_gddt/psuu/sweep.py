@@ -0,0 +1,148 @@
+from math import prod
+from typing import Iterator, List, Optional, Tuple
+import warnings
+import numpy as np
+
+# Designs for sampling the sweep space. All of them draw whole combinations.
+SWEEP_DESIGNS = ("uniform", "lhs", "sobol", "halton")
+# Design of the CLI, the experiment and the adaptive sweep
+DEFAULT_SWEEP_DESIGN = "uniform"
+
+# HACK: if the min duration is `inf`, it is set to the max duration
+INF_TO_MAX_DURATION_COLS: List[Tuple[str, str]] = [
+    ("phase_duration_proposal_min_blocks", "phase_duration_proposal_max_blocks"),
+    ("phase_duration_reveal_min_blocks", "phase_duration_reveal_max_blocks"),
+    ("phase_duration_commit_bond_min_blocks", "phase_duration_commit_bond_max_blocks"),
+    ("phase_duration_rollup_min_blocks", "phase_duration_rollup_max_blocks"),
+    ("phase_duration_race_min_blocks", "phase_duration_race_max_blocks"),
+]
+
+
+def resolve_inf_durations(sweep_params: dict[str, list]) -> dict[str, list]:
+    """
+    Sets the `inf` min durations of a `{param: [values]}` sweep chunk to the
+    respective max durations, and casts the min durations to `int`.
+    """
+    for min_col, max_col in INF_TO_MAX_DURATION_COLS:
+        if min_col not in sweep_params or max_col not in sweep_params:
+            continue
+        min_values = np.asarray(sweep_params[min_col], dtype=float)
+        max_values = np.asarray(sweep_params[max_col], dtype=float)
+        resolved = np.where(np.isinf(min_values), max_values, min_values)
+        sweep_params[min_col] = resolved.astype(int).tolist()
+    return sweep_params
+
+
+class SweepSpace:
+    """
+    The cartesian product of a `{param: [values]}` sweep dictionary, which
+    is never materialized. Parameter combinations are addressed by their
+    position on the `cadCAD.tools.preparation.sweep_cartesian_product`
+    order, and are decoded on demand as mixed-radix numbers.
+    """
+
+    def __init__(self, sweep_params: dict[str, list]):
+        self.keys = list(sweep_params.keys())
+        self.values = [list(v) for v in sweep_params.values()]
+        self.radices = [len(v) for v in self.values]
+
+    def __len__(self) -> int:
+        return prod(self.radices)
+
+    def decode(self, indices: np.ndarray) -> dict[str, list]:
+        """
+        Returns the `{param: [values]}` sweep dictionary with the
+        combinations at `indices`. The first param varies the slowest.
+        """
+        digits = self.digits(indices)
+        return {key: [values[d] for d in digits[:, i]]
+                for i, (key, values) in enumerate(zip(self.keys, self.values))}
+
+    def digits(self, indices: np.ndarray) -> np.ndarray:
+        """
+        Returns the per-param value indices of the combinations at `indices`,
+        as a `(n_combinations, n_params)` array.
+        """
+        remainder = np.asarray(indices, dtype=np.int64)
+        digits = np.empty((len(remainder), len(self.radices)), dtype=np.int64)
+        for i in reversed(range(len(self.radices))):
+            remainder, digits[:, i] = np.divmod(remainder, self.radices[i])
+        return digits
+
+    def encode(self, digits: np.ndarray) -> np.ndarray:
+        """
+        Inverse of `digits`.
+        """
+        indices = np.zeros(len(digits), dtype=np.int64)
+        for i, radix in enumerate(self.radices):
+            indices = indices * radix + digits[:, i]
+        return indices
+
+    def sample_indices(self,
+                       n_samples: int,
+                       rng: Optional[np.random.Generator] = None,
+                       design: str = DEFAULT_SWEEP_DESIGN) -> np.ndarray:
+        """
+        Draws `n_samples` distinct combinations without enumerating the space.
+        If `n_samples` is not positive, all of the combinations are returned.
+
+        With the "lhs", "sobol" and "halton" designs, the unit hypercube
+        points of `scipy.stats.qmc` are mapped onto the values of the swept
+        params (the ones with more than one value). Duplicated combinations
+        are dropped, so that coarse grids can yield less than `n_samples`.
+        """
+        if design not in SWEEP_DESIGNS:
+            raise ValueError(f"Unknown sweep design {design}")
+        if n_samples <= 0 or n_samples >= len(self):
+            return np.arange(len(self))
+        if rng is None:
+            rng = np.random.default_rng()
+        if design == "uniform":
+            return rng.choice(len(self), size=n_samples, replace=False)
+
+        from scipy.stats import qmc  # type: ignore
+
+        swept = [i for i, radix in enumerate(self.radices) if radix > 1]
+        if design == "lhs":
+            sampler = qmc.LatinHypercube(d=len(swept), seed=rng)
+        elif design == "sobol":
+            sampler = qmc.Sobol(d=len(swept), seed=rng)
+        else:
+            sampler = qmc.Halton(d=len(swept), seed=rng)
+        with warnings.catch_warnings():
+            # Sobol balance is only kept for powers of 2 samples
+            warnings.simplefilter("ignore", UserWarning)
+            points = sampler.random(n_samples)
+
+        digits = np.zeros((n_samples, len(self.radices)), dtype=np.int64)
+        swept_radices = np.array([self.radices[i] for i in swept])
+        digits[:, swept] = np.minimum((points * swept_radices).astype(np.int64),
+                                      swept_radices - 1)
+        indices = self.encode(digits)
+        _, first = np.unique(indices, return_index=True)
+        return indices[np.sort(first)]
+
+    def iter_chunks(self,
+                    chunk_size: int,
+                    indices: Optional[np.ndarray] = None,
+                    seeds: Optional[np.ndarray] = None) -> Iterator[dict[str, list]]:
+        """
+        Yields the combinations at `indices` (all of them by default) as
+        `{param: [values]}` sweep chunks of at most `chunk_size` combinations,
+        with the `inf` min durations resolved.
+
+        Every combination gets its `random_seed` from `seeds`, which defaults
+        to its position on `indices`, so that trajectories are reproducible
+        no matter how the sweep is chunked. Its index on the sweep is given
+        as the `sweep_index` param.
+        """
+        if indices is None:
+            indices = np.arange(len(self))
+        if seeds is None:
+            seeds = np.arange(len(indices))
+        for start in range(0, len(indices), chunk_size):
+            chunk_indices = indices[start:start + chunk_size]
+            chunk = resolve_inf_durations(self.decode(chunk_indices))
+            chunk["random_seed"] = seeds[start:start + chunk_size].tolist()
+            chunk["sweep_index"] = chunk_indices.tolist()
+            yield chunk
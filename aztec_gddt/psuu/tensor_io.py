@@ -0,0 +1,286 @@
+from dataclasses import is_dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import List, Optional, Tuple
+import os
+import pickle
+import numpy as np
+import pandas as pd
+import pyarrow as pa  # type: ignore
+import pyarrow.dataset as ds  # type: ignore
+import pyarrow.parquet as pq  # type: ignore
+
+from aztec_gddt.metrics import agents_balance
+from aztec_gddt.psuu.agent_ledger import AgentLedger
+
+TRAJECTORY_ID_COLUMNS = ['simulation', 'subset', 'run', 'timestep']
+
+# Process fields which are written as typed columns
+PROCESS_FIELDS = {
+    'uuid': 'string',
+    'phase': 'Int8',
+    'current_phase_init_time': 'Int64',
+    'duration_in_current_phase': 'Int64',
+    'leading_sequencer': 'string',
+    'entered_race_mode': 'boolean',
+    'block_content_is_revealed': 'boolean',
+}
+
+TOKEN_SUPPLY_FIELDS = ['circulating', 'staked', 'burnt', 'issued']
+
+# Columns holding the L1 transactions, which are not kept on the tensor
+DROPPED_COLUMNS = ['transactions']
+
+# Folder of the agent ledger, for Timestep Tensors with `agent_deltas`
+AGENT_DELTAS_FOLDER = 'agent_deltas'
+
+# Folder of the Trajectory Tensor dataset, and file indexing its parts
+TRAJECTORY_TENSOR_FOLDER = 'trajectories'
+TRAJECTORY_METADATA_FILENAME = '_metadata'
+
+
+def _flatten_process(processes: pd.Series) -> pd.DataFrame:
+    columns = {}
+    for field, dtype in PROCESS_FIELDS.items():
+        values = [None if p is None else getattr(p, field) for p in processes]
+        if field in ('uuid', 'leading_sequencer'):
+            values = [None if v is None else str(v) for v in values]
+        elif field == 'phase':
+            values = [None if v is None else int(v) for v in values]
+        name = 'process_id' if field == 'uuid' else f'process_{field}'
+        columns[name] = pd.array(values, dtype=dtype)
+    return pd.DataFrame(columns, index=processes.index)
+
+
+def _flatten_token_supply(supplies: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({f'token_supply_{field}': [getattr(s, field) for s in supplies]
+                         for field in TOKEN_SUPPLY_FIELDS},
+                        index=supplies.index)
+
+
+def _flatten_agents(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Long table with the balance and the stake of every agent on every
+    timestep.
+
+    NOTE: even with `deepcopy_off`, the rows of a trajectory do not alias
+    the same `Agent` objects, as agents are copied when they are updated
+    (see `phases.updated_agent`).
+    """
+    ids = df[TRAJECTORY_ID_COLUMNS].to_numpy()
+    rows = []
+    for id_values, agents in zip(ids, df['agents']):
+        for agent in agents.values():
+            rows.append((*id_values, str(agent.uuid), agent.balance, agent.staked_amount))
+    agents_df = pd.DataFrame(rows, columns=TRAJECTORY_ID_COLUMNS + ['agent', 'balance', 'staked_amount'])
+    agents_df['agent'] = agents_df['agent'].astype('category')
+    return agents_df
+
+
+def _content_label(name: str, value) -> str:
+    """
+    Label of a non-scalar parameter value, from a hash of its content, so
+    that it is the same on every chunk and process.
+    """
+    if isinstance(value, np.ndarray):
+        data = (value.dtype.str + str(value.shape)).encode() + np.ascontiguousarray(value).tobytes()
+    else:
+        try:
+            data = pickle.dumps(value, protocol=4)
+        except Exception:
+            data = repr(value).encode()
+    return f'{name}-{sha256(data).hexdigest()[:16]}'
+
+
+def _encode_param(values: pd.Series) -> pd.Series:
+    """
+    Dictionary-encodes a parameter column. Non-scalar values (eg. time
+    series or censorship dicts) are labelled by a hash of their content
+    (see `_content_label`), and dataclasses (eg. estimators) by their repr.
+    """
+    # Labels by identity, so that shared values are only hashed once
+    labels: dict[int, str] = {}
+
+    def label(value):
+        if value is None or isinstance(value, (str, bool, int, float, np.generic)):
+            return value
+        if id(value) not in labels:
+            if is_dataclass(value):
+                labels[id(value)] = repr(value)
+            else:
+                labels[id(value)] = _content_label(str(values.name), value)
+        return labels[id(value)]
+
+    if values.dtype != object:
+        return values
+    encoded = values.map(label)
+    if encoded.map(type).nunique() > 1:
+        encoded = encoded.astype(str)
+    return encoded.astype('category')
+
+
+def flatten_timestep_tensor(sim_df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[pd.DataFrame]]:
+    """
+    Given a Timestep Tensor with object columns, return a numeric Timestep
+    Tensor and, if there are `agents`, a long table of agent balances and
+    stakes. If there are `agent_deltas` instead, the long table is their
+    `AgentLedger`.
+    """
+    df = sim_df.drop(columns=[c for c in DROPPED_COLUMNS + ['index'] if c in sim_df.columns])
+    agents_df = None
+
+    if 'current_process' in df.columns:
+        df = df.join(_flatten_process(df.pop('current_process')))
+    if 'token_supply' in df.columns:
+        df = df.join(_flatten_token_supply(df.pop('token_supply')))
+    if 'agents' in df.columns:
+        agents_df = _flatten_agents(df)
+        agents = df.pop('agents')
+        df['agents_balance'] = [sum(a.balance for a in agents.values())
+                                for agents in agents]
+    elif 'agent_deltas' in df.columns:
+        agents_df = AgentLedger.from_timestep_tensor(df).deltas
+        df['agents_balance'] = agents_balance(df)
+        df = df.drop(columns=['agent_deltas'])
+
+    for col in df.columns:
+        if col not in TRAJECTORY_ID_COLUMNS:
+            df[col] = _encode_param(df[col])
+    return df, agents_df
+
+
+def write_timestep_tensor(sim_df: pd.DataFrame,
+                          output_path: str,
+                          basename: str = 'part') -> List[str]:
+    """
+    Writes a Timestep Tensor as Parquet datasets on the `timesteps/` and
+    `agents/` (or `agent_deltas/`) folders of `output_path`, partitioned by
+    `simulation`.
+    Files keep the partition column, so that they can be read on their own.
+
+    Returns the paths of the written files.
+    """
+    written: List[str] = []
+    timesteps_df, agents_df = flatten_timestep_tensor(sim_df)
+    agents_folder = AGENT_DELTAS_FOLDER if 'agent_deltas' in sim_df.columns else 'agents'
+    for folder, table_df in (('timesteps', timesteps_df), (agents_folder, agents_df)):
+        if table_df is None:
+            continue
+        for simulation, partition_df in table_df.groupby('simulation', sort=False):
+            partition_path = Path(output_path) / folder / f'simulation={simulation}'
+            partition_path.mkdir(parents=True, exist_ok=True)
+            filename = str(partition_path / f'{basename}.parquet')
+            table = pa.Table.from_pandas(partition_df, preserve_index=False)
+            pq.write_table(table, filename)
+            written.append(filename)
+    return written
+
+
+def read_timestep_tensor(path: str,
+                         columns: Optional[List[str]] = None,
+                         filters=None) -> pd.DataFrame:
+    """
+    Reads back (a column subset of) a Timestep Tensor Parquet file or dataset.
+    """
+    # NOTE: the partition columns are also stored on the files.
+    return pd.read_parquet(path, columns=columns, filters=filters, partitioning=None)
+
+
+def read_agent_ledger(path: str, filters=None) -> AgentLedger:
+    """
+    Reads back (the filtered rows of) an agent ledger Parquet file or
+    dataset, eg. the `agent_deltas/` folder of an output.
+    """
+    return AgentLedger(read_timestep_tensor(path, filters=filters))
+
+
+def trajectory_tensor_parts(output_path: str) -> List[Path]:
+    """
+    Parts of the Trajectory Tensor dataset of `output_path`, committed or not.
+    """
+    return sorted((Path(output_path) / TRAJECTORY_TENSOR_FOLDER).glob('*.parquet'))
+
+
+def _write_table_atomically(table: pa.Table, path: Path) -> None:
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_trajectory_tensor(agg_df: pd.DataFrame,
+                            output_path: str,
+                            basename: str = 'part') -> str:
+    """
+    Appends a Trajectory Tensor (eg. of a chunk) as a part of the Parquet
+    dataset on the `trajectories/` folder of `output_path`. The index is
+    written as columns. Parts are written atomically, so that they are
+    either complete or missing.
+
+    Returns the path of the written part.
+    """
+    path = Path(output_path) / TRAJECTORY_TENSOR_FOLDER / f'{basename}.parquet'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df = agg_df.reset_index() if any(agg_df.index.names) else agg_df
+    _write_table_atomically(pa.Table.from_pandas(df, preserve_index=False), path)
+    return str(path)
+
+
+def commit_trajectory_tensor(output_path: str) -> List[str]:
+    """
+    Indexes the parts of the Trajectory Tensor dataset of `output_path`
+    on its `_metadata` file, which readers use instead of listing and
+    opening every part (see `read_trajectory_tensor`).
+
+    Only the footers of the parts are read. Parts whose column types
+    differ (eg. a parameter which is integer on some chunks only) are
+    rewritten with the promoted types.
+
+    Returns the paths of the written files, with the `_metadata` file
+    last, or nothing if there are no parts.
+    """
+    written: List[str] = []
+    parts = trajectory_tensor_parts(output_path)
+    if not parts:
+        return written
+    schemas = [pq.read_schema(part).remove_metadata() for part in parts]
+    schema = pa.unify_schemas(schemas, promote_options='permissive')
+    row_groups = []
+    for part, part_schema in zip(parts, schemas):
+        if not part_schema.equals(schema):
+            table = pq.read_table(part).select(schema.names).cast(schema)
+            _write_table_atomically(table, part)
+            written.append(str(part))
+        metadata = pq.read_metadata(part)
+        metadata.set_file_path(part.name)
+        row_groups.append(metadata)
+
+    path = parts[0].parent / TRAJECTORY_METADATA_FILENAME
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    pq.write_metadata(schema, tmp_path, metadata_collector=row_groups)
+    os.replace(tmp_path, path)
+    written.append(str(path))
+    return written
+
+
+def read_trajectory_tensor(output_path: str,
+                           columns: Optional[List[str]] = None,
+                           filters=None) -> pd.DataFrame:
+    """
+    Reads back (a column subset of) the Trajectory Tensor dataset of
+    `output_path`. `filters` are as for `pd.read_parquet`, and are pushed
+    down to the parts and their row groups.
+
+    Once committed (see `commit_trajectory_tensor`), only the committed
+    parts are read. Before that, all of the parts written so far are.
+    """
+    folder = Path(output_path) / TRAJECTORY_TENSOR_FOLDER
+    metadata_path = folder / TRAJECTORY_METADATA_FILENAME
+    if metadata_path.is_file():
+        dataset = ds.parquet_dataset(str(metadata_path))
+    else:
+        parts = trajectory_tensor_parts(output_path)
+        if not parts:
+            raise FileNotFoundError(f"There is no Trajectory Tensor on {output_path}")
+        dataset = ds.dataset([str(p) for p in parts], format='parquet')
+    expression = None if filters is None else pq.filters_to_expression(filters)
+    return dataset.to_table(columns=columns, filter=expression).to_pandas()
@@ -2,16 +2,23 @@ import sys
 sys.path.append(".")
 
 from tqdm.auto import tqdm  # type: ignore
-import aztec_gddt.plot_tools as pt
 import aztec_gddt.metrics as m
+from aztec_gddt.psuu.tensor_io import (read_timestep_tensor, write_trajectory_tensor,
+                                       commit_trajectory_tensor)
+from aztec_gddt.psuu.artifacts import ArtifactStore
+from aztec_gddt.psuu.kpis import (KPIs, compute_trajectory_kpis,
+                                  governance_surface_params, trajectory_id_columns)
 import pandas as pd
 import json
 import os
 import time
-from typing import List, Tuple, Iterable
+from typing import Iterator, List, Tuple, Iterable, Optional
 from pathlib import Path
 from multiprocessing import Pool, cpu_count
+import pyarrow.parquet as pq  # type: ignore
 import logging
+import threading
+import warnings
 from datetime import datetime
 from aztec_gddt import DEFAULT_LOGGER
 logger = logging.getLogger(DEFAULT_LOGGER)
@@ -19,21 +26,14 @@ logger = logging.getLogger(DEFAULT_LOGGER)
 
 TensorPerTrajectory: pd.DataFrame
 
-KPIs = {"proportion_race_mode": m.find_proportion_race_mode,
-        "proportion_slashed_prover": m.find_proportion_slashed_due_to_prover,
-        "proportion_slashed_sequencer": m.find_proportion_slashed_due_to_sequencer,
-        "proportion_skipped": m.find_proportion_skipped,
-        "average_duration_finalized_blocks": m.find_average_duration_finalized_blocks,
-        "stddev_duration_finalized_blocks": m.find_stddev_duration_finalized_blocks,
-        "average_duration_nonfinalized_blocks": m.find_average_duration_nonfinalized_blocks,
-        "stddev_duration_nonfinalized_blocks": m.find_stddev_duration_nonfinalized_blocks,
-        #       "stddev_payoffs_to_sequencers": m.find_stddev_payoffs_to_sequencers,
-        #       "stddev_payoffs_to_provers": m.find_stddev_payoffs_to_provers,
-        "delta_total_revenue_agents": m.find_delta_total_revenue_agents
-        }
+# COLS_TO_DROP = ['simulation', 'subset', 'run']
 
+# Columns read from the Parquet Timestep Tensors for computing the KPIs
+KPI_INPUT_COLUMNS = (trajectory_id_columns
+                     + governance_surface_params
+                     + ['timestep', 'time_l1', 'process_id', 'process_phase',
+                        'slashes_to_provers', 'slashes_to_sequencers', 'agents_balance'])
 
-# COLS_TO_DROP = ['simulation', 'subset', 'run']
 
 def get_timestep_files_from_info(data_directory: Path,
                                  data_prefix: str):
@@ -41,42 +41,177 @@ def get_timestep_files_from_info(data_directory: Path,
     files_to_use = [data_directory / f for f in os.listdir(data_directory)
                     if data_prefix in f
                     and ".pkl" in f]
+    # Parquet Timestep Tensors, as written by `tensor_io.write_timestep_tensor`
+    files_to_use += [f for f in data_directory.glob('timesteps/simulation=*/*.parquet')
+                     if data_prefix in f.name]
     return files_to_use
 
 
 
-def timestep_tensor_to_trajectory_tensor(sim_df: pd.DataFrame) -> pd.DataFrame:
+def timestep_tensor_to_trajectory_tensor(sim_df: pd.DataFrame,
+                                         params_to_use: Optional[List[str]] = None) -> pd.DataFrame:
     df_to_use = m.process_df(sim_df)
-    df_per_trajectory: pd.DataFrame = pt.extract_df(df_to_use,
-                                                    trajectory_kpis=KPIs)
+    # NOTE: same results as `plot_tools.extract_df(df_to_use, trajectory_kpis=KPIs)`
+    df_per_trajectory: pd.DataFrame = compute_trajectory_kpis(df_to_use, params_to_use)
     return df_per_trajectory
 
-def timestep_file_to_trajectory(path: str) -> pd.DataFrame:
+def iter_timestep_trajectories(path: str,
+                               columns: Optional[List[str]] = None,
+                               batch_rows: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """
+    Streams a Parquet Timestep Tensor file as frames of complete
+    trajectories, of about `batch_rows` rows each, so that the file is
+    never fully in memory. The rows of a trajectory are expected to be
+    contiguous, as written by `tensor_io.write_timestep_tensor`.
+    """
+    carry: Optional[pd.DataFrame] = None
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=columns):
+        df = batch.to_pandas()
+        if carry is not None:
+            df = pd.concat([carry, df], ignore_index=True)
+        # The last trajectory may continue on the next batch
+        ids = df[trajectory_id_columns]
+        is_last = (ids == ids.iloc[-1]).all(axis=1).to_numpy()
+        carry = df[is_last]
+        if not is_last.all():
+            yield df[~is_last]
+    if carry is not None and len(carry) > 0:
+        yield carry
+
+
+def _timestep_file_to_trajectory(path: str, batch_rows: int) -> Tuple[pd.DataFrame, int]:
+    if str(path).endswith('.parquet'):
+        dfs = []
+        n_rows = 0
+        for df_per_timestep in iter_timestep_trajectories(path, KPI_INPUT_COLUMNS, batch_rows):
+            n_rows += len(df_per_timestep)
+            dfs.append(timestep_tensor_to_trajectory_tensor(df_per_timestep))
+        return pd.concat(dfs), n_rows
     df_per_timestep = pd.read_pickle(path)
-    return timestep_tensor_to_trajectory_tensor(df_per_timestep)
+    return timestep_tensor_to_trajectory_tensor(df_per_timestep), len(df_per_timestep)
+
+
+def timestep_file_to_trajectory(path: str, batch_rows: int = 1_000_000) -> pd.DataFrame:
+    """
+    Trajectory Tensor of a Timestep Tensor file. Parquet files are streamed
+    (see `iter_timestep_trajectories`), while pickles have to be fully loaded.
+    """
+    return _timestep_file_to_trajectory(path, batch_rows)[0]
+
+
+def timestep_file_to_trajectory_part(args: Tuple[str, str, int]) -> Tuple[str, int, int]:
+    """
+    Writes the Trajectory Tensor of a Timestep Tensor file as a part of the
+    dataset of `output_path`, named after the file. Returns the path of the
+    part, and its numbers of timestep and trajectory rows.
+    """
+    path, output_path, batch_rows = args
+    df_per_trajectory, n_rows = _timestep_file_to_trajectory(path, batch_rows)
+    basename = Path(path).name.split('.')[0]
+    part = write_trajectory_tensor(df_per_trajectory, output_path, basename=basename)
+    return part, n_rows, len(df_per_trajectory)
+
+
+def _gated(items: Iterable, slots: threading.Semaphore, stop: threading.Event) -> Iterator:
+    for item in items:
+        slots.acquire()
+        if stop.is_set():
+            return
+        yield item
+
+
+def process_timestep_files_to_dataset(per_timestep_tensor_paths: list[str],
+                                      output_path: str,
+                                      store: Optional[ArtifactStore] = None,
+                                      processes: Optional[int] = None,
+                                      max_in_flight: Optional[int] = None,
+                                      batch_rows: int = 1_000_000) -> List[str]:
+    """
+    Transforms Timestep Tensor files into the Trajectory Tensor dataset of
+    `output_path` (see `tensor_io.read_trajectory_tensor`). Every file is
+    written as a part of it by the workers, and the parts are then indexed.
+
+    Memory is bounded by the `processes` workers (all CPUs by default),
+    which get a fresh process for every file. At most `max_in_flight` files
+    (`processes` by default) are dispatched and not yet done, and Parquet
+    files are streamed by `batch_rows` rows.
+
+    Returns the paths of the parts, with the `_metadata` index last.
+    """
+    processes = processes or cpu_count()
+    max_in_flight = max(max_in_flight or processes, 1)
+    logger.info(f"Transforming {len(per_timestep_tensor_paths):,} Timestep Tensor files "
+                f"into Trajectory Tensors, {datetime.now()}")
+    start_time = time.perf_counter()
+    slots = threading.Semaphore(max_in_flight)
+    stop = threading.Event()
+    args = ((path, output_path, batch_rows) for path in per_timestep_tensor_paths)
+    parts = []
+    n_rows = 0
+    n_trajectories = 0
+    with Pool(processes, maxtasksperchild=1) as pool:
+        try:
+            results = pool.imap_unordered(timestep_file_to_trajectory_part, _gated(args, slots, stop))
+            with tqdm(total=len(per_timestep_tensor_paths), desc="Timestep Tensor files") as progress:
+                for part, part_rows, part_trajectories in results:
+                    slots.release()
+                    parts.append(part)
+                    n_rows += part_rows
+                    n_trajectories += part_trajectories
+                    seconds = time.perf_counter() - start_time
+                    progress.set_postfix(rows_per_second=f"{n_rows / seconds:,.0f}")
+                    progress.update()
+        finally:
+            # Unblocks the dispatch of the files, if it is waiting for a slot
+            stop.set()
+            slots.release()
+    seconds = time.perf_counter() - start_time
+    logger.info(f"Trajectory Tensor Computed. Rows: {n_trajectories:,}, from {n_rows:,} "
+                f"timestep rows in {seconds:,.1f}s ({n_rows / seconds:,.0f} rows/s)")
+    committed = commit_trajectory_tensor(output_path)
+    filenames = sorted(parts) + committed[-1:]
+    if store is not None and filenames:
+        # Published under the paths relative to `output_path`, with the index last
+        *part_filenames, metadata_filename = filenames
+        for filename in part_filenames:
+            store.put_file(str(Path(filename).relative_to(output_path)), filename)
+        store.flush()
+        store.put_file(str(Path(metadata_filename).relative_to(output_path)), metadata_filename).result()
+    return filenames
 
 
 def process_timestep_files_to_csv(per_timestep_tensor_paths: list[str],
                                   filename: str) -> pd.DataFrame:
+    """
+    Deprecated, in favour of the Parquet dataset of
+    `process_timestep_files_to_dataset`. Computes the whole Trajectory
+    Tensor on memory and saves it as a single CSV file.
+    """
+    warnings.warn("process_timestep_files_to_csv is deprecated, "
+                  "use process_timestep_files_to_dataset instead",
+                  DeprecationWarning, stacklevel=2)
     logger.info(f"Transforming Timestep Tensors into Trajectory Tensors, {datetime.now()}")
-    dfs_to_concat = Pool(cpu_count()).map(timestep_file_to_trajectory, per_timestep_tensor_paths)
-    logger.info(f"Concatenating Trajectory Tensors, {datetime.now()}")
+    with Pool(cpu_count()) as pool:
+        dfs_to_concat = pool.map(timestep_file_to_trajectory, per_timestep_tensor_paths)
     final_df = pd.concat(dfs_to_concat)
     logger.info(f"Trajectory Tensor Computed. Rows: {len(final_df):,}")
-    logger.info(f"Saving the Full Trajectory Tensor, {datetime.now()}")
     final_df.to_csv(filename)
     return final_df
 
 
 def process_folder_files(data_directory: Path,
                         data_prefix: str, 
-                        output_path: str) -> None:
+                        output_path: str,
+                        store: Optional[ArtifactStore] = None,
+                        processes: Optional[int] = None) -> None:
     start_time = time.time()
     logger.info(f"Initing Tensor Transform at {datetime.now()}. Output: {output_path}")
     timestep_files = [str(f) for f in get_timestep_files_from_info(data_directory, data_prefix)]
     num_files = len(timestep_files)
-    trajectory_list = process_timestep_files_to_csv(per_timestep_tensor_paths=timestep_files,
-                                                    filename=output_path)
+    process_timestep_files_to_dataset(per_timestep_tensor_paths=timestep_files,
+                                      output_path=output_path,
+                                      store=store,
+                                      processes=processes)
     end_time = time.time()
     execution_time = end_time - start_time
     logger.info(f"Processed {num_files} files.")
@@ -92,4 +227,5 @@ if __name__ == "__main__":
             
     output_path = config['output_path']
 
-    process_folder_files(data_directory, data_prefix, output_path)
+    process_folder_files(data_directory, data_prefix, output_path,
+                         processes=config.get('processes'))
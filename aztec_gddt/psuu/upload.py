@@ -0,0 +1,208 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from hashlib import md5
+from io import BytesIO
+from pathlib import Path
+from threading import BoundedSemaphore
+from typing import Any, Callable, List, Optional
+import logging
+import os
+import shutil
+import time
+
+from aztec_gddt import DEFAULT_LOGGER
+
+logger = logging.getLogger(DEFAULT_LOGGER)
+
+MB = 1024 ** 2
+
+
+def s3_client_factory() -> Any:
+    """
+    Returns an S3 client. Clients are thread-safe, so one is shared by
+    all of the uploads of a queue.
+    """
+    import boto3  # type: ignore
+    from botocore.config import Config  # type: ignore
+
+    return boto3.session.Session().client(
+        "s3", config=Config(retries={"max_attempts": 5, "mode": "adaptive"}))
+
+
+def multipart_config(threshold: int = 8 * MB,
+                     chunksize: int = 8 * MB,
+                     max_concurrency: int = 4) -> Any:
+    """
+    Transfer config for uploading files larger than `threshold` as
+    multipart uploads of `chunksize` parts.
+    """
+    from boto3.s3.transfer import TransferConfig  # type: ignore
+
+    return TransferConfig(multipart_threshold=threshold,
+                          multipart_chunksize=chunksize,
+                          max_concurrency=max_concurrency)
+
+
+class LocalFolderClient:
+    """
+    Stand-in for an S3 client which stores the objects on a local folder,
+    as `{root}/{bucket}/{key}`. Useful for tests and dry runs.
+
+    Only implements the calls used by `UploadQueue` and
+    `artifacts.S3Store`, with their boto3 signatures.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def _path(self, Bucket: str, Key: str) -> Path:
+        return self.root / Bucket / Key
+
+    @staticmethod
+    def _not_found(operation: str) -> Exception:
+        from botocore.exceptions import ClientError  # type: ignore
+
+        return ClientError({"Error": {"Code": "404", "Message": "Not Found"}}, operation)
+
+    def upload_file(self, Filename: str, Bucket: str, Key: str, Config: Any = None) -> None:
+        destination = self._path(Bucket, Key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(Filename, destination)
+
+    def upload_fileobj(self, Fileobj: Any, Bucket: str, Key: str, Config: Any = None) -> None:
+        destination = self._path(Bucket, Key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(Fileobj.read())
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes) -> dict:
+        destination = self._path(Bucket, Key)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        destination.write_bytes(Body)
+        return {}
+
+    def get_object(self, Bucket: str, Key: str) -> dict:
+        path = self._path(Bucket, Key)
+        if not path.is_file():
+            raise self._not_found("GetObject")
+        return {"Body": BytesIO(path.read_bytes())}
+
+    def head_object(self, Bucket: str, Key: str) -> dict:
+        path = self._path(Bucket, Key)
+        if not path.is_file():
+            raise self._not_found("HeadObject")
+        return {"ETag": f'"{md5(path.read_bytes()).hexdigest()}"',
+                "ContentLength": path.stat().st_size}
+
+    def delete_object(self, Bucket: str, Key: str) -> dict:
+        self._path(Bucket, Key).unlink(missing_ok=True)
+        return {}
+
+    def list_objects_v2(self, Bucket: str, Prefix: str = "", **kwargs) -> dict:
+        root = self.root / Bucket
+        keys = sorted(str(p.relative_to(root)) for p in root.rglob("*") if p.is_file()) \
+            if root.is_dir() else []
+        return {"Contents": [{"Key": k} for k in keys if k.startswith(Prefix)],
+                "IsTruncated": False}
+
+
+class UploadQueue:
+    """
+    Uploads files to an S3 bucket on background threads, so that the
+    simulation does not wait on them.
+
+    At most `max_pending` uploads are queued or running, and `submit`
+    blocks when the queue is full, so that a slow upload link throttles
+    the producers instead of filling the disk. Every upload is retried up
+    to `max_attempts` times with exponential backoff. Files larger than the
+    multipart threshold of `transfer_config` (see `multipart_config`) are
+    uploaded in parts. The first upload error is raised by `join`.
+    """
+
+    def __init__(self,
+                 bucket: str,
+                 client_factory: Callable[[], Any] = s3_client_factory,
+                 transfer_config: Optional[Any] = None,
+                 max_workers: int = 4,
+                 max_pending: int = 64,
+                 max_attempts: int = 5,
+                 backoff_seconds: float = 1.0):
+        self.bucket = bucket
+        self.transfer_config = transfer_config
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.client = client_factory()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers,
+                                            thread_name_prefix="upload")
+        self._slots = BoundedSemaphore(max_pending)
+        self._futures: List[Future] = []
+
+    def __enter__(self) -> "UploadQueue":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _retry(self, name: str, upload: Callable[[dict], None]) -> None:
+        kwargs = {} if self.transfer_config is None else {"Config": self.transfer_config}
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                upload(kwargs)
+                return
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    raise
+                delay = self.backoff_seconds * 2 ** (attempt - 1)
+                logger.warning(f"Upload of {name} failed ({e}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _upload(self, filename: str, key: str, delete: bool) -> str:
+        try:
+            self._retry(filename, lambda kwargs: self.client.upload_file(
+                Filename=filename, Bucket=self.bucket, Key=key, **kwargs))
+            if delete:
+                os.remove(filename)
+            return key
+        finally:
+            self._slots.release()
+
+    def _upload_bytes(self, data: bytes, key: str) -> str:
+        try:
+            self._retry(key, lambda kwargs: self.client.upload_fileobj(
+                Fileobj=BytesIO(data), Bucket=self.bucket, Key=key, **kwargs))
+            return key
+        finally:
+            self._slots.release()
+
+    def _submit(self, upload: Callable, *args) -> Future:
+        self._slots.acquire()
+        future = self._executor.submit(upload, *args)
+        # Only the uploads which are pending or failed are kept for `join`
+        self._futures = [f for f in self._futures if not f.done() or f.exception() is not None]
+        self._futures.append(future)
+        return future
+
+    def submit(self, filename: str, key: str, delete: bool = False) -> Future:
+        """
+        Queues the upload of `filename` as `key`, and removes the local file
+        once uploaded if `delete`. Blocks while the queue is full.
+        """
+        return self._submit(self._upload, filename, key, delete)
+
+    def submit_bytes(self, data: bytes, key: str) -> Future:
+        """
+        Queues the upload of `data` as `key`. Blocks while the queue is full.
+        """
+        return self._submit(self._upload_bytes, data, key)
+
+    def join(self) -> None:
+        """
+        Waits for all of the queued uploads, and raises the first error.
+        """
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.join()
+        finally:
+            self._executor.shutdown(wait=True)
@@ -0,0 +1,116 @@
+from functools import lru_cache
+from typing import Callable, Optional
+import numpy as np
+
+#############################################################
+## Gas fee scenarios                                       ##
+#############################################################
+
+MEAN_STEADY_STATE_L1 = 50  # type: Gwei
+DEVIATION_STEADY_STATE_L1 = 5
+MEAN_STEADY_STATE_BLOB = 30  # type: Gwei
+DEVIATION_STEADY_STATE_BLOB = 5
+MIN_STEADY_STATE_GAS = 10  # type: Gwei
+
+# NOTE: ideally, this should be mapped either to relative timesteps or L1 time rather than fixed timesteps
+# so that the scenarios are invariant to number
+L1_SHOCK_AMOUNT = 150  # type: Gwei
+BLOB_SHOCK_AMOUNT = 150  # type: Gwei
+SHOCK_START_FRACTION = 0.25  # Assumption: 25% of the horizon
+SHOCK_END_FRACTION = 0.25  # Assumption: 25% of the horizon
+
+L1_INTER_SHOCK_AMPLITUDE = 100  # Amplitude of wave
+L1_INTER_SHOCK_PERIOD = 10  # Period of wave
+
+GAS_FEES = ("l1", "blob")
+
+# (fee, length, seed, horizon) -> time series
+GasScenario = Callable[[str, int, int, int], np.ndarray]
+
+
+def shock_window(horizon: int) -> slice:
+    """
+    Timesteps of `horizon` on which the shock scenarios deviate from the
+    steady state.
+    """
+    initial_time = int(np.floor(SHOCK_START_FRACTION * horizon))
+    final_time = int(np.floor(SHOCK_END_FRACTION * horizon))
+    return slice(initial_time, horizon - final_time)
+
+
+def steady_scenario(fee: str, length: int, seed: int, horizon: int) -> np.ndarray:
+    """
+    Normally distributed gas fees around the steady state mean.
+    """
+    if fee == "l1":
+        mean, deviation = MEAN_STEADY_STATE_L1, DEVIATION_STEADY_STATE_L1
+    else:
+        mean, deviation = MEAN_STEADY_STATE_BLOB, DEVIATION_STEADY_STATE_BLOB
+    # Every fee gets its own stream from the seed
+    rng = np.random.default_rng([seed, GAS_FEES.index(fee)])
+    values = rng.standard_normal(length) * deviation + mean
+    # Note: Rounding is needed to address the fact that Gas is an integer type.
+    return np.maximum(np.floor(values), MIN_STEADY_STATE_GAS)
+
+
+def single_shock_scenario(fee: str, length: int, seed: int, horizon: int) -> np.ndarray:
+    """
+    Steady state, with a constant shock on the middle of the horizon.
+    """
+    values = steady_scenario(fee, length, seed, horizon)
+    values[shock_window(horizon)] += L1_SHOCK_AMOUNT if fee == "l1" else BLOB_SHOCK_AMOUNT
+    return values
+
+
+def intermittent_shock_scenario(fee: str, length: int, seed: int, horizon: int) -> np.ndarray:
+    """
+    Steady state, with a periodic shock to the L1 gas fee on the middle of
+    the horizon.
+    """
+    values = steady_scenario(fee, length, seed, horizon)
+    if fee == "l1":
+        window = shock_window(horizon)
+        t = np.arange(length)[window]
+        raw_shock_signal = (
+            L1_INTER_SHOCK_AMPLITUDE * np.sin(2 * np.pi * t / L1_INTER_SHOCK_PERIOD)
+            + L1_INTER_SHOCK_AMPLITUDE
+        )
+        values[window] += np.floor(np.maximum(raw_shock_signal, 1))
+    return values
+
+
+def zero_scenario(fee: str, length: int, seed: int, horizon: int) -> np.ndarray:
+    return np.zeros(length)
+
+
+GAS_SCENARIOS: dict[str, GasScenario] = {
+    "steady": steady_scenario,
+    "intermittent_shock": intermittent_shock_scenario,
+    "single_shock": single_shock_scenario,
+    "zero": zero_scenario,
+}
+
+
+@lru_cache(maxsize=None)
+def gas_fee_time_series(kind: str,
+                        fee: str,
+                        length: int,
+                        seed: int = 0,
+                        horizon: Optional[int] = None) -> np.ndarray:
+    """
+    Gas fee time series of the `kind` scenario (see `GAS_SCENARIOS`), for
+    the `fee` ("l1" or "blob"), with `length` values indexed by `time_l1`.
+
+    Series are generated on the first request and memoised, so the
+    returned array is shared and read-only. The same `seed` gives the same
+    random draws across processes, and all of the scenarios share them,
+    so that they only differ by their shocks. Shocks are placed relative
+    to `horizon` (`length` by default).
+    """
+    if fee not in GAS_FEES:
+        raise ValueError(f"Unknown gas fee {fee!r}, expected one of {GAS_FEES}")
+    if kind not in GAS_SCENARIOS:
+        raise ValueError(f"Unknown gas scenario {kind!r}, expected one of {tuple(GAS_SCENARIOS)}")
+    values = GAS_SCENARIOS[kind](fee, length, seed, length if horizon is None else horizon)
+    values.setflags(write=False)
+    return values
@@ -65,6 +65,7 @@ AZTEC_MODEL_BLOCKS: list[dict] = [
             "total_rewards_relays": s_total_rewards_relays,
             "agents": s_agents_rewards,
             "cumm_block_rewards": s_cumm_block_rewards,
+            "transactions": s_transactions_retention,
             #            'cumm_fee_cashback': lambda _1,_2,_3,s1,s2: ('cumm_fee_cashback', s2['fee_cashback'] + s1['cumm_fee_cashback'])
         },
     },
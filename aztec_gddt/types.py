@@ -1,5 +1,8 @@
 from typing import Annotated, Dict, TypedDict, NamedTuple, Optional
 from typing import Any, Callable, Concatenate, ParamSpec, Sequence
+from typing import Iterable, Iterator
+from collections.abc import Mapping
+from bisect import bisect_left
 from enum import IntEnum, Enum, auto
 from math import floor
 import numpy as np
@@ -210,9 +213,311 @@ AnyL1Transaction = (
 
 SelectionResults = dict[ProcessUUID, tuple[Proposal, list[Proposal]]]
 
+
+@dataclass
+class TransactionRollup:
+    """
+    Aggregates of the L1 transactions of a settled process, kept
+    after the transactions themselves are evicted from the ledger.
+    """
+
+    process: ProcessUUID
+    phase: SelectionPhase
+    transaction_count: int
+    gas: Gas
+    fee: Gwei
+    blob_gas: BlobGas
+    blob_fee: Gwei
+    who: list[AgentUUID]
+
+    @staticmethod
+    def from_transactions(
+        process: "Process", transactions: Sequence[AnyL1Transaction]
+    ) -> "TransactionRollup":
+        who: list[AgentUUID] = []
+        for tx in transactions:
+            if tx.who not in who:
+                who.append(tx.who)
+        return TransactionRollup(
+            process=process.uuid,
+            phase=process.phase,
+            transaction_count=len(transactions),
+            gas=sum(tx.gas for tx in transactions),
+            fee=sum(tx.fee for tx in transactions),
+            blob_gas=sum(getattr(tx, "blob_gas", 0) for tx in transactions),
+            blob_fee=sum(getattr(tx, "blob_fee", 0) for tx in transactions),
+            who=who,
+        )
+
+
+class _LedgerLog:
+    """
+    Shared, append-only backing storage for `TransactionLedger` views.
+    """
+
+    def __init__(self):
+        self.transactions: list[AnyL1Transaction] = []
+        self.position_by_uuid: dict[TxUUID, int] = {}
+        self.positions_by_process: dict[ProcessUUID, list[int]] = {}
+        self.positions_by_process_kind: dict[tuple[ProcessUUID, type], list[int]] = {}
+        self.process_by_position: list[ProcessUUID] = []
+
+    def append(self, process_uuid: ProcessUUID, tx: AnyL1Transaction) -> None:
+        position = len(self.transactions)
+        self.transactions.append(tx)
+        self.process_by_position.append(process_uuid)
+        self.position_by_uuid[tx.uuid] = position
+        self.positions_by_process.setdefault(process_uuid, []).append(position)
+        self.positions_by_process_kind.setdefault(
+            (process_uuid, type(tx)), []
+        ).append(position)
+
+
+class TransactionLedger(Mapping):
+    """
+    Append-only mapping of `TxUUID` to L1 transactions, indexed by the
+    process on which they were submitted and by their type.
+
+    A ledger is an immutable view over a log which is shared with the
+    ledgers it was derived from: `append` returns a new ledger and leaves
+    the current one untouched, while only storing the new transactions.
+    Lookups by process cost O(transactions in the process).
+
+    Settled processes can be evicted, in which case their transactions
+    are replaced by a `TransactionRollup` on `rollups`.
+    """
+
+    __slots__ = ("_log", "_size", "_rollups", "_n_rollups")
+
+    def __init__(self):
+        self._log = _LedgerLog()
+        self._size = 0
+        self._rollups: list[TransactionRollup] = []
+        self._n_rollups = 0
+
+    def __getitem__(self, tx_uuid: TxUUID) -> AnyL1Transaction:
+        position = self._log.position_by_uuid[tx_uuid]
+        if position >= self._size:
+            raise KeyError(tx_uuid)
+        return self._log.transactions[position]
+
+    def __iter__(self) -> Iterator[TxUUID]:
+        return (tx.uuid for tx in self._log.transactions[: self._size])
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self) -> str:
+        return f"TransactionLedger(size={self._size}, rollups={self._n_rollups})"
+
+    def _visible(self, positions: list[int]) -> list[AnyL1Transaction]:
+        # Positions are sorted, so the ones past this view are at the end.
+        visible = positions[: bisect_left(positions, self._size)]
+        return [self._log.transactions[i] for i in visible]
+
+    def _derive(
+        self, log: _LedgerLog, new_rollups: Sequence[TransactionRollup] = ()
+    ) -> "TransactionLedger":
+        rollups = self._rollups
+        if len(new_rollups) > 0:
+            if self._n_rollups < len(rollups):
+                # The rollups were already extended from this view. Fork them.
+                rollups = rollups[: self._n_rollups]
+            rollups.extend(new_rollups)
+
+        ledger = TransactionLedger.__new__(TransactionLedger)
+        ledger._log = log
+        ledger._size = len(log.transactions)
+        ledger._rollups = rollups
+        ledger._n_rollups = self._n_rollups + len(new_rollups)
+        return ledger
+
+    def _copy_log(self, exclude: Optional[ProcessUUID] = None) -> _LedgerLog:
+        log = _LedgerLog()
+        for i in range(self._size):
+            process_uuid = self._log.process_by_position[i]
+            if exclude is None or process_uuid != exclude:
+                log.append(process_uuid, self._log.transactions[i])
+        return log
+
+    def append(
+        self, process_uuid: ProcessUUID, transactions: Iterable[AnyL1Transaction]
+    ) -> "TransactionLedger":
+        """
+        Returns a new ledger with `transactions` added under `process_uuid`.
+        """
+        transactions = list(transactions)
+        if len(transactions) == 0:
+            return self
+
+        log = self._log
+        if self._size < len(log.transactions):
+            # The log was already extended from this view. Fork it.
+            log = self._copy_log()
+
+        for tx in transactions:
+            log.append(process_uuid, tx)
+
+        return self._derive(log)
+
+    def evict(self, process: "Process") -> "TransactionLedger":
+        """
+        Returns a new ledger without the transactions of `process`,
+        which are rolled up into a `TransactionRollup`.
+
+        The remaining transactions are moved into a fresh log, so the
+        cost is O(transactions not yet evicted).
+        """
+        transactions = self.for_process(process.uuid)
+        if len(transactions) == 0:
+            return self
+        rollup = TransactionRollup.from_transactions(process, transactions)
+        return self._derive(self._copy_log(exclude=process.uuid), [rollup])
+
+    @property
+    def rollups(self) -> list[TransactionRollup]:
+        return self._rollups[: self._n_rollups]
+
+    def for_process(
+        self, process_uuid: ProcessUUID, kind: Optional[type] = None
+    ) -> list[AnyL1Transaction]:
+        """
+        Returns the transactions of a process, optionally of a given type,
+        in submission order.
+        """
+        if kind is None:
+            positions = self._log.positions_by_process.get(process_uuid, [])
+        else:
+            positions = self._log.positions_by_process_kind.get(
+                (process_uuid, kind), []
+            )
+        return self._visible(positions)
+
+    def proposals(self, process_uuid: ProcessUUID) -> list[Proposal]:
+        return self.for_process(process_uuid, Proposal)  # type: ignore
+
+    def process_of(self, tx_uuid: TxUUID) -> ProcessUUID:
+        position = self._log.position_by_uuid[tx_uuid]
+        if position >= self._size:
+            raise KeyError(tx_uuid)
+        return self._log.process_by_position[position]
+
+
 # Definition for simulation-specific types
 
 
+class CensorshipSeries(Mapping):
+    """
+    Immutable `{time_l1: is_censored}` series over the contiguous range
+    `[offset, offset + length)`, stored as a bit-packed NumPy array.
+
+    Behaves as a read-only dict, so that it can be used in place of the
+    `dict[L1Blocks, bool]` series. Times outside of the range are not
+    keys, and are considered as censored by `is_censored` and `any_censored`,
+    as on `helper.check_for_censorship`.
+    """
+
+    __slots__ = ("bits", "offset", "length")
+
+    def __init__(self, bits: np.ndarray, offset: L1Blocks, length: int):
+        self.bits = bits
+        self.offset = offset
+        self.length = length
+
+    @staticmethod
+    def from_values(values: Sequence[bool], offset: L1Blocks = 0) -> "CensorshipSeries":
+        values = np.asarray(values, dtype=bool)
+        return CensorshipSeries(np.packbits(values), offset, len(values))
+
+    @staticmethod
+    def from_dict(series: Mapping[L1Blocks, bool]) -> "CensorshipSeries":
+        """
+        Times missing between the first and the last key are censored.
+        """
+        if len(series) == 0:
+            return CensorshipSeries.from_values([])
+        offset = min(series.keys())
+        values = np.ones(max(series.keys()) - offset + 1, dtype=bool)
+        values[np.fromiter(series.keys(), dtype=np.int64) - offset] = list(series.values())
+        return CensorshipSeries.from_values(values, offset)
+
+    def to_array(self) -> np.ndarray:
+        """
+        Dense boolean array over `[0, offset + length)`.
+        """
+        return np.concatenate([np.ones(self.offset, dtype=bool), self._values()])
+
+    def _values(self) -> np.ndarray:
+        return np.unpackbits(self.bits, count=self.length).astype(bool)
+
+    def _bit(self, time_l1: L1Blocks) -> bool:
+        i = time_l1 - self.offset
+        return bool((self.bits[i >> 3] >> (7 - (i & 7))) & 1)
+
+    def __getitem__(self, time_l1: L1Blocks) -> bool:
+        if not (self.offset <= time_l1 < self.offset + self.length):
+            raise KeyError(time_l1)
+        return self._bit(time_l1)
+
+    def get(self, time_l1: L1Blocks, default=None):  # type: ignore
+        if self.offset <= time_l1 < self.offset + self.length:
+            return self._bit(time_l1)
+        return default
+
+    def __contains__(self, time_l1: object) -> bool:
+        return isinstance(time_l1, (int, np.integer)) and (
+            self.offset <= time_l1 < self.offset + self.length)
+
+    def __iter__(self) -> Iterator[L1Blocks]:
+        return iter(range(self.offset, self.offset + self.length))
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CensorshipSeries):
+            return (self.offset == other.offset and self.length == other.length
+                    and np.array_equal(self.bits, other.bits))
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash((self.offset, self.length, self.bits.tobytes()))
+
+    def __reduce__(self):
+        return (CensorshipSeries._from_bytes, (self.bits.tobytes(), self.offset, self.length))
+
+    @staticmethod
+    def _from_bytes(data: bytes, offset: L1Blocks, length: int) -> "CensorshipSeries":
+        return CensorshipSeries(np.frombuffer(data, dtype=np.uint8), offset, length)
+
+    def __repr__(self) -> str:
+        return f"CensorshipSeries(offset={self.offset}, length={self.length})"
+
+    def is_censored(self, time_l1: np.ndarray) -> np.ndarray:
+        """
+        Vectorised lookup. Times out of the range are censored.
+        """
+        i = np.asarray(time_l1) - self.offset
+        in_range = (i >= 0) & (i < self.length)
+        i = np.where(in_range, i, 0)
+        bits = (self.bits[i >> 3] >> (7 - (i & 7))) & 1
+        return np.where(in_range, bits.astype(bool), True)
+
+    def any_censored(self, start: np.ndarray, stop: np.ndarray) -> np.ndarray:
+        """
+        Whether any time on each `[start, stop)` window is censored.
+        Windows reaching out of the range are censored, and empty ones are not.
+        """
+        start = np.asarray(start)
+        stop = np.asarray(stop)
+        censored_before = np.concatenate([[0], np.cumsum(self._values())])
+        lo = np.clip(start - self.offset, 0, self.length)
+        hi = np.clip(stop - self.offset, 0, self.length)
+        n_censored = censored_before[np.maximum(hi, lo)] - censored_before[lo]
+        out_of_range = (start < self.offset) | (stop > self.offset + self.length)
+        return (stop > start) & (out_of_range | (n_censored > 0))
+
+
 class AztecModelState(TypedDict):
     # Time progression
     timestep: int
@@ -234,7 +539,7 @@ class AztecModelState(TypedDict):
 
     # Process State
     current_process: Optional[Process]
-    transactions: dict[TxUUID, AnyL1Transaction]
+    transactions: TransactionLedger
 
     # Environmental / Behavioral Variables
     gas_fee_l1: Gwei
@@ -280,7 +585,7 @@ class SlashParameters:
 
 
 class AztecModelParams(TypedDict):
-    # random_seed: int #Random seed for simulation model variation.
+    random_seed: int  # Random seed for simulation model variation.
 
     label: str  # Defines Labels as strings
     timestep_in_blocks: L1Blocks  # Defines timesteps in L1Blocks
@@ -320,8 +625,8 @@ class AztecModelParams(TypedDict):
     rewards_to_provers: Percentage
     rewards_to_relay: Percentage
 
-    censorship_series_builder: dict[L1Blocks, bool]
-    censorship_series_validator: dict[L1Blocks, bool]
+    censorship_series_builder: Mapping[L1Blocks, bool]  # eg. CensorshipSeries
+    censorship_series_validator: Mapping[L1Blocks, bool]
 
     gas_estimators: L1GasEstimators
     tx_estimators: UserTransactionEstimators
@@ -339,6 +644,7 @@ class AztecModelParams(TypedDict):
 
     past_gas_weight_fraction: Percentage
     fp_determine_profitability: FunctionalParameterizationString
+    fp_transaction_retention: FunctionalParameterizationString
     top_up_amount: ETH
 
 
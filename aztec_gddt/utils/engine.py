@@ -0,0 +1,271 @@
+from copy import deepcopy
+from typing import Callable, Iterator, Optional, Protocol
+import numpy as np
+import pandas as pd
+
+from aztec_gddt.helper import RandomStream
+from aztec_gddt.utils.sim_run import policy_aggregator, label_estimators
+
+
+class TrajectoryObserver(Protocol):
+    """
+    Consumes the end-of-timestep states of a single trajectory.
+    """
+
+    def observe(self, state: dict) -> None: ...
+
+    def result(self) -> dict: ...
+
+
+def expand_sweep_params(params: dict[str, list]) -> list[dict]:
+    """
+    Expands a `{param: [values]}` sweep dictionary into one parameter dict
+    per subset, following the cadCAD `config_sim` rules: value lists must
+    either have length 1 (broadcasted) or share the same length.
+    """
+    lengths = {len(v) for v in params.values()}
+    n_subsets = max(lengths, default=1)
+    if len(lengths - {1}) > 1:
+        raise ValueError(
+            "When sweeping, parameter list lengths should either be 1 and/or equal."
+        )
+    return [
+        {k: (v[i] if len(v) > 1 else v[0]) for k, v in params.items()}
+        for i in range(n_subsets)
+    ]
+
+
+def aggregate_policies(
+    policies: dict, params: dict, substep: int, history: list, state: dict
+) -> dict:
+    """
+    Computes every policy of a block over the same state and reduces the
+    signals key-wise with `policy_aggregator`, as cadCAD does.
+    """
+    signal: dict = {}
+    for policy in policies.values():
+        for key, value in policy(params, substep, history, state).items():
+            if key in signal:
+                signal[key] = policy_aggregator(signal[key], value)
+            else:
+                signal[key] = value
+    return signal
+
+
+def run_timestep(
+    params: dict, psubs: list[dict], history: list, state: dict, timestep: int
+) -> dict:
+    """
+    Advances a state through all the partial state update blocks of a single
+    timestep and returns the end-of-timestep state.
+
+    Each block sees a shallow copy of the previous block state, which is what
+    cadCAD does when `deepcopy_off` is set.
+    """
+    for substep, block in enumerate(psubs, start=1):
+        signal = aggregate_policies(
+            block.get("policies", {}), params, substep, history, state
+        )
+        updates = dict(
+            suf(params, substep, history, state, signal)
+            for suf in block.get("variables", {}).values()
+        )
+        state = {**state, **updates}
+        state["substep"] = substep
+        state["timestep"] = timestep
+    return state
+
+
+def iterate_trajectory(
+    initial_state: dict,
+    params: dict,
+    psubs: list[dict],
+    N_timesteps: int,
+    simulation: int = 0,
+    subset: int = 0,
+    run: int = 1,
+) -> Iterator[dict]:
+    """
+    Yields the initial state and then the end-of-timestep state of every
+    timestep of a single trajectory. Substep states are never stored.
+
+    The trajectory draws its random numbers from its own `RandomStream`,
+    derived from the `random_seed` param and the `run` index only, so
+    that it does not depend on the position (`subset`) of the params on
+    their sweep chunk.
+    """
+    params = {
+        **params,
+        "random_stream": RandomStream.for_trajectory(params.get("random_seed"), run),
+    }
+    state = deepcopy(initial_state)
+    state.update(simulation=simulation, subset=subset, run=run, substep=0, timestep=0)
+    yield state
+
+    # NOTE: no history is kept. Policies and SUFs receiving it
+    # (eg. `s_erase_history`) get an always-empty list.
+    history: list = []
+    for timestep in range(1, N_timesteps + 1):
+        state = run_timestep(params, psubs, history, state, timestep)
+        yield state
+
+
+def native_sim_run(
+    state_variables,
+    params,
+    psubs,
+    N_timesteps,
+    N_samples,
+    assign_params=True,
+    observer: Optional[Callable[[dict], TrajectoryObserver]] = None,
+    agent_deltas: bool = False,
+) -> pd.DataFrame:
+    """
+    Runs the simulation without going through cadCAD.
+
+    The partial state update blocks are executed directly in lockstep and
+    only the end-of-timestep states are kept, so that there is no
+    substep/history bookkeeping to pay for. The output follows the
+    `sim_run(..., drop_substeps=True)` layout.
+
+    Unlike cadCAD with `deepcopy_off`, every trajectory starts from its own
+    deep copy of `state_variables`, so that mutable entities (eg. `agents`)
+    are not shared across runs.
+
+    If an `observer` factory is given, it is called with the params of
+    every trajectory and the resulting observer is fed its end-of-timestep
+    states, which are not kept. The output then has a single row per
+    trajectory, with the `result()` of its observer.
+
+    With `agent_deltas`, the `agents` column is replaced by an
+    `agent_deltas` column with the `(agent, field, value)` changes of every
+    timestep, the first state holding all of them (see
+    `aztec_gddt.psuu.agent_ledger`).
+    """
+    subsets = expand_sweep_params(params)
+
+    records: list[dict] = []
+    for subset, sweep_dict in enumerate(subsets):
+        for run in range(1, N_samples + 1):
+            trajectory = iterate_trajectory(
+                state_variables, sweep_dict, psubs, N_timesteps, subset=subset, run=run
+            )
+            if observer is not None:
+                trajectory_observer = observer(sweep_dict)
+                for state in trajectory:
+                    trajectory_observer.observe(state)
+                records.append(
+                    dict(
+                        simulation=0,
+                        subset=subset,
+                        run=run,
+                        **trajectory_observer.result(),
+                    )
+                )
+                continue
+
+            encoder = None
+            if agent_deltas:
+                from aztec_gddt.psuu.agent_ledger import AgentDeltaEncoder
+
+                encoder = AgentDeltaEncoder()
+            for state in trajectory:
+                record = state.copy()
+                del record["substep"]
+                if encoder is not None:
+                    record["agent_deltas"] = encoder.encode(record.pop("agents"))
+                records.append(record)
+
+    df = pd.DataFrame(records)
+
+    if assign_params != False:
+        params_df = pd.DataFrame(subsets)
+        params_df.index.name = "subset"
+        # Labelled once per subset, before being joined to every row
+        params_df = label_estimators(params_df)
+        df = df.join(params_df, on="subset")
+
+    df = df.reset_index(drop=False)
+    return df
+
+
+def batched_sim_run(
+    state_variables,
+    params,
+    psubs,
+    N_timesteps,
+    N_samples,
+    assign_params=True,
+) -> pd.DataFrame:
+    """
+    Runs the simulation with all the `N_samples` Monte Carlo runs of each
+    subset advanced together as arrays, through the batched phase machine
+    on `aztec_gddt.logic_functions.batched`.
+
+    `psubs` is not used, as the batched logic mirrors `AZTEC_MODEL_BLOCKS`.
+    Only the scalar state variables are kept: the `current_process`,
+    `agents` and `transactions` columns are replaced by `process_*` columns
+    and by the total `agents_balance`. Runs draw from a per-combination
+    stream (seeded by its `random_seed`), so they are statistically equivalent to, but not the same as, the
+    native engine trajectories.
+    """
+    from aztec_gddt.logic_functions.batched import (
+        BATCHED_STATE_VARIABLES,
+        NO_PROCESS,
+        build_context,
+        initial_batched_state,
+        run_batched_timestep,
+    )
+
+    subsets = expand_sweep_params(params)
+    process_columns = [
+        "process_id",
+        "process_phase",
+        "process_duration_in_current_phase",
+        "process_current_phase_init_time",
+        "process_entered_race_mode",
+    ]
+
+    dfs: list[pd.DataFrame] = []
+    for subset, sweep_dict in enumerate(subsets):
+        # Keyed by the seed of the combination only, as for the native engine
+        stream = RandomStream(np.random.SeedSequence(sweep_dict.get("random_seed")))
+        ctx = build_context(sweep_dict, state_variables, N_samples, stream)
+        state = initial_batched_state(state_variables, ctx)
+
+        columns = BATCHED_STATE_VARIABLES + process_columns + ["agents_balance"]
+        tensor: dict[str, list] = {col: [] for col in columns}
+        for timestep in range(N_timesteps + 1):
+            if timestep > 0:
+                run_batched_timestep(sweep_dict, ctx, state)
+            for col in columns[:-1]:
+                tensor[col].append(state[col])
+            tensor["agents_balance"].append(state["agents_balance"].sum(axis=1))
+
+        # (timesteps, runs) arrays are laid out run by run.
+        data = {col: np.stack(values).T.ravel() for col, values in tensor.items()}
+        no_process = data["process_phase"] == NO_PROCESS
+        for col in ("process_id", "process_phase"):
+            data[col] = pd.array(
+                np.where(no_process, 0, data[col]), dtype="Int64"
+            )
+            data[col][no_process] = pd.NA
+
+        subset_df = pd.DataFrame(data)
+        subset_df.insert(0, "timestep", np.tile(np.arange(N_timesteps + 1), N_samples))
+        subset_df.insert(0, "run", np.repeat(np.arange(1, N_samples + 1), N_timesteps + 1))
+        subset_df.insert(0, "subset", subset)
+        subset_df.insert(0, "simulation", 0)
+        dfs.append(subset_df)
+
+    df = pd.concat(dfs, ignore_index=True)
+
+    if assign_params != False:
+        params_df = pd.DataFrame(subsets)
+        params_df.index.name = "subset"
+        # Labelled once per subset, before being joined to every row
+        params_df = label_estimators(params_df)
+        df = df.join(params_df, on="subset")
+
+    df = df.reset_index(drop=False)
+    return df
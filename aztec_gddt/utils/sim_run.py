@@ -1,13 +1,12 @@
 from typing import Union
-from cadCAD.configuration import Experiment  # type: ignore
-from cadCAD.configuration.utils import config_sim  # type: ignore
-from cadCAD.engine import ExecutionMode, ExecutionContext, Executor  # type: ignore
-from cadCAD.tools.utils import add_parameter_labels
+import numpy as np
 import pandas as pd
 import sys
 import os
 from functools import partialmethod
 from inspect import signature, getfile
+from copy import copy
+from dataclasses import fields
 
 
 class HiddenPrints:
@@ -40,6 +39,99 @@ def policy_aggregator(a, b):
         return a + b
 
 
+def label_callable(f) -> str:
+    return f"{f.__name__}[{signature(f)}]|{getfile(f)}"
+
+
+def label_estimator(estimators):
+    """
+    Returns a copy of an estimators dataclass (eg. `L1GasEstimators`) with its
+    callables replaced by string labels. The original is left untouched.
+    """
+    labelled = copy(estimators)
+    for field in fields(estimators):
+        f = getattr(estimators, field.name)
+        if callable(f):
+            setattr(labelled, field.name, label_callable(f))
+    return labelled
+
+
+def label_estimators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Replaces the `gas_estimators` and `tx_estimators` callables
+    by string labels so that the results can be serialized.
+
+    Every distinct estimators object is labelled only once, and the
+    labelled copy is shared by all of the rows holding it.
+    """
+    for col in ("gas_estimators", "tx_estimators"):
+        if col not in df.columns:
+            continue
+        values = df[col].to_numpy()
+        ids = np.fromiter(map(id, values), dtype=np.int64, count=len(values))
+        _, first_rows, codes = np.unique(ids, return_index=True, return_inverse=True)
+        labelled = np.empty(len(first_rows), dtype=object)
+        for i, row in enumerate(first_rows):
+            estimators = values[row]
+            if estimators is None or isinstance(estimators, str):
+                labelled[i] = estimators
+            else:
+                labelled[i] = label_estimator(estimators)
+        df[col] = labelled[codes]
+    return df
+
+
+class TrajectoryParams:
+    """
+    Params of every cadCAD trajectory, with its own `RandomStream` derived
+    from the `random_seed` param and the run, as on the native engine (see
+    `helper.RandomStream.for_trajectory`). They are built on the first
+    call of each trajectory.
+    """
+
+    def __init__(self):
+        self.params: dict = {}
+
+    def __call__(self, params: dict, state: dict) -> dict:
+        key = (state["simulation"], state["subset"], state["run"])
+        if key not in self.params:
+            from aztec_gddt.helper import RandomStream
+
+            self.params[key] = {
+                **params,
+                "random_stream": RandomStream.for_trajectory(params.get("random_seed"), state["run"]),
+            }
+        return self.params[key]
+
+
+def with_trajectory_params(psubs: list[dict]) -> list[dict]:
+    """
+    Copy of the partial state update blocks whose policies and state update
+    functions get the params of their trajectory (see `TrajectoryParams`).
+
+    NOTE: the wrappers keep the arity of the wrapped functions, which is
+    how cadCAD tells policies from state update functions.
+    """
+    trajectory_params = TrajectoryParams()
+
+    def policy(f):
+        def wrapped(params, substep, history, state):
+            return f(trajectory_params(params, state), substep, history, state)
+        return wrapped
+
+    def variable(f):
+        def wrapped(params, substep, history, state, signal):
+            return f(trajectory_params(params, state), substep, history, state, signal)
+        return wrapped
+
+    return [
+        {**block,
+         "policies": {name: policy(f) for name, f in block.get("policies", {}).items()},
+         "variables": {name: variable(f) for name, f in block.get("variables", {}).items()}}
+        for block in psubs
+    ]
+
+
 def sim_run(
     state_variables,
     params,
@@ -51,10 +143,59 @@ def sim_run(
     drop_substeps=True,
     exec_mode="local",
     supress_cadCAD_print=False,
+    engine="cadCAD",
+    observer=None,
+    agent_deltas=False,
 ) -> pd.DataFrame:
     """
     Run cadCAD simulations without headaches.
+
+    If `engine` is "native", the blocks are run by the lockstep engine
+    in `aztec_gddt.utils.engine` instead, which only keeps the
+    end-of-timestep states. If it is "batched", all the Monte Carlo runs
+    of a subset are advanced together as arrays, and only the scalar state
+    variables are kept.
+
+    An `observer` factory and `agent_deltas` (see
+    `aztec_gddt.utils.engine.native_sim_run`) are only supported by the
+    "native" engine.
     """
+    if observer is not None and engine != "native":
+        raise ValueError(f"Observers are not supported by the {engine} engine")
+    if agent_deltas and engine != "native":
+        raise ValueError(f"Agent deltas are not supported by the {engine} engine")
+
+    if engine == "native":
+        from aztec_gddt.utils.engine import native_sim_run
+
+        return native_sim_run(
+            state_variables,
+            params,
+            psubs,
+            N_timesteps,
+            N_samples,
+            assign_params=assign_params,
+            observer=observer,
+            agent_deltas=agent_deltas,
+        )
+    elif engine == "batched":
+        from aztec_gddt.utils.engine import batched_sim_run
+
+        return batched_sim_run(
+            state_variables,
+            params,
+            psubs,
+            N_timesteps,
+            N_samples,
+            assign_params=assign_params,
+        )
+    elif engine != "cadCAD":
+        raise ValueError(f"Unknown simulation engine {engine}")
+
+    from cadCAD.configuration import Experiment  # type: ignore
+    from cadCAD.configuration.utils import config_sim  # type: ignore
+    from cadCAD.engine import ExecutionMode, ExecutionContext, Executor  # type: ignore
+    from cadCAD.tools.utils import add_parameter_labels
 
     with HiddenPrints(is_active=supress_cadCAD_print):
         # Set-up sim_config
@@ -66,7 +207,7 @@ def sim_run(
         exp.append_configs(
             sim_configs=sim_config,
             initial_state=state_variables,
-            partial_state_update_blocks=psubs,
+            partial_state_update_blocks=with_trajectory_params(psubs),
             policy_ops=[policy_aggregator],
         )
         configs = exp.configs
@@ -100,54 +241,7 @@ def sim_run(
             pass
         else:
             df = add_parameter_labels(configs, df)
-            for indx in df.index:
-                f = df.loc[indx, "gas_estimators"].proposal
-                if type(f) != str:
-                    df.loc[indx, "gas_estimators"].proposal = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
-
-                f = df.loc[indx, "gas_estimators"].commitment_bond
-                if type(f) != str:
-                    df.loc[indx, "gas_estimators"].commitment_bond = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
-
-                f = df.loc[indx, "gas_estimators"].content_reveal
-                if type(f) != str:
-                    df.loc[indx, "gas_estimators"].content_reveal = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
-
-                f = df.loc[indx, "gas_estimators"].content_reveal_blob
-                if type(f) != str:
-                    df.loc[indx, "gas_estimators"].content_reveal_blob = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
-
-                f = df.loc[indx, "gas_estimators"].rollup_proof
-                if type(f) != str:
-                    df.loc[indx, "gas_estimators"].rollup_proof = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
-
-                f = df.loc[indx, "tx_estimators"].transaction_count
-                if type(f) != str:
-                    df.loc[indx, "tx_estimators"].transaction_count = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
-
-                f = df.loc[indx, "tx_estimators"].proposal_average_size
-                if type(f) != str:
-                    df.loc[indx, "tx_estimators"].proposal_average_size = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
-
-                f = df.loc[indx, "tx_estimators"].transaction_average_fee_per_size
-                if type(f) != str:
-                    df.loc[indx, "tx_estimators"].transaction_average_fee_per_size = (
-                        f"{f.__name__}[{signature(f)}]|{getfile(f)}"
-                    )
+            df = label_estimators(df)
 
         # Based on Vitor Marthendal (@marthendalnunes) snippet
         if use_label == True:
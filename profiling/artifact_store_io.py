@@ -0,0 +1,58 @@
+"""
+Compares the write and read throughput of the artifact stores, with
+Trajectory Tensor sized files.
+
+Usage: python profiling/artifact_store_io.py [--files 50] [--size_mb 4] [URL ...]
+URLs are as for `aztec_gddt.psuu.artifacts.open_store`, eg. `s3://bucket/prefix`.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(".")
+
+from aztec_gddt.psuu.artifacts import open_store
+
+
+def benchmark(url: str, n_files: int, size: int) -> tuple[float, float]:
+    with tempfile.TemporaryDirectory() as folder:
+        filenames = []
+        for i in range(n_files):
+            filename = os.path.join(folder, f"part-{i}.bin")
+            with open(filename, "wb") as fid:
+                fid.write(os.urandom(size))
+            filenames.append(filename)
+
+        with open_store(url) as store:
+            start = time.perf_counter()
+            for i, filename in enumerate(filenames):
+                store.put_file(f"benchmark/part-{i}.bin", filename)
+            store.flush()
+            write_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for i in range(n_files):
+                store.get_bytes(f"benchmark/part-{i}.bin")
+            read_seconds = time.perf_counter() - start
+
+            for i in range(n_files):
+                store.delete(f"benchmark/part-{i}.bin")
+    return write_seconds, read_seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("urls", nargs="*")
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--size_mb", type=float, default=4)
+    args = parser.parse_args()
+
+    size = int(args.size_mb * 1024 ** 2)
+    with tempfile.TemporaryDirectory() as local_folder:
+        for url in ["memory://", local_folder] + args.urls:
+            write_seconds, read_seconds = benchmark(url, args.files, size)
+            total_mb = args.files * size / 1024 ** 2
+            print(f"{url:<40} write: {total_mb / write_seconds:8.1f} MB/s  "
+                  f"read: {total_mb / read_seconds:8.1f} MB/s")
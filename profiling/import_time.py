@@ -0,0 +1,53 @@
+"""
+Measures the time for importing the package entry points on fresh
+interpreters, as paid by every worker process and CLI call.
+
+Usage: python profiling/import_time.py [--repeats 5]
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+
+MODULES = [
+    "aztec_gddt",
+    "aztec_gddt.params",
+    "aztec_gddt.psuu.kpis",
+    "aztec_gddt.experiment",
+    "aztec_gddt.__main__",
+    "aztec_gddt.plot_tools",
+]
+
+HEAVY_MODULES = ["matplotlib", "seaborn", "sklearn", "boto3", "cadCAD", "scipy.stats"]
+
+SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+print(json.dumps([time.perf_counter() - start,
+                  [m for m in {heavy!r} if m in sys.modules]]))
+"""
+
+
+def measure(module: str, repeats: int) -> tuple[float, list[str]]:
+    root = Path(__file__).resolve().parent.parent
+    seconds = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c",
+             SNIPPET.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=root, capture_output=True, text=True, check=True).stdout
+        elapsed, loaded = json.loads(output.splitlines()[-1])
+        seconds.append(elapsed)
+    return median(seconds), loaded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    for module in MODULES:
+        seconds, loaded = measure(module, args.repeats)
+        print(f"{module:<24} {seconds * 1000:8.1f} ms  heavy: {', '.join(loaded) or '-'}")
@@ -0,0 +1,85 @@
+from io import BytesIO
+from pathlib import Path
+from typing import Callable
+import numpy as np
+import pandas as pd
+import pytest as pt
+import aztec_gddt
+from aztec_gddt.censorship import CENSORSHIP_DATA_KEY, DENCUN_BLOCK_NUMBER
+from aztec_gddt.params import SINGLE_RUN_PARAMS, INITIAL_STATE
+from aztec_gddt.structure import AZTEC_MODEL_BLOCKS
+from aztec_gddt.utils import sim_run
+from aztec_gddt.psuu.artifacts import MemoryStore
+from aztec_gddt.psuu.kpis import (KPIAccumulator, accumulated_kpis_to_trajectory_tensor,
+                                  governance_surface_params)
+
+ROOT = Path(aztec_gddt.__file__).parent.parent
+
+
+@pt.fixture(scope="session", autouse=True)
+def no_log_file_on_root():
+    """
+    The tests only log through the package logger, which has no handlers
+    unless the CLI sets them up (see `aztec_gddt.setup_logging`).
+    """
+    existed = (ROOT / "cadcad.log").exists()
+    yield
+    assert existed or not (ROOT / "cadcad.log").exists()
+
+
+@pt.fixture(scope="session")
+def censorship_source() -> MemoryStore:
+    """
+    Builder/validator data covering the blocks sampled by the experiment,
+    so that it does not need the project data.
+    """
+    n_blocks = 250_000
+    rng = np.random.default_rng(0)
+    builders = np.array(["beaverbuild.org", "Titan"])
+    data = pd.DataFrame({
+        "block_number": np.arange(DENCUN_BLOCK_NUMBER - 10, DENCUN_BLOCK_NUMBER - 10 + n_blocks),
+        "slot": np.arange(n_blocks),
+        "date": pd.date_range("2024-03-14", periods=n_blocks, freq="12s"),
+        "builder": rng.choice(builders, n_blocks),
+        "validator": rng.choice(builders, n_blocks),
+    })
+    source = MemoryStore()
+    data.to_parquet(buffer := BytesIO())
+    source.put_bytes(CENSORSHIP_DATA_KEY, buffer.getvalue())
+    return source
+
+
+@pt.fixture(scope="session")
+def model_sweep() -> Callable[..., dict]:
+    """
+    Sweep params of `SINGLE_RUN_PARAMS`, where the keyword arguments are
+    the lists of values of the swept params.
+    """
+    def sweep(**swept_params: list) -> dict:
+        return {k: [v] for k, v in SINGLE_RUN_PARAMS.items()} | swept_params
+    return sweep
+
+
+@pt.fixture(scope="session")
+def run_model() -> Callable[..., pd.DataFrame]:
+    """
+    Runs the model from `INITIAL_STATE`, on the native engine unless an
+    `engine` is given.
+    """
+    def run(sweep_params: dict, n_timesteps: int, n_runs: int, **kwargs) -> pd.DataFrame:
+        return sim_run(INITIAL_STATE, sweep_params, AZTEC_MODEL_BLOCKS, n_timesteps, n_runs,
+                       **({"engine": "native"} | kwargs))
+    return run
+
+
+@pt.fixture(scope="session")
+def run_model_kpis(run_model) -> Callable[..., pd.DataFrame]:
+    """
+    Runs the model with the `KPIAccumulator` observer, into a Trajectory
+    Tensor indexed by the governance params and the `sweep_index`.
+    """
+    def run(sweep_params: dict, n_timesteps: int, n_runs: int) -> pd.DataFrame:
+        sim_df = run_model(sweep_params, n_timesteps, n_runs, observer=KPIAccumulator)
+        return accumulated_kpis_to_trajectory_tensor(
+            sim_df, governance_surface_params + ["sweep_index"]).reset_index()
+    return run
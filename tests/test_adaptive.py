@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+from aztec_gddt.metrics import G1, G2
+from aztec_gddt.psuu.sweep import SweepSpace
+from aztec_gddt.psuu.adaptive import adaptive_sweep, score_sweeps, refinement_priority
+
+N_RUNS = 2
+SPACE = SweepSpace({"a": list(range(30)), "b": list(range(30)), "c": [0]})
+KPI_COLUMNS = [kpi for kpi, _ in G1 + G2]
+
+
+def evaluate(indices: np.ndarray, seeds: np.ndarray) -> pd.DataFrame:
+    """
+    Every KPI is low (ie. good) only when `a < 10`.
+    """
+    a = np.repeat(SPACE.digits(indices)[:, 0], N_RUNS)
+    kpi_df = pd.DataFrame({kpi: np.where(a < 10, 0.0, 1.0) for kpi in KPI_COLUMNS})
+    kpi_df["sweep_index"] = np.repeat(indices, N_RUNS)
+    return kpi_df
+
+
+def test_score_sweeps():
+    scores = score_sweeps(evaluate(np.array([0, 899]), np.arange(2)))
+    assert scores["mean"].tolist() == [8, 0]
+    assert scores["var"].tolist() == [0, 0]
+
+
+def test_refinement_priority():
+    evaluated = np.array([0, 31, 450, 899])
+    sweep_scores = pd.DataFrame({"mean": [0.0, 1.0, 4.0, 8.0], "var": [0.5, 0.0, 1.0, 2.0]},
+                                index=evaluated)
+    # Every candidate is its own nearest neighbour
+    priority = refinement_priority(SPACE, evaluated, sweep_scores, n_neighbours=1)
+    assert priority.tolist() == [0.5, 0.0, 1.0, 2.0]
+
+    # All the evaluated combinations are the neighbours of every candidate
+    candidates = np.arange(len(SPACE))
+    priority = refinement_priority(SPACE, candidates, sweep_scores, n_neighbours=10)
+    assert priority.shape == (len(SPACE),)
+    assert np.allclose(priority, np.std([0.0, 1.0, 4.0, 8.0]) + 0.875)
+
+
+def test_refines_around_boundary():
+    kpi_df = adaptive_sweep(SPACE, evaluate, initial_samples=30, batch_size=30,
+                            measurements_per_trajectory=5,
+                            runs_per_sweep=N_RUNS, max_measurements=10 * 150,
+                            rng=np.random.default_rng(0))
+    assert kpi_df["sweep_index"].nunique() == len(kpi_df) // N_RUNS == 150
+    assert kpi_df["batch"].max() == 4
+
+    refined = kpi_df.query("batch > 0").drop_duplicates("sweep_index")
+    a = SPACE.digits(refined["sweep_index"].to_numpy())[:, 0]
+    # Refinements are concentrated around a = 10, rather than uniform
+    assert np.mean(np.abs(a - 9.5) < 5) > 0.5
+
+
+def test_budget_in_seconds():
+    kpi_df = adaptive_sweep(SPACE, evaluate, initial_samples=10, batch_size=10,
+                            measurements_per_trajectory=5,
+                            runs_per_sweep=N_RUNS, max_seconds=0,
+                            rng=np.random.default_rng(0))
+    assert len(kpi_df) == 0
+
+    kpi_df = adaptive_sweep(SPACE, evaluate, initial_samples=10, batch_size=10,
+                            measurements_per_trajectory=5,
+                            runs_per_sweep=N_RUNS, max_seconds=60,
+                            max_measurements=10 * 25, rng=np.random.default_rng(0))
+    assert kpi_df["batch"].max() == 2
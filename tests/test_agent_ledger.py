@@ -0,0 +1,74 @@
+import pandas as pd
+from aztec_gddt.params import SINGLE_RUN_PARAMS, INITIAL_STATE
+from aztec_gddt.structure import AZTEC_MODEL_BLOCKS
+from aztec_gddt.utils import sim_run
+from aztec_gddt.utils.engine import iterate_trajectory
+from aztec_gddt.psuu.agent_ledger import AgentLedger, AGENT_LEDGER_FIELDS
+from aztec_gddt.psuu.kpis import KPIAccumulator, accumulated_kpis_to_trajectory_tensor
+from aztec_gddt.psuu.tensor_io import write_timestep_tensor, read_agent_ledger, read_timestep_tensor
+from aztec_gddt.psuu.tensor_transform import timestep_tensor_to_trajectory_tensor
+import pytest as pt
+
+N_TIMESTEPS = 60
+
+
+def sweep_params() -> dict:
+    params = {k: [v] for k, v in SINGLE_RUN_PARAMS.items()}
+    params["phase_duration_rollup_max_blocks"] = [3, 15]
+    return params
+
+
+@pt.fixture(scope="module")
+def sim_df() -> pd.DataFrame:
+    return sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, N_TIMESTEPS, 2,
+                   engine="native", agent_deltas=True)
+
+
+def test_agent_deltas_are_sparse(sim_df: pd.DataFrame):
+    assert "agents" not in sim_df.columns
+    n_agents = len(INITIAL_STATE["agents"])
+    initial = sim_df[sim_df.timestep == 0].agent_deltas
+    assert (initial.map(len) == n_agents * len(AGENT_LEDGER_FIELDS)).all()
+    later = sim_df[sim_df.timestep > 0].agent_deltas
+    assert later.map(len).sum() < len(later) * n_agents
+
+
+def test_agents_at(sim_df: pd.DataFrame):
+    ledger = AgentLedger.from_timestep_tensor(sim_df)
+    # The agents of every timestep, as they are on that timestep
+    params = {k: v[-1] for k, v in sweep_params().items()}
+    expected = {}
+    for state in iterate_trajectory(INITIAL_STATE, params, AZTEC_MODEL_BLOCKS, N_TIMESTEPS,
+                                    subset=1, run=2):
+        expected[state["timestep"]] = {str(a.uuid): {f: getattr(a, f) for f in AGENT_LEDGER_FIELDS}
+                                       for a in state["agents"].values()}
+
+    for timestep in (0, 1, N_TIMESTEPS // 2, N_TIMESTEPS):
+        agents = ledger.agents_at(timestep)
+        agents = agents[(agents.subset == 1) & (agents.run == 2)]
+        actual = agents.set_index("agent")[list(AGENT_LEDGER_FIELDS)].to_dict(orient="index")
+        assert actual == expected[timestep]
+    pd.testing.assert_frame_equal(ledger.snapshot, ledger.agents_at(0))
+    assert list(ledger.agents_at(5, fields=["balance"]).columns[-1:]) == ["balance"]
+
+
+def test_ledger_round_trip(sim_df: pd.DataFrame, tmp_path):
+    written = write_timestep_tensor(sim_df, str(tmp_path), basename="chunk-0")
+    assert any("agent_deltas" in f for f in written)
+    ledger = read_agent_ledger(str(tmp_path / "agent_deltas"))
+    pd.testing.assert_frame_equal(ledger.agents_at(N_TIMESTEPS),
+                                  AgentLedger.from_timestep_tensor(sim_df).agents_at(N_TIMESTEPS))
+
+    df = read_timestep_tensor(str(tmp_path / "timesteps"))
+    ledger_balance = ledger.agents_at(N_TIMESTEPS).groupby(["subset", "run"]).balance.sum()
+    final_balance = df[df.timestep == N_TIMESTEPS].set_index(["subset", "run"]).agents_balance
+    pd.testing.assert_series_equal(ledger_balance, final_balance, check_names=False)
+
+
+def test_kpis_from_agent_deltas(sim_df: pd.DataFrame):
+    accumulated_df = accumulated_kpis_to_trajectory_tensor(
+        sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, N_TIMESTEPS, 2,
+                engine="native", observer=KPIAccumulator))
+    pd.testing.assert_series_equal(
+        timestep_tensor_to_trajectory_tensor(sim_df).delta_total_revenue_agents,
+        accumulated_df.delta_total_revenue_agents)
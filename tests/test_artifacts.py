@@ -0,0 +1,80 @@
+from concurrent.futures import Future
+from threading import Event
+import pandas as pd
+import pytest as pt
+from aztec_gddt.psuu.artifacts import (ArtifactStore, LocalStore, MemoryStore, S3Store,
+                                       CONTENT_PREFIX, open_store)
+from aztec_gddt.psuu.upload import LocalFolderClient
+
+
+@pt.fixture(params=["local", "memory", "s3"])
+def store(request, tmp_path) -> ArtifactStore:
+    if request.param == "local":
+        return LocalStore(str(tmp_path / "store"))
+    elif request.param == "memory":
+        return MemoryStore()
+    else:
+        return S3Store("bucket", "runs", client_factory=lambda: LocalFolderClient(str(tmp_path / "s3")))
+
+
+def test_artifact_store(store: ArtifactStore, tmp_path):
+    assert not store.exists("a/b.txt")
+    assert isinstance(store.put_bytes("a/b.txt", b"b"), Future)
+    assert store.exists("a/b.txt")
+    assert store.get_bytes("a/b.txt") == b"b"
+
+    filename = tmp_path / "part.parquet"
+    pd.DataFrame({"x": [1, 2, 3]}).to_parquet(filename)
+    store.put_file("a/part.parquet", str(filename), delete=True).result()
+    store.flush()
+    assert not filename.exists()
+    assert store.read_parquet("a/part.parquet", columns=["x"]).x.tolist() == [1, 2, 3]
+    assert store.list("a/") == ["a/b.txt", "a/part.parquet"]
+
+    # Fingerprints change with the content
+    fingerprint = store.fingerprint("a/b.txt")
+    assert store.fingerprint("a/b.txt") == fingerprint
+    store.put_bytes("a/b.txt", b"c")
+    assert store.fingerprint("a/b.txt") != fingerprint
+
+    key = store.put_content(b"content", suffix=".txt")
+    assert key.startswith(f"{CONTENT_PREFIX}/") and key.endswith(".txt")
+    assert store.put_content(b"content", suffix=".txt") == key
+    assert store.get_bytes(key) == b"content"
+
+    store.delete("a/b.txt")
+    assert not store.exists("a/b.txt")
+    store.close()
+
+
+def test_open_store(tmp_path):
+    assert isinstance(open_store("memory://"), MemoryStore)
+    local = open_store(f"file://{tmp_path}")
+    assert isinstance(local, LocalStore) and local.root == tmp_path
+    assert isinstance(open_store(str(tmp_path)), LocalStore)
+
+
+def test_incomplete_store():
+    class ReadOnlyStore(ArtifactStore):
+        def get_bytes(self, key: str) -> bytes:
+            return b""
+
+    with pt.raises(TypeError):
+        ReadOnlyStore()
+
+
+def test_s3_bytes_are_uploaded_on_the_background(tmp_path):
+    release = Event()
+
+    class BlockedClient(LocalFolderClient):
+        def upload_fileobj(self, Fileobj, Bucket, Key, Config=None):
+            release.wait()
+            super().upload_fileobj(Fileobj, Bucket, Key, Config)
+
+    store = S3Store("bucket", "runs", client_factory=lambda: BlockedClient(str(tmp_path / "s3")))
+    future = store.put_bytes("a/b.txt", b"b")
+    assert not future.done()
+    release.set()
+    # Reads wait for the pending upload of their key
+    assert store.get_bytes("a/b.txt") == b"b"
+    store.close()
@@ -0,0 +1,53 @@
+import pickle
+import numpy as np
+from aztec_gddt.params import SINGLE_RUN_PARAMS, INITIAL_STATE, zero_timeseries, ALWAYS_FALSE_SERIES
+from aztec_gddt.structure import AZTEC_MODEL_BLOCKS
+from aztec_gddt.utils import sim_run
+from aztec_gddt.psuu.broadcast import Broadcast, BroadcastRef, resolve_params
+from aztec_gddt.psuu.scheduler import schedule_chunks
+from aztec_gddt.psuu.sweep import SweepSpace
+
+
+CENSORSHIP_DICT = {i: i % 2 == 0 for i in range(5000)}
+
+
+def sweep_params() -> dict:
+    params = {k: [v] for k, v in SINGLE_RUN_PARAMS.items()}
+    params["gas_fee_l1_time_series"] = [zero_timeseries]
+    params["censorship_series_builder"] = [ALWAYS_FALSE_SERIES, CENSORSHIP_DICT]
+    params["censorship_series_validator"] = [CENSORSHIP_DICT]
+    params["uncle_count"] = [0, 1]
+    return params
+
+
+def test_publish_params():
+    params = sweep_params()
+    with Broadcast() as broadcast:
+        published = broadcast.publish_params(params)
+        assert isinstance(published["gas_fee_l1_time_series"][0], BroadcastRef)
+        assert isinstance(published["censorship_series_validator"][0], BroadcastRef)
+        # Same objects are published once, and compact series are kept as they are
+        assert published["censorship_series_builder"][1] == published["censorship_series_validator"][0]
+        assert published["censorship_series_builder"][0] is ALWAYS_FALSE_SERIES
+        assert published["uncle_count"] == params["uncle_count"]
+        large_params = ["gas_fee_l1_time_series", "censorship_series_builder"]
+        assert (len(pickle.dumps([published[k] for k in large_params]))
+                < len(pickle.dumps([params[k] for k in large_params])) / 50)
+
+        resolved = resolve_params(published)
+        np.testing.assert_array_equal(resolved["gas_fee_l1_time_series"][0], zero_timeseries)
+        assert resolved["censorship_series_builder"] == params["censorship_series_builder"]
+    assert not broadcast.folder.exists()
+
+
+def run_chunk(i_chunk: int, sweep_params: dict) -> int:
+    df = sim_run(INITIAL_STATE, resolve_params(sweep_params), AZTEC_MODEL_BLOCKS, 20, 1,
+                 engine="native")
+    return len(df)
+
+
+def test_workers_resolve_references():
+    with Broadcast() as broadcast:
+        space = SweepSpace(broadcast.publish_params(sweep_params()))
+        results = list(schedule_chunks(space, run_chunk, np.arange(len(space)), n_jobs=2))
+    assert sum(n_rows for _, _, n_rows in results) == len(space) * 21
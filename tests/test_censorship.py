@@ -0,0 +1,67 @@
+from io import BytesIO
+import numpy as np
+import pandas as pd
+import pytest as pt
+from aztec_gddt.censorship import load_censorship_mask, CENSORSHIP_DATA_KEY
+from aztec_gddt.psuu.artifacts import LocalStore, MemoryStore
+from aztec_gddt.params import build_censor_series_from_role
+
+CENSORING_BUILDERS = ["beaverbuild.org", "Flashbots"]
+
+
+def censorship_data(n_blocks: int = 2_000, first_block: int = 100) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    builders = np.array(CENSORING_BUILDERS + ["Titan", "rsync-builder.xyz"])
+    return pd.DataFrame({
+        "block_number": np.arange(first_block, first_block + n_blocks),
+        "slot": np.arange(n_blocks) * 2,
+        "date": pd.date_range("2024-03-14", periods=n_blocks, freq="12s"),
+        "builder": rng.choice(builders, n_blocks),
+        "validator": rng.choice(builders, n_blocks),
+    })
+
+
+def test_same_series_as_params(tmp_path):
+    data = censorship_data()
+    source = MemoryStore()
+    data.to_parquet(buffer := BytesIO())
+    source.put_bytes(CENSORSHIP_DATA_KEY, buffer.getvalue())
+
+    mask = load_censorship_mask("builder", CENSORING_BUILDERS, source,
+                                min_block_number=0, cache=MemoryStore())
+    for start_block in (100, 513, 2_050):
+        expected = build_censor_series_from_role(data, "builder", CENSORING_BUILDERS,
+                                                 start_block, 200, start_time_is_block_no=True)
+        assert mask.series_from_block(start_block, 200) == expected
+    expected = build_censor_series_from_role(data, "builder", CENSORING_BUILDERS, 300, 200)
+    assert mask.series_from_position(300, 200) == expected
+
+
+def test_mask_is_cached(tmp_path):
+    source = LocalStore(str(tmp_path))
+    censorship_data().to_parquet(tmp_path / CENSORSHIP_DATA_KEY)
+    cache_folder = tmp_path / "cache"
+    cache = LocalStore(str(cache_folder))
+
+    mask = load_censorship_mask("builder", CENSORING_BUILDERS, source,
+                                min_block_number=0, cache=cache)
+    assert len(list(cache_folder.iterdir())) == 1
+    cached_mask = load_censorship_mask("builder", CENSORING_BUILDERS, source,
+                                       min_block_number=0, cache=cache)
+    np.testing.assert_array_equal(cached_mask.censored, mask.censored)
+    assert len(list(cache_folder.iterdir())) == 1
+
+    # Other censor lists and source files have their own entries
+    load_censorship_mask("builder", ["Titan"], source,
+                         min_block_number=0, cache=cache)
+    censorship_data(first_block=200).to_parquet(tmp_path / CENSORSHIP_DATA_KEY)
+    other_mask = load_censorship_mask("builder", CENSORING_BUILDERS, source,
+                                      min_block_number=0, cache=cache)
+    assert len(list(cache_folder.iterdir())) == 3
+    assert other_mask.block_numbers[0] == 200
+
+
+def test_missing_data(tmp_path):
+    with pt.raises(FileNotFoundError):
+        load_censorship_mask("builder", CENSORING_BUILDERS, LocalStore(str(tmp_path)),
+                             cache=MemoryStore())
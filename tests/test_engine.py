@@ -0,0 +1,161 @@
+import numpy as np
+import pandas as pd
+from aztec_gddt.params import SINGLE_RUN_PARAMS, INITIAL_STATE
+from aztec_gddt.structure import AZTEC_MODEL_BLOCKS
+from aztec_gddt.utils import sim_run
+from aztec_gddt.types import SelectionPhase, CensorshipSeries
+from aztec_gddt.psuu.sweep import SweepSpace
+import pytest as pt
+
+ID_COLS = ["simulation", "subset", "run", "timestep"]
+
+
+def sweep_params() -> dict:
+    params = {k: [v] for k, v in SINGLE_RUN_PARAMS.items()}
+    params["uncle_count"] = [0, 1]
+    return params
+
+
+@pt.fixture(scope="module")
+def cadcad_df() -> pd.DataFrame:
+    return sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, 30, 2,
+                   exec_mode="single", supress_cadCAD_print=True)
+
+
+@pt.fixture(scope="module")
+def native_df() -> pd.DataFrame:
+    return sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, 30, 2,
+                   engine="native")
+
+
+def test_same_layout_as_cadcad(cadcad_df: pd.DataFrame, native_df: pd.DataFrame):
+    assert list(native_df.columns) == list(cadcad_df.columns)
+    assert (native_df.dtypes == cadcad_df.dtypes).all()
+    pd.testing.assert_frame_equal(native_df[ID_COLS], cadcad_df[ID_COLS])
+
+
+def test_time_is_increasing(native_df: pd.DataFrame):
+    for _, gdf in native_df.groupby(["simulation", "subset", "run"]):
+        assert gdf.time_l1.is_monotonic_increasing
+        assert gdf.timestep.tolist() == list(range(31))
+
+
+def test_runs_are_independent(native_df: pd.DataFrame):
+    initial_agents = native_df.query("timestep == 0").agents.tolist()
+    assert len({id(agents) for agents in initial_agents}) == len(initial_agents)
+
+
+def test_params_are_reusable(native_df: pd.DataFrame):
+    assert callable(SINGLE_RUN_PARAMS["gas_estimators"].proposal)
+    df = sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, 5, 1,
+                 engine="native")
+    assert len(df) == 2 * 6
+
+
+def test_evict_settled_transactions():
+    params = sweep_params()
+    params["fp_transaction_retention"] = ["Evict Settled"]
+    df = sim_run(INITIAL_STATE, params, AZTEC_MODEL_BLOCKS, 300, 1,
+                 engine="native")
+    for _, gdf in df.groupby(["simulation", "subset", "run"]):
+        last_ledger = gdf.transactions.iloc[-1]
+        settled = {p.uuid for p in gdf.current_process.dropna()
+                   if p.phase in (SelectionPhase.finalized, SelectionPhase.skipped)}
+        assert {r.process for r in last_ledger.rollups} <= settled
+        assert len(last_ledger.rollups) > 0
+        # Only the transactions of the ongoing process are kept
+        last_process = gdf.current_process.iloc[-1].uuid
+        assert {last_ledger.process_of(tx) for tx in last_ledger} <= {last_process}
+
+
+@pt.mark.parametrize("engine", ["native", "cadCAD"])
+def test_seeded_runs_are_reproducible(engine: str):
+    params = sweep_params()
+    dfs = [sim_run(INITIAL_STATE, params, AZTEC_MODEL_BLOCKS, 100, 2,
+                   engine=engine, supress_cadCAD_print=True) for _ in range(2)]
+    cols = ["time_l1", "finalized_blocks_count", "cumm_block_rewards"]
+    pd.testing.assert_frame_equal(dfs[0][cols], dfs[1][cols])
+
+    params["random_seed"] = [1]
+    other_df = sim_run(INITIAL_STATE, params, AZTEC_MODEL_BLOCKS, 100, 2,
+                       engine=engine, supress_cadCAD_print=True)
+    assert not other_df[cols].equals(dfs[0][cols])
+
+
+def test_same_trajectories_as_cadcad(cadcad_df: pd.DataFrame, native_df: pd.DataFrame):
+    # Both engines draw from the stream of the seed and the run of each trajectory
+    cols = ["time_l1", "finalized_blocks_count", "total_rewards_provers", "token_supply"]
+    pd.testing.assert_frame_equal(native_df[cols], cadcad_df[cols])
+
+
+def run_chunked(space: SweepSpace, chunk_size: int, engine: str) -> pd.DataFrame:
+    """
+    Final state of every trajectory, by position of its combination on the sweep.
+    """
+    dfs = []
+    for i_chunk, chunk in enumerate(space.iter_chunks(chunk_size)):
+        df = sim_run(INITIAL_STATE, chunk, AZTEC_MODEL_BLOCKS, 60, 2, engine=engine,
+                     supress_cadCAD_print=True)
+        df = df[df.timestep == df.timestep.max()].copy()
+        df["position"] = i_chunk * chunk_size + df["subset"]
+        dfs.append(df)
+    cols = ["time_l1", "finalized_blocks_count", "cumm_block_rewards"]
+    return pd.concat(dfs).set_index(["position", "run"]).sort_index()[cols]
+
+
+@pt.mark.parametrize("engine", ["native", "batched", "cadCAD"])
+def test_trajectories_do_not_depend_on_chunking(engine: str):
+    params = sweep_params()
+    params["phase_duration_rollup_max_blocks"] = [3, 15]
+    space = SweepSpace(params)
+    assert len(space) == 4
+    expected = run_chunked(space, 4, engine)
+    pd.testing.assert_frame_equal(run_chunked(space, 1, engine), expected)
+    pd.testing.assert_frame_equal(run_chunked(space, 3, engine), expected)
+
+
+@pt.fixture(scope="module")
+def batched_df() -> pd.DataFrame:
+    return sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, 100, 4,
+                   engine="batched")
+
+
+def test_batched_layout(batched_df: pd.DataFrame):
+    native_df = sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, 100, 4,
+                        engine="native")
+    pd.testing.assert_frame_equal(batched_df[ID_COLS], native_df[ID_COLS])
+    assert batched_df.query("timestep == 0").process_phase.isna().all()
+    assert batched_df.query("timestep > 0").process_phase.notna().all()
+
+
+def test_batched_runs(batched_df: pd.DataFrame):
+    for _, gdf in batched_df.groupby(["simulation", "subset", "run"]):
+        assert gdf.time_l1.is_monotonic_increasing
+        assert gdf.finalized_blocks_count.is_monotonic_increasing
+        assert gdf.process_id.dropna().is_monotonic_increasing
+        assert gdf.finalized_blocks_count.iloc[-1] > 0
+    # Runs do not share their random draws
+    last_times = batched_df.groupby(["subset", "run"]).time_l1.last()
+    assert last_times.nunique() > 1
+
+
+def test_batched_is_censored_as_native(batched_df: pd.DataFrame):
+    native_df = sim_run(INITIAL_STATE, sweep_params(), AZTEC_MODEL_BLOCKS, 100, 4,
+                        engine="native")
+    # NOTE: `is_censored` holds `check_for_censorship`, True if uncensored
+    for df in (batched_df, native_df):
+        assert df.query("timestep > 0").is_censored.astype(bool).all()
+
+    params = sweep_params()
+    params["censorship_series_builder"] = [CensorshipSeries.from_values(np.ones(10_000, dtype=bool))]
+    for engine in ("native", "batched"):
+        df = sim_run(INITIAL_STATE, params, AZTEC_MODEL_BLOCKS, 30, 2, engine=engine)
+        assert not df.query("timestep > 0").is_censored.astype(bool).any()
+
+
+def test_estimators_are_labelled(cadcad_df: pd.DataFrame, native_df: pd.DataFrame):
+    for df in (cadcad_df, native_df):
+        assert df.gas_estimators.map(id).nunique() == 1
+        assert isinstance(df.gas_estimators.iloc[0].proposal, str)
+        assert isinstance(df.tx_estimators.iloc[0].transaction_count, str)
+    assert callable(SINGLE_RUN_PARAMS["tx_estimators"].transaction_count)
@@ -0,0 +1,25 @@
+from pathlib import Path
+import os
+import subprocess
+import sys
+import pytest as pt
+import aztec_gddt
+
+ROOT = str(Path(aztec_gddt.__file__).parent.parent)
+
+HEAVY_MODULES = ["matplotlib", "seaborn", "sklearn", "boto3", "cadCAD"]
+
+
+@pt.mark.parametrize("module", ["aztec_gddt", "aztec_gddt.experiment", "aztec_gddt.__main__"])
+def test_no_heavy_imports(module: str):
+    code = (f"import sys, {module}; "
+            f"print([m for m in {HEAVY_MODULES!r} if m in sys.modules])")
+    output = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+def test_no_logging_setup_on_import(tmp_path):
+    subprocess.run([sys.executable, "-c", "import aztec_gddt.experiment"],
+                   cwd=tmp_path, check=True, env={**os.environ, "PYTHONPATH": ROOT})
+    assert not (tmp_path / "cadcad.log").exists()
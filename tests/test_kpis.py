@@ -0,0 +1,39 @@
+from typing import Callable
+import pandas as pd
+import aztec_gddt.metrics as m
+from aztec_gddt.plot_tools import extract_df
+from aztec_gddt.psuu.tensor_transform import KPIs
+from aztec_gddt.psuu.kpis import (compute_trajectory_kpis, KPIAccumulator,
+                                  accumulated_kpis_to_trajectory_tensor)
+import pytest as pt
+
+
+@pt.fixture
+def sweep_params(model_sweep: Callable[..., dict]) -> dict:
+    return model_sweep(phase_duration_rollup_max_blocks=[1, 15],
+                       phase_duration_reveal_max_blocks=[1, 3])
+
+
+@pt.mark.parametrize("engine", ["native", "batched"])
+def test_same_kpis_as_metrics(engine: str, sweep_params: dict, run_model: Callable[..., pd.DataFrame]):
+    sim_df = run_model(sweep_params, 150, 3, engine=engine)
+    df_to_use = m.process_df(sim_df)
+
+    expected_df = extract_df(df_to_use, trajectory_kpis=KPIs)
+    kpi_df = compute_trajectory_kpis(df_to_use)
+    pd.testing.assert_frame_equal(kpi_df, expected_df, check_exact=True)
+
+
+def test_accumulated_kpis(sweep_params: dict, run_model: Callable[..., pd.DataFrame]):
+    sim_df = run_model(sweep_params, 150, 3)
+    kpi_df = compute_trajectory_kpis(m.process_df(sim_df))
+    df = run_model(sweep_params, 150, 3, observer=KPIAccumulator)
+    accumulated_df = accumulated_kpis_to_trajectory_tensor(df)
+    assert len(accumulated_df) == len(kpi_df)
+    assert kpi_df.delta_total_revenue_agents.std() > 0
+    pd.testing.assert_frame_equal(accumulated_df, kpi_df)
+
+
+def test_observers_require_native_engine(sweep_params: dict, run_model: Callable[..., pd.DataFrame]):
+    with pt.raises(ValueError):
+        run_model(sweep_params, 5, 1, engine="batched", observer=KPIAccumulator)
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest as pt
+from aztec_gddt.experiment import psuu_exploratory_run
+from aztec_gddt.psuu.artifacts import LocalStore, MemoryStore
+from aztec_gddt.psuu.manifest import RunManifest, MANIFEST_FILENAME
+from aztec_gddt.psuu.tensor_io import write_trajectory_tensor, read_trajectory_tensor
+
+CONFIG = {"seed": 2 ** 100, "sweep_design": "lhs", "N_samples": 2}
+
+
+def write_chunk(manifest: RunManifest, i_chunk: int, indices: list[int]) -> None:
+    path = write_trajectory_tensor(pd.DataFrame({"subset": range(len(indices))}),
+                                   str(manifest.output_path), basename=f"trajectory_tensor-{i_chunk}")
+    manifest.record_chunk(i_chunk, np.array(indices), [path])
+
+
+def test_resume(tmp_path):
+    manifest = RunManifest.create(str(tmp_path), CONFIG, np.array([7, 3, 5, 1, 9]))
+    write_chunk(manifest, 0, [3, 1])
+    write_chunk(manifest, 1, [9])
+    # Interrupted while writing chunk 2
+    (tmp_path / "trajectories" / "trajectory_tensor-2.parquet").write_bytes(b"PAR1")
+    with open(tmp_path / MANIFEST_FILENAME, "a") as fid:
+        fid.write('{"kind": "chunk", "chu')
+
+    with pt.raises(FileExistsError):
+        RunManifest.create(str(tmp_path), CONFIG, np.array([0]))
+
+    resumed = RunManifest.load(str(tmp_path))
+    assert resumed.config == CONFIG
+    resumed.check_config(CONFIG)
+    with pt.raises(ValueError):
+        resumed.check_config({**CONFIG, "N_samples": 3})
+
+    resumed.validate()
+    resumed.remove_orphans()
+    assert not (tmp_path / "trajectories" / "trajectory_tensor-2.parquet").exists()
+    np.testing.assert_array_equal(resumed.remaining_positions(), [0, 2])
+    assert resumed.next_chunk() == 2
+    write_chunk(resumed, 2, [7])
+    assert sorted(RunManifest.load(str(tmp_path)).chunks) == [0, 1, 2]
+
+    # Chunks with invalid outputs are run again
+    (tmp_path / "trajectories" / "trajectory_tensor-1.parquet").write_bytes(b"")
+    resumed = RunManifest.load(str(tmp_path))
+    resumed.validate()
+    np.testing.assert_array_equal(resumed.remaining_positions(), [2, 4])
+    assert resumed.next_chunk() == 3
+
+
+def test_resumed_run_is_the_same(censorship_source: MemoryStore, tmp_path, monkeypatch):
+    # The censorship mask is cached on the working directory
+    monkeypatch.chdir(tmp_path)
+    kwargs = dict(N_sweep_samples=60, N_samples=2, N_timesteps=30, N_jobs=2,
+                  parallelize_jobs=True, supress_cadCAD_print=True, cloud_stream=False,
+                  engine="native", stream_kpis=True, seed=5, aux_data_store=censorship_source)
+
+    def trajectories(output_path: str) -> pd.DataFrame:
+        df = read_trajectory_tensor(output_path).drop(columns=["simulation", "subset"])
+        return df.sort_values(["sweep_index", "run"], ignore_index=True)
+
+    psuu_exploratory_run(output_path=str(tmp_path / "straight"), **kwargs)
+
+    psuu_exploratory_run(output_path=str(tmp_path / "resumed"), **kwargs)
+    # Interrupted after its first chunks, so that the resumed chunks
+    # are shaped differently
+    lines = (tmp_path / "resumed" / MANIFEST_FILENAME).read_text().splitlines()
+    assert len(lines) > 3
+    (tmp_path / "resumed" / MANIFEST_FILENAME).write_text("\n".join(lines[:3]) + "\n")
+    psuu_exploratory_run(output_path=str(tmp_path / "resumed"), resume=True, **kwargs)
+
+    expected = trajectories(str(tmp_path / "straight"))
+    assert expected.sweep_index.nunique() == 60
+    pd.testing.assert_frame_equal(trajectories(str(tmp_path / "resumed")), expected)
+
+
+@pt.mark.parametrize("parallelize_jobs", [False, True])
+def test_chunks_are_published(parallelize_jobs: bool, censorship_source: MemoryStore,
+                              tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    psuu_exploratory_run(N_sweep_samples=30, N_samples=1, N_timesteps=30, N_jobs=2,
+                         parallelize_jobs=parallelize_jobs, supress_cadCAD_print=True, engine="native",
+                         output_path=str(tmp_path / "output"), timestep_tensor_prefix="timestep_tensor",
+                         seed=5, aux_data_store=censorship_source,
+                         artifact_store=LocalStore(str(tmp_path / "store")), base_folder="run")
+    # The Timestep Tensors are moved to the store, next to the Trajectory Tensor
+    assert list((tmp_path / "store" / "run" / "timesteps").glob("*/timestep_tensor-*.parquet"))
+    assert not list((tmp_path / "output" / "timesteps").glob("*/*.parquet"))
+    published = read_trajectory_tensor(str(tmp_path / "store" / "run"))
+    assert len(published) == 30
+    pd.testing.assert_frame_equal(published, read_trajectory_tensor(str(tmp_path / "output")))
@@ -6,13 +6,14 @@ import pandera as pa
 
 
 @pt.fixture(scope="module", params=[(10, 2, 1_000), (250, 2, 20)])
-def sim_df(request) -> pd.DataFrame:
+def sim_df(request, censorship_source) -> pd.DataFrame:
     (N_sweep_samples, N_samples, N_timesteps) = request.param
     return psuu_exploratory_run(N_sweep_samples=N_sweep_samples,
                                 N_samples=N_samples,
                                 N_timesteps=N_timesteps,
                                 parallelize_jobs=False,
-                                supress_cadCAD_print=True)  # type: ignore
+                                supress_cadCAD_print=True,
+                                aux_data_store=censorship_source)  # type: ignore
 
 def test_agents_stake_not_negative(sim_df: pd.DataFrame):
     _df = sim_df.set_index(["subset", "run", "timestep"])
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from aztec_gddt.scenarios import gas_fee_time_series, shock_window
+from aztec_gddt import params
+
+
+def test_gas_fee_time_series():
+    steady = gas_fee_time_series("steady", "l1", 2_000, seed=1, horizon=1_000)
+    assert gas_fee_time_series("steady", "l1", 2_000, seed=1, horizon=1_000) is steady
+    assert not steady.flags.writeable
+    assert steady.min() >= 10
+    assert not np.array_equal(steady, gas_fee_time_series("steady", "l1", 2_000, seed=2))
+    assert not np.array_equal(steady, gas_fee_time_series("steady", "blob", 2_000, seed=1))
+
+    # Shocks are only applied on the middle of the horizon
+    shock = gas_fee_time_series("single_shock", "l1", 2_000, seed=1, horizon=1_000)
+    window = shock_window(1_000)
+    assert (window.start, window.stop) == (250, 750)
+    np.testing.assert_array_equal(shock[window] - steady[window], 150)
+    np.testing.assert_array_equal(shock[750:], steady[750:])
+    intermittent = gas_fee_time_series("intermittent_shock", "l1", 2_000, seed=1, horizon=1_000)
+    assert (intermittent[window] >= steady[window] + 1).all()
+    np.testing.assert_array_equal(intermittent[:250], steady[:250])
+
+    # Series longer than the default ones are available on demand
+    assert len(gas_fee_time_series("zero", "blob", 100 * params.TIMESTEPS)) == 100 * params.TIMESTEPS
+
+    with pytest.raises(ValueError):
+        gas_fee_time_series("unknown", "l1", 10)
+
+
+def test_lazy_params():
+    assert params.GAS_FEE_L1_TIME_SERIES_LIST[-1] is params.SINGLE_RUN_PARAMS["gas_fee_l1_time_series"]
+    assert len(params.zero_timeseries) == params.L1_BUFFER * params.TIMESTEPS
+    with pytest.raises(AttributeError):
+        params.unknown_time_series
@@ -0,0 +1,81 @@
+from time import sleep
+from typing import Callable
+import numpy as np
+import pandas as pd
+from aztec_gddt.psuu.sweep import SweepSpace
+from aztec_gddt.psuu.scheduler import CostModel, schedule_chunks
+import pytest as pt
+
+SPACE = SweepSpace({"cost": [0.0, 0.01], "other": list(range(20))})
+
+
+def run_chunk(i_chunk: int, sweep_params: dict) -> list:
+    sleep(sum(sweep_params["cost"]))
+    return sweep_params["random_seed"]
+
+
+def test_cost_model():
+    model = CostModel(SPACE)
+    assert model.predict(np.arange(4)).tolist() == [1, 1, 1, 1]
+    model.update(np.array([0, 1]), 2.0)
+    model.update(np.array([20, 21]), 10.0)
+    # `cost` is the first param, so that it is the slowest to vary
+    predicted = model.predict(np.array([2, 22]))
+    assert predicted[1] > predicted[0]
+
+
+@pt.mark.parametrize("n_jobs", [1, 2])
+def test_every_combination_runs_once(n_jobs: int):
+    indices = np.arange(len(SPACE))
+    seeds = 100 + indices
+    results = list(schedule_chunks(SPACE, run_chunk, indices, seeds,
+                                   n_jobs=n_jobs, max_chunk_size=8))
+    assert sorted(i_chunk for i_chunk, _, _ in results) == list(range(len(results)))
+    chunk_indices = np.concatenate([chunk for _, chunk, _ in results])
+    assert sorted(chunk_indices) == indices.tolist()
+    for _, chunk, result in results:
+        assert result == (100 + chunk).tolist()
+
+
+def test_chunks_are_drawn_from_the_rng():
+    # Later chunks also depend on the measured costs
+    def first_chunk(seed: int) -> list:
+        _, chunk, _ = next(schedule_chunks(SPACE, run_chunk, np.arange(len(SPACE)), n_jobs=1,
+                                           max_chunk_size=8, rng=np.random.default_rng(seed)))
+        return chunk.tolist()
+
+    assert first_chunk(1) == first_chunk(1)
+    assert first_chunk(1) != first_chunk(2)
+
+
+def test_expensive_first_and_shrinking_chunks():
+    results = list(schedule_chunks(SPACE, run_chunk, np.arange(len(SPACE)),
+                                   n_jobs=1, max_chunk_size=8, rng=np.random.default_rng(0)))
+    sizes = [len(chunk) for _, chunk, _ in results]
+    assert sizes[0] == 8 and sizes[-1] == 1
+    # Once measured, the costly combinations tend to be run first
+    later = np.concatenate([chunk for _, chunk, _ in results[1:]])
+    costly = SPACE.digits(later)[:, 0] == 1
+    rank = np.arange(len(later))
+    assert rank[costly].mean() < rank[~costly].mean()
+
+
+def test_results_do_not_depend_on_chunk_sizes(model_sweep: Callable[..., dict],
+                                              run_model_kpis: Callable[..., pd.DataFrame]):
+    space = SweepSpace(model_sweep(phase_duration_rollup_max_blocks=[1, 3, 15],
+                                   phase_duration_reveal_max_blocks=[1, 3]))
+    indices = np.arange(len(space))
+
+    def run_model_chunk(i_chunk: int, sweep_params: dict) -> pd.DataFrame:
+        return run_model_kpis(sweep_params, 50, 2)
+
+    def run_sweep(max_chunk_size: int) -> pd.DataFrame:
+        kpi_dfs = [df for _, _, df in schedule_chunks(space, run_model_chunk, indices, n_jobs=1,
+                                                       max_chunk_size=max_chunk_size)]
+        kpi_df = pd.concat(kpi_dfs).drop(columns=["simulation", "subset"])
+        return kpi_df.sort_values(["sweep_index", "run"], ignore_index=True)
+
+    expected = run_sweep(len(space))
+    assert expected.sweep_index.nunique() == len(space)
+    for max_chunk_size in (1, 4):
+        pd.testing.assert_frame_equal(run_sweep(max_chunk_size), expected)
@@ -0,0 +1,50 @@
+from typing import Callable
+import numpy as np
+import pandas as pd
+from aztec_gddt.psuu.sequential import converged_sweeps, sequential_monte_carlo
+from aztec_gddt.psuu.sweep import SweepSpace
+from aztec_gddt.psuu.tensor_transform import KPIs
+
+
+def noisy_evaluate(indices: np.ndarray, seeds: np.ndarray, n_runs: int) -> pd.DataFrame:
+    """
+    Combination 0 is deterministic, and the others have a noise which
+    grows with their index.
+    """
+    rows = []
+    for index, seed in zip(indices, seeds):
+        rng = np.random.default_rng(seed)
+        for run in range(1, n_runs + 1):
+            rows.append({kpi: 1.0 + index * rng.normal() for kpi in KPIs}
+                        | {"sweep_index": index, "run": run})
+    return pd.DataFrame(rows)
+
+
+def test_converged_sweeps():
+    kpi_df = noisy_evaluate(np.array([0, 1]), np.array([0, 1]), 5)
+    assert converged_sweeps(kpi_df, rtol=0.05, atol=1e-3).tolist() == [True, False]
+    kpi_df.loc[kpi_df.sweep_index == 0, "proportion_skipped"] = np.nan
+    assert converged_sweeps(kpi_df, rtol=0.05, atol=1e-3).tolist() == [True, False]
+
+
+def test_runs_are_added_where_noisy():
+    kpi_df = sequential_monte_carlo(noisy_evaluate, np.array([0, 1, 5]), np.arange(3),
+                                    min_runs=3, max_runs=12, rtol=0.05)
+    runs = kpi_df.groupby("sweep_index").run.agg(["count", "max", "nunique"])
+    assert runs.loc[0].tolist() == [3, 3, 3]
+    assert runs.loc[5].tolist() == [12, 12, 12]
+
+
+def test_with_the_model(model_sweep: Callable[..., dict],
+                        run_model_kpis: Callable[..., pd.DataFrame]):
+    space = SweepSpace(model_sweep(phase_duration_rollup_max_blocks=[1, 15]))
+
+    def evaluate(indices: np.ndarray, seeds: np.ndarray, n_runs: int) -> pd.DataFrame:
+        sweep_params = next(space.iter_chunks(len(indices), indices, seeds))
+        return run_model_kpis(sweep_params, 100, n_runs)
+
+    kpi_df = sequential_monte_carlo(evaluate, np.arange(len(space)), np.arange(len(space)),
+                                    min_runs=2, max_runs=6, rtol=0.01)
+    assert set(kpi_df.sweep_index) == {0, 1}
+    assert kpi_df.groupby("sweep_index").run.nunique().max() == 6
+    assert not kpi_df.duplicated(["sweep_index", "run"]).any()
@@ -0,0 +1,59 @@
+import numpy as np
+from cadCAD.tools.preparation import sweep_cartesian_product  # type: ignore
+from aztec_gddt.psuu.sweep import SweepSpace, SWEEP_DESIGNS, resolve_inf_durations
+import pytest as pt
+
+SWEEP_PARAMS = dict(
+    phase_duration_reveal_min_blocks=[0, float("inf")],
+    phase_duration_reveal_max_blocks=[3, 24],
+    censorship_series_builder=[{0: True}, {0: False}, {}],
+    label=["a"],
+)
+
+
+def test_same_order_as_cartesian_product():
+    space = SweepSpace(SWEEP_PARAMS)
+    assert len(space) == 12
+    assert space.decode(np.arange(len(space))) == sweep_cartesian_product(SWEEP_PARAMS)
+
+
+def test_chunks():
+    space = SweepSpace(SWEEP_PARAMS)
+    chunks = list(space.iter_chunks(5))
+    assert [len(c["label"]) for c in chunks] == [5, 5, 2]
+    assert sum((c["random_seed"] for c in chunks), []) == list(range(12))
+    assert sum((c["sweep_index"] for c in chunks), []) == list(range(12))
+
+    expected = resolve_inf_durations(sweep_cartesian_product(SWEEP_PARAMS))
+    assert sum((c["phase_duration_reveal_min_blocks"] for c in chunks), []) \
+        == expected["phase_duration_reveal_min_blocks"]
+    assert set(expected["phase_duration_reveal_min_blocks"]) == {0, 3, 24}
+
+
+def test_sampling():
+    space = SweepSpace(SWEEP_PARAMS)
+    indices = space.sample_indices(7, np.random.default_rng(0))
+    assert len(set(indices)) == 7
+    assert set(indices) <= set(range(12))
+    assert len(space.sample_indices(-1)) == 12
+
+    big_space = SweepSpace({f"p{i}": list(range(10)) for i in range(15)})
+    indices = big_space.sample_indices(100, np.random.default_rng(0))
+    chunk = next(big_space.iter_chunks(100, indices))
+    assert len(chunk["p0"]) == 100
+
+
+@pt.mark.parametrize("design", SWEEP_DESIGNS)
+def test_designs_draw_grid_combinations(design: str):
+    sweep_params = {**SWEEP_PARAMS, "uncle_count": list(range(20))}
+    space = SweepSpace(sweep_params)
+    indices = space.sample_indices(16, np.random.default_rng(0), design=design)
+    assert len(set(indices)) == len(indices) > 8
+    assert set(indices) <= set(range(len(space)))
+
+
+def test_lhs_covers_every_value():
+    space = SweepSpace({"a": list(range(10)), "b": list(range(10)), "c": [0]})
+    indices = space.sample_indices(10, np.random.default_rng(0), design="lhs")
+    chunk = space.decode(indices)
+    assert sorted(chunk["a"]) == sorted(chunk["b"]) == list(range(10))
@@ -0,0 +1,138 @@
+from pathlib import Path
+from typing import Callable
+import numpy as np
+import pandas as pd
+from aztec_gddt.params import INITIAL_STATE
+from aztec_gddt.psuu.tensor_io import (write_timestep_tensor, read_timestep_tensor,
+                                       write_trajectory_tensor, commit_trajectory_tensor,
+                                       read_trajectory_tensor, _encode_param)
+from aztec_gddt.psuu.tensor_transform import (timestep_tensor_to_trajectory_tensor,
+                                              timestep_file_to_trajectory,
+                                              iter_timestep_trajectories,
+                                              process_timestep_files_to_dataset,
+                                              process_timestep_files_to_csv,
+                                              get_timestep_files_from_info)
+import pytest as pt
+
+
+@pt.fixture(scope="module")
+def sweep_params(model_sweep: Callable[..., dict]) -> dict:
+    return model_sweep(phase_duration_rollup_max_blocks=[3, 15])
+
+
+@pt.fixture(scope="module")
+def sim_df(sweep_params: dict, run_model: Callable[..., pd.DataFrame]) -> pd.DataFrame:
+    return run_model(sweep_params, 100, 2)
+
+
+def test_write_timestep_tensor(sim_df: pd.DataFrame, tmp_path):
+    written = write_timestep_tensor(sim_df, str(tmp_path), basename="chunk-0")
+    assert len(written) == 2
+
+    df = read_timestep_tensor(str(tmp_path / "timesteps"))
+    assert len(df) == len(sim_df)
+    assert df.process_phase.dtype == "Int8"
+    assert df.process_phase.isna().sum() == (sim_df.current_process.isna()).sum()
+    assert (df.time_l1.to_numpy() == sim_df.time_l1.to_numpy()).all()
+    assert isinstance(df.gas_estimators.dtype, pd.CategoricalDtype)
+
+    agents_df = read_timestep_tensor(str(tmp_path / "agents"), columns=["agent", "balance"])
+    assert len(agents_df) == len(sim_df) * len(INITIAL_STATE["agents"])
+
+
+def test_agents_are_snapshots(sim_df: pd.DataFrame, sweep_params: dict,
+                              run_model: Callable[..., pd.DataFrame], tmp_path):
+    write_timestep_tensor(sim_df, str(tmp_path), basename="chunk-0")
+    df = read_timestep_tensor(str(tmp_path / "timesteps"))
+    # The balances change along a trajectory, rather than all being the final ones
+    assert (df.groupby(["subset", "run"]).agents_balance.nunique() > 1).all()
+
+    agents_df = read_timestep_tensor(str(tmp_path / "agents"), columns=["run", "timestep", "balance"])
+    final_timestep = agents_df.timestep == agents_df.timestep.max()
+    assert agents_df[~final_timestep].balance.to_numpy().tolist() != \
+        agents_df[final_timestep].balance.to_numpy().tolist()
+
+    deltas_df = run_model(sweep_params, 100, 2, agent_deltas=True)
+    write_timestep_tensor(deltas_df, str(tmp_path / "deltas"), basename="chunk-0")
+    np.testing.assert_array_equal(
+        df.agents_balance.to_numpy(),
+        read_timestep_tensor(str(tmp_path / "deltas" / "timesteps")).agents_balance.to_numpy())
+
+
+def test_param_labels_are_stable():
+    series = pd.Series([np.arange(3), np.arange(3), {"a": 1}], name="param")
+    labels = _encode_param(series)
+    # Equal values get the same label, on every call, no matter their identity
+    assert labels[0] == labels[1] != labels[2]
+    assert list(_encode_param(pd.Series([{"a": 1}, np.arange(3)], name="param"))) \
+        == [labels[2], labels[0]]
+
+
+def test_kpis_from_parquet(sim_df: pd.DataFrame, tmp_path):
+    write_timestep_tensor(sim_df, str(tmp_path), basename="chunk-0")
+    (path,) = get_timestep_files_from_info(tmp_path, "chunk")
+    pd.testing.assert_frame_equal(timestep_file_to_trajectory(str(path)),
+                                  timestep_tensor_to_trajectory_tensor(sim_df))
+
+
+def test_trajectory_tensor_dataset(sim_df: pd.DataFrame, tmp_path):
+    agg_df = timestep_tensor_to_trajectory_tensor(sim_df)
+    with pt.raises(FileNotFoundError):
+        read_trajectory_tensor(str(tmp_path))
+
+    for i_chunk, chunk_df in agg_df.groupby("run"):
+        write_trajectory_tensor(chunk_df, str(tmp_path), basename=f"trajectory_tensor-{i_chunk}")
+    # Uncommitted parts can already be read
+    assert len(read_trajectory_tensor(str(tmp_path))) == len(agg_df)
+
+    # A part whose parameter is a float on this chunk only
+    float_df = agg_df.reset_index().head(1).assign(run=0, daily_block_reward=0.5)
+    write_trajectory_tensor(float_df, str(tmp_path), basename="trajectory_tensor-0")
+    written = commit_trajectory_tensor(str(tmp_path))
+    assert [Path(f).name for f in written] == ["trajectory_tensor-1.parquet",
+                                               "trajectory_tensor-2.parquet",
+                                               "_metadata"]
+
+    df = read_trajectory_tensor(str(tmp_path))
+    assert len(df) == len(agg_df) + 1
+    assert df.daily_block_reward.dtype == "float64"
+    pd.testing.assert_frame_equal(
+        df[df.run > 0].sort_values("run", ignore_index=True),
+        agg_df.reset_index().sort_values("run", ignore_index=True).astype({"daily_block_reward": float}))
+
+    df = read_trajectory_tensor(str(tmp_path),
+                                columns=["run", "proportion_race_mode"],
+                                filters=[("run", "==", 2)])
+    assert list(df.columns) == ["run", "proportion_race_mode"]
+    assert (df.run == 2).all() and len(df) == (agg_df.reset_index().run == 2).sum()
+
+    # Parts written after the commit are only read once committed
+    write_trajectory_tensor(float_df.assign(run=3), str(tmp_path), basename="trajectory_tensor-3")
+    assert len(read_trajectory_tensor(str(tmp_path))) == len(agg_df) + 1
+    commit_trajectory_tensor(str(tmp_path))
+    assert len(read_trajectory_tensor(str(tmp_path))) == len(agg_df) + 2
+
+
+def test_streamed_trajectory_tensor(sim_df: pd.DataFrame, tmp_path):
+    write_timestep_tensor(sim_df, str(tmp_path), basename="chunk-0")
+    (path,) = get_timestep_files_from_info(tmp_path, "chunk")
+    # Batches which split the trajectories
+    batches = list(iter_timestep_trajectories(str(path), batch_rows=30))
+    assert sum(len(df) for df in batches) == len(sim_df)
+    assert all(df.groupby(["subset", "run"]).ngroups == 1 for df in batches)
+    pd.testing.assert_frame_equal(timestep_file_to_trajectory(str(path), batch_rows=30),
+                                  timestep_tensor_to_trajectory_tensor(sim_df))
+
+    filenames = process_timestep_files_to_dataset([str(path)], str(tmp_path / "output"),
+                                                  processes=2, batch_rows=30)
+    assert [Path(f).name for f in filenames] == ["chunk-0.parquet", "_metadata"]
+    assert len(read_trajectory_tensor(str(tmp_path / "output"))) == sim_df.groupby(["subset", "run"]).ngroups
+
+
+def test_deprecated_csv_output(sim_df: pd.DataFrame, tmp_path):
+    write_timestep_tensor(sim_df, str(tmp_path), basename="chunk-0")
+    (path,) = get_timestep_files_from_info(tmp_path, "chunk")
+    with pt.warns(DeprecationWarning):
+        df = process_timestep_files_to_csv([str(path)], str(tmp_path / "trajectory_tensor.csv"))
+    pd.testing.assert_frame_equal(df, timestep_file_to_trajectory(str(path)))
+    assert len(pd.read_csv(tmp_path / "trajectory_tensor.csv")) == len(df)
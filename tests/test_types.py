@@ -7,4 +7,74 @@ def test_process_instance():
                 phase = SelectionPhase.pending_proposals)
     
 
-    assert p + None == p
\ No newline at end of file
+    assert p + None == p
+
+def test_transaction_ledger_views():
+    from aztec_gddt.types import TransactionLedger, Proposal, RollupProof
+
+    def proposal(uuid, when):
+        return Proposal(who="a", when=when, uuid=uuid, gas=1, fee=1,
+                        score=0.5, size=1, public_composition=0.5)
+
+    empty = TransactionLedger()
+    first = empty.append("p1", [proposal("tx1", 0), proposal("tx2", 1)])
+    second = first.append("p2", [proposal("tx3", 2),
+                                 RollupProof(who="a", when=2, uuid="tx4", gas=1, fee=1)])
+
+    assert len(empty) == 0 and len(first) == 2 and len(second) == 4
+    assert "tx3" not in first and "tx3" in second
+    assert [p.uuid for p in second.proposals("p1")] == ["tx1", "tx2"]
+    assert [p.uuid for p in second.proposals("p2")] == ["tx3"]
+    assert first.proposals("p2") == []
+    assert second.process_of("tx4") == "p2"
+
+    # Appending to an older view must not leak into the newer ones
+    fork = first.append("p3", [proposal("tx5", 3)])
+    assert "tx5" not in second and "tx3" not in fork
+    assert list(fork) == ["tx1", "tx2", "tx5"]
+
+
+def test_transaction_ledger_evict():
+    from aztec_gddt.types import TransactionLedger, Proposal, ContentReveal
+
+    reveal = ContentReveal(who="b", when=1, uuid="tx2", gas=10, fee=20,
+                           blob_gas=5, blob_fee=7, transaction_count=1,
+                           transaction_avg_size=1, transaction_avg_fee_per_size=1)
+    ledger = TransactionLedger().append("p1", [
+        Proposal(who="a", when=0, uuid="tx1", gas=1, fee=2,
+                 score=0.5, size=1, public_composition=0.5),
+        reveal])
+    ledger = ledger.append("p2", [reveal.__class__(**{**reveal.__dict__, "uuid": "tx3"})])
+
+    settled = Process(uuid="p1", current_phase_init_time=0,
+                      duration_in_current_phase=0, phase=SelectionPhase.finalized)
+    evicted = ledger.evict(settled)
+
+    assert list(evicted) == ["tx3"] and len(ledger) == 3
+    assert evicted.for_process("p1") == []
+    (rollup,) = evicted.rollups
+    assert (rollup.transaction_count, rollup.gas, rollup.fee) == (2, 11, 22)
+    assert (rollup.blob_gas, rollup.blob_fee, rollup.who) == (5, 7, ["a", "b"])
+    assert evicted.evict(settled) is evicted
+
+
+def test_censorship_series():
+    import pickle
+    import numpy as np
+    from aztec_gddt.types import CensorshipSeries
+
+    series = {i: i % 3 == 0 for i in range(10, 1010)}
+    censorship = CensorshipSeries.from_dict(series)
+    assert censorship == series and dict(censorship) == series
+    assert censorship.get(5, True) and not censorship.get(11, True)
+    assert len(pickle.dumps(censorship)) < 400
+
+    times = np.arange(0, 1100)
+    expected = np.array([series.get(t, True) for t in times])
+    np.testing.assert_array_equal(censorship.is_censored(times), expected)
+    np.testing.assert_array_equal(censorship.to_array(), expected[:1010])
+
+    starts = np.array([0, 11, 11, 12, 1000, 1005, 20])
+    stops = np.array([5, 12, 13, 14, 1005, 1011, 20])
+    np.testing.assert_array_equal(censorship.any_censored(starts, stops),
+                                  [True, False, True, True, True, True, False])
@@ -0,0 +1,68 @@
+from threading import Event
+import pytest as pt
+from aztec_gddt.psuu.upload import UploadQueue, LocalFolderClient
+
+
+class FlakyClient(LocalFolderClient):
+    def __init__(self, root: str, failures: int):
+        super().__init__(root)
+        self.failures = failures
+        self.attempts = 0
+
+    def upload_file(self, Filename, Bucket, Key, Config=None):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("Connection reset by peer")
+        super().upload_file(Filename, Bucket, Key, Config)
+
+
+def test_upload_queue(tmp_path):
+    local = tmp_path / "local"
+    local.mkdir()
+    for i in range(10):
+        (local / f"part-{i}.parquet").write_text(str(i))
+
+    with UploadQueue("bucket", lambda: LocalFolderClient(str(tmp_path / "s3")), max_pending=2) as uploads:
+        for i in range(10):
+            uploads.submit(str(local / f"part-{i}.parquet"), f"run/part-{i}.parquet", delete=i % 2 == 0)
+    for i in range(10):
+        assert (tmp_path / "s3" / "bucket" / "run" / f"part-{i}.parquet").read_text() == str(i)
+        assert (local / f"part-{i}.parquet").exists() == (i % 2 == 1)
+
+
+def test_upload_retries(tmp_path):
+    filename = tmp_path / "trajectory_tensor-0.csv.zip"
+    filename.write_text("0")
+
+    client = FlakyClient(str(tmp_path / "s3"), failures=2)
+    with UploadQueue("bucket", lambda: client, backoff_seconds=0.0) as uploads:
+        uploads.submit(str(filename), "trajectory_tensor-0.csv.zip")
+    assert client.attempts == 3
+    assert (tmp_path / "s3" / "bucket" / "trajectory_tensor-0.csv.zip").exists()
+
+    uploads = UploadQueue("bucket", lambda: FlakyClient(str(tmp_path / "s3"), failures=5),
+                          max_attempts=3, backoff_seconds=0.0)
+    uploads.submit(str(filename), "trajectory_tensor-0.csv.zip", delete=True)
+    with pt.raises(ConnectionError):
+        uploads.close()
+    # Files are only removed once uploaded
+    assert filename.exists()
+
+
+def test_upload_queue_is_bounded(tmp_path):
+    filename = tmp_path / "part.parquet"
+    filename.write_text("0")
+    release = Event()
+
+    class BlockedClient(LocalFolderClient):
+        def upload_file(self, Filename, Bucket, Key, Config=None):
+            release.wait()
+            super().upload_file(Filename, Bucket, Key, Config)
+
+    uploads = UploadQueue("bucket", lambda: BlockedClient(str(tmp_path / "s3")), max_pending=2)
+    uploads.submit(str(filename), "a")
+    uploads.submit(str(filename), "b")
+    assert not uploads._slots.acquire(blocking=False)
+    release.set()
+    uploads.close()
+    assert sorted(p.name for p in (tmp_path / "s3" / "bucket").iterdir()) == ["a", "b"]